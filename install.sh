@@ -36,10 +36,19 @@ cp config/sysadmin.sudoers /etc/sudoers.d/sysadmin
 chown root:root /etc/sudoers.d/sysadmin
 chmod 440 /etc/sudoers.d/sysadmin
 
+# Install systemd units: the root link helper (system) and the daemon (user)
+install -o root -g root -m 644 config/sysadmin-linkhelper.service /etc/systemd/system/
+install -D -o root -g root -m 644 config/sysadmin-unified.service /etc/systemd/user/sysadmin-unified.service
+systemctl daemon-reload
+
 echo "Installed:"
 echo "  Source: $INSTALL_DIR/ (root-owned, read-only to tom)"
 echo "  Binary: $BIN_DIR/sysadmin"
 echo "  Sudoers: /etc/sudoers.d/sysadmin"
+echo "  Units: /etc/systemd/system/sysadmin-linkhelper.service"
+echo "         /etc/systemd/user/sysadmin-unified.service"
 echo ""
 echo "Test: sysadmin list-actions"
 echo "Daemon: sysadmin daemon --dry-run"
+echo "Enable: systemctl enable --now sysadmin-linkhelper"
+echo "        systemctl --user enable --now sysadmin-unified"
@@ -2,12 +2,18 @@
 from __future__ import annotations
 import json
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import dspy
 
 log = logging.getLogger(__name__)
-from .signatures import DiagnoseNetwork, DecideAction
+from .signatures import DiagnoseNetwork, DecideAction, DiagnoseAndDecide
 from .signatures import DiagnosisResult, ActionDecision
 from .constants import KNOWN_WIFI_ISSUES, ALLOWED_ACTIONS
+from .history import NO_TREND
+from .telemetry import AGENT_SECONDS, HEDGES, MODEL_SECONDS
 
 
 class NetworkDiagnoser(dspy.Module):
@@ -17,10 +23,10 @@ class NetworkDiagnoser(dspy.Module):
 
     def forward(self, interface: str, state: str,
                 rx_mbps: float, tx_mbps: float, signal: int,
-                known_issues: str = KNOWN_WIFI_ISSUES):
+                known_issues: str = KNOWN_WIFI_ISSUES, trend: str = NO_TREND):
         r = self.predict(interface=interface, state=state,
                          rx_mbps=rx_mbps, tx_mbps=tx_mbps,
-                         signal=signal, known_issues=known_issues)
+                         signal=signal, trend=trend, known_issues=known_issues)
         if r.diagnosis is None:
             log.error(f"DSPy returned None. Raw: {r}")
         return r.diagnosis
@@ -38,25 +44,173 @@ class ActionDecider(dspy.Module):
         return r.decision, r.reasoning
 
 
-class SysAdminAgent(dspy.Module):
+class FusedDiagnoser(dspy.Module):
+    """Diagnose and decide in a single LLM call."""
+
     def __init__(self):
         super().__init__()
-        self.diagnoser = NetworkDiagnoser()
-        self.decider = ActionDecider()
+        self.predict = dspy.Predict(DiagnoseAndDecide)
+
+    def forward(self, interface: str, state: str,
+                rx_mbps: float, tx_mbps: float, signal: int,
+                known_issues: str = KNOWN_WIFI_ISSUES, trend: str = NO_TREND,
+                allowed_actions: str | None = None):
+        actions = allowed_actions or json.dumps(list(ALLOWED_ACTIONS.keys()))
+        r = self.predict(interface=interface, state=state,
+                         rx_mbps=rx_mbps, tx_mbps=tx_mbps, signal=signal,
+                         trend=trend, known_issues=known_issues,
+                         allowed_actions=actions)
+        if r.diagnosis is None:
+            log.error(f"DSPy returned None. Raw: {r}")
+        return r.diagnosis, r.decision, r.reasoning
+
+
+AGENT_MODES = ["two_stage", "fused"]
+
+
+class SysAdminAgent(dspy.Module):
+    def __init__(self, mode: str = "two_stage"):
+        super().__init__()
+        if mode not in AGENT_MODES:
+            raise ValueError(f"Unknown agent mode '{mode}'")
+        self.mode = mode
+        if mode == "fused":
+            self.fused = FusedDiagnoser()
+        else:
+            self.diagnoser = NetworkDiagnoser()
+            self.decider = ActionDecider()
 
     def forward(self, interface: str, state: str,
-                rx_mbps: float, tx_mbps: float, signal: int):
-        diag = self.diagnoser(interface, state, rx_mbps, tx_mbps, signal)
+                rx_mbps: float, tx_mbps: float, signal: int,
+                trend: str = NO_TREND):
+        if self.mode == "fused":
+            with AGENT_SECONDS.time("fused"):
+                diag, dec, reason = self.fused(interface, state, rx_mbps,
+                                               tx_mbps, signal, trend=trend)
+        else:
+            with AGENT_SECONDS.time("diagnose"):
+                diag = self.diagnoser(interface, state, rx_mbps, tx_mbps,
+                                      signal, trend=trend)
         if diag is None:
             raise RuntimeError("LLM returned None diagnosis")
         if not diag.issue_detected:
             none = ActionDecision(action="none", confidence=1.0)
             return diag, none, "No issue"
-        dec, reason = self.decider(diag)
+        if self.mode == "fused":
+            if dec is None:
+                raise RuntimeError("LLM returned None decision")
+            return diag, dec, reason
+        with AGENT_SECONDS.time("decide"):
+            dec, reason = self.decider(diag)
         return diag, dec, reason
 
 
-def configure_ollama(model: str = "qwen3:1.7b", temp: float = 0.0):
-    """Configure DSPy to use local Ollama."""
-    lm = dspy.LM(f"ollama_chat/{model}", temperature=temp, max_tokens=512)
+class LatencyTracker:
+    """Rolling window of successful call latencies for one model."""
+
+    def __init__(self, window: int = 100):
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def quantile(self, q: float) -> float | None:
+        with self._lock:
+            v = sorted(self._samples)
+        return v[min(len(v) - 1, int(q * len(v)))] if v else None
+
+
+class HedgedAgent:
+    """Run agent on a primary LM; hedge to a secondary LM if it is slow.
+
+    If the primary has not answered (or has failed) after the hedge
+    delay, the same request goes to the secondary and the first valid
+    result wins. Once min_samples primary calls have been seen, the delay
+    follows the primary's observed p95. Python threads cannot be killed:
+    the loser is cancelled if it has not started, otherwise its result is
+    discarded (its latency is still recorded).
+    """
+
+    def __init__(self, agent, primary, secondary, hedge_delay: float = 2.0,
+                 adaptive: bool = True, min_samples: int = 10,
+                 min_delay: float = 0.1, window: int = 100):
+        self.agent = agent
+        self.lms = {"primary": primary, "secondary": secondary}
+        self.hedge_delay = hedge_delay
+        self.adaptive = adaptive
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latency = {k: LatencyTracker(window) for k in self.lms}
+        self._pool = ThreadPoolExecutor(4, thread_name_prefix="hedge")
+
+    def delay(self) -> float:
+        p95 = self.latency["primary"].quantile(0.95)
+        if not self.adaptive or len(self.latency["primary"]) < self.min_samples:
+            return self.hedge_delay
+        return max(self.min_delay, p95)
+
+    def _run(self, role: str, args, trend: str):
+        t0 = time.perf_counter()
+        with dspy.context(lm=self.lms[role]):
+            result = self.agent(*args, trend=trend)
+        dt = time.perf_counter() - t0
+        self.latency[role].add(dt)
+        MODEL_SECONDS.observe(dt, role)
+        return result
+
+    def __call__(self, interface: str, state: str,
+                 rx_mbps: float, tx_mbps: float, signal: int,
+                 trend: str = NO_TREND):
+        args = (interface, state, rx_mbps, tx_mbps, signal)
+        roles = {self._pool.submit(self._run, "primary", args, trend): "primary"}
+        done, _ = wait(roles, timeout=self.delay())
+        if not done or next(iter(done)).exception() is not None:
+            log.info("Primary model slow or failed, hedging to secondary")
+            roles[self._pool.submit(self._run, "secondary", args, trend)] = "secondary"
+        pending, error = set(roles), None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is not None:
+                    error = f.exception()
+                    continue
+                for other in pending:
+                    other.cancel()
+                HEDGES.inc(roles[f] if len(roles) > 1 else "unhedged")
+                return f.result()
+        HEDGES.inc("failed")
+        raise error
+
+    def stats(self) -> dict:
+        return {role: {"n": len(t), "p50_s": t.quantile(0.5),
+                       "p95_s": t.quantile(0.95)}
+                for role, t in self.latency.items()} | {"delay_s": self.delay()}
+
+
+def ollama_lm(model: str = "qwen3:1.7b", temp: float = 0.0,
+              keep_alive: str | None = None):
+    """dspy.LM for a local Ollama model (not made the default).
+
+    keep_alive (e.g. "24h", "-1") asks Ollama to keep the model loaded
+    between the rare incidents instead of unloading it after 5 minutes.
+    """
+    kw = {"keep_alive": keep_alive} if keep_alive else {}
+    return dspy.LM(f"ollama_chat/{model}", temperature=temp, max_tokens=512, **kw)
+
+
+def configure_ollama(model: str = "qwen3:1.7b", temp: float = 0.0,
+                     keep_alive: str | None = None):
+    """Configure DSPy to use local Ollama (see ollama_lm)."""
+    lm = ollama_lm(model, temp, keep_alive)
     dspy.configure(lm=lm)
+    return lm
+
+
+def warm_up(lm):
+    """Throwaway request so the model is loaded before the first incident."""
+    lm(messages=[{"role": "user", "content": "Reply with OK."}], max_tokens=4)
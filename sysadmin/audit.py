@@ -1,21 +1,36 @@
 """JSONL audit logger for security compliance."""
 from __future__ import annotations
+import gzip
 import json
+import logging
+import os
+import shutil
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+from .auditquery import AuditIndex
+
+log = logging.getLogger(__name__)
+
 DEFAULT_PATH = "~/.local/share/sysadmin/audit.jsonl"
+DURABILITY = ["none", "flush", "fsync"]
 
 
 class AuditLogger:
     def __init__(self, path: str = DEFAULT_PATH):
         self.path = Path(path).expanduser()
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index = AuditIndex(self.path)
 
     def _write(self, record: dict):
-        record["ts"] = datetime.now().isoformat()
-        with self.path.open("a") as f:
-            f.write(json.dumps(record) + "\n")
+        now = datetime.now()
+        record["ts"] = now.isoformat()
+        with self.path.open("ab") as f:
+            offset = f.tell()
+            f.write((json.dumps(record) + "\n").encode())
+        self.index.add(now.timestamp(), offset)
 
     def log_intent(self, action: str, params: dict, cmd: list, reason: str):
         self._write({"event": "intent", "action": action,
@@ -25,6 +40,138 @@ class AuditLogger:
         self._write({"event": "action", "action": action,
                      "success": success, "rc": rc, "reason": reason})
 
-    def log_decision(self, diag: dict, decision: dict, reason: str):
-        self._write({"event": "decision", "diag": diag,
-                     "decision": decision, "reason": reason})
+    def log_decision(self, diag: dict, decision: dict, reason: str,
+                     metrics: dict | None = None, source: str | None = None):
+        rec = {"event": "decision", "diag": diag,
+               "decision": decision, "reason": reason}
+        if metrics is not None:
+            rec["metrics"] = metrics
+        if source is not None:
+            rec["source"] = source
+        self._write(rec)
+
+    def log_cache(self, iface: str, key: str, hit: bool):
+        self._write({"event": "cache", "iface": iface,
+                     "key": key, "hit": hit})
+
+    def log_tier(self, iface: str, tier: str, reason: str):
+        self._write({"event": "tier", "iface": iface,
+                     "tier": tier, "reason": reason})
+
+    def log_startup(self, timings: dict):
+        self._write({"event": "startup", "timings": timings})
+
+    def log_recovery(self, action: str, iface: str, ok: bool, seconds: float,
+                     samples: int, attempt: int, reason: str):
+        self._write({"event": "recovery", "action": action, "iface": iface,
+                     "ok": ok, "seconds": round(seconds, 3), "samples": samples,
+                     "attempt": attempt, "reason": reason})
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class BufferedAuditLogger(AuditLogger):
+    """Batch records in memory and write them from a background thread.
+
+    Callers only append to a list; timestamps are formatted and records
+    serialized on the flush thread. A batch is written every
+    flush_interval seconds or once max_batch records are pending.
+    durability sets what happens per batch: 'none' leaves data in the
+    file object buffer, 'flush' hands it to the OS, 'fsync' forces it to
+    disk. With sync_intents, intent records (and anything queued before
+    them) are fsynced before log_intent returns. The file is rotated at
+    max_bytes; rotated segments are gzipped, keeping `backups` of them.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, flush_interval: float = 1.0,
+                 max_batch: int = 256, durability: str = "flush",
+                 sync_intents: bool = True, max_bytes: int = 64 << 20,
+                 backups: int = 5):
+        super().__init__(path)
+        if durability not in DURABILITY:
+            raise ValueError(f"Unknown durability '{durability}'")
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.durability = durability
+        self.sync_intents = sync_intents
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buf: list[tuple[float, dict]] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._f = self.path.open("ab")
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="audit-flush")
+        self._thread.start()
+
+    def _write(self, record: dict):
+        with self._lock:
+            self._buf.append((time.time(), record))
+            pending = len(self._buf)
+        if self.sync_intents and record["event"] == "intent":
+            self.flush(sync=True)
+        elif pending >= self.max_batch:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                log.error(f"Audit flush failed: {e}")
+
+    def flush(self, sync: bool = False):
+        with self._io_lock:
+            with self._lock:
+                batch, self._buf = self._buf, []
+            if not batch:
+                return
+            offset = self._f.tell()
+            lines = []
+            for t, rec in batch:
+                rec["ts"] = datetime.fromtimestamp(t).isoformat()
+                line = (json.dumps(rec) + "\n").encode()
+                self.index.add(t, offset)
+                offset += len(line)
+                lines.append(line)
+            self._f.write(b"".join(lines))
+            if sync or self.durability != "none":
+                self._f.flush()
+            if sync or self.durability == "fsync":
+                os.fsync(self._f.fileno())
+            if self._f.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _segment(self, i: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{i}.gz")
+
+    def _rotate(self):
+        self._f.close()
+        for i in range(self.backups - 1, 0, -1):
+            if self._segment(i).exists():
+                self._segment(i).replace(self._segment(i + 1))
+        rotated = self.path.with_name(self.path.name + ".1")
+        self.path.replace(rotated)
+        self.index.reset()
+        self._f = self.path.open("ab")
+        with rotated.open("rb") as src, gzip.open(self._segment(1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        rotated.unlink()
+
+    def close(self):
+        """Stop the flush thread and write out everything pending."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush(sync=self.durability == "fsync")
+        self._f.close()
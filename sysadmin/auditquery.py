@@ -0,0 +1,209 @@
+"""Sparse offset index and mmap-based range queries over the audit log."""
+from __future__ import annotations
+import bisect
+import gzip
+import json
+import mmap
+import re
+import struct
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_ENTRY = struct.Struct("=dQ")
+_TS = re.compile(rb'"ts": "([^"]+)"')
+
+INDEX_STRIDE = 4096
+
+
+def _ts_of(line: bytes) -> str | None:
+    m = _TS.search(line, max(0, len(line) - 64))
+    return m.group(1).decode() if m else None
+
+
+class AuditIndex:
+    """Sidecar file of (epoch ts, byte offset) every ~stride bytes of log."""
+
+    def __init__(self, log_path: Path, stride: int = INDEX_STRIDE):
+        self.log_path = Path(log_path)
+        self.path = self.log_path.with_name(self.log_path.name + ".idx")
+        self.stride = stride
+        self._last = self._tail()[1] if self.path.exists() else -stride
+
+    def _tail(self) -> tuple[float, int]:
+        size = self.path.stat().st_size
+        if size < _ENTRY.size:
+            return 0.0, -self.stride
+        with self.path.open("rb") as f:
+            f.seek(size - size % _ENTRY.size - _ENTRY.size)
+            return _ENTRY.unpack(f.read(_ENTRY.size))
+
+    def add(self, ts: float, offset: int):
+        if offset - self._last < self.stride:
+            return
+        with self.path.open("ab") as f:
+            f.write(_ENTRY.pack(ts, offset))
+        self._last = offset
+
+    def entries(self) -> list[tuple[float, int]]:
+        if not self.path.exists():
+            return []
+        data = self.path.read_bytes()
+        return list(_ENTRY.iter_unpack(data[:len(data) - len(data) % _ENTRY.size]))
+
+    def update(self):
+        """Index lines appended by writers that did not maintain the index."""
+        if not self.log_path.exists():
+            return
+        start = max(self._last, 0)
+        with self.log_path.open("rb") as f:
+            f.seek(start)
+            if start:
+                f.readline()  # the indexed line itself
+            while True:
+                off = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                ts = _ts_of(line)
+                if ts:
+                    self.add(datetime.fromisoformat(ts).timestamp(), off)
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
+        self._last = -self.stride
+
+    def seek(self, since: datetime | None) -> int:
+        """Byte offset at or before the first record newer than since."""
+        if since is None:
+            return 0
+        entries = self.entries()
+        i = bisect.bisect_left([e[0] for e in entries], since.timestamp())
+        return entries[i - 1][1] if i else 0
+
+
+def _match(rec: dict, event: str | None, action: str | None) -> bool:
+    if event and rec.get("event") != event:
+        return False
+    if action:
+        act = rec.get("action") or (rec.get("decision") or {}).get("action")
+        return act == action
+    return True
+
+
+def _scan(lines, lo: str | None, hi: str | None, event, action):
+    for line in lines:
+        ts = _ts_of(line)
+        if ts is None or (lo and ts < lo):
+            continue
+        if hi and ts > hi:
+            return
+        try:
+            rec = json.loads(line)
+        except ValueError:  # partial line at a stale index offset
+            continue
+        if _match(rec, event, action):
+            yield rec
+
+
+def _first_ts(path: Path, opener=open) -> str | None:
+    with opener(path, "rb") as f:
+        return _ts_of(f.readline())
+
+
+def _mmap_lines(path: Path, offset: int):
+    with path.open("rb") as f:
+        if path.stat().st_size <= offset:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = offset
+            while True:
+                end = mm.find(b"\n", pos)
+                if end < 0:
+                    return
+                yield mm[pos:end + 1]
+                pos = end + 1
+
+
+def query(path: str, since: datetime | None = None,
+          until: datetime | None = None, event: str | None = None,
+          action: str | None = None, rotated: bool = True):
+    """Yield audit records in [since, until], oldest first.
+
+    The live log is memory-mapped from the indexed offset of since, so
+    only the relevant pages are read. Gzipped rotated segments (from
+    BufferedAuditLogger) are streamed when rotated is set; a segment is
+    skipped when the next one starts before since, and scanning stops at
+    the first segment that starts after until.
+    """
+    path = Path(path).expanduser()
+    lo = since.isoformat() if since else None
+    hi = until.isoformat() if until else None
+    if rotated:
+        segments = sorted(path.parent.glob(f"{path.name}.*.gz"),
+                          key=lambda p: -int(p.name.split(".")[-2]))
+        starts = [_first_ts(s, gzip.open) for s in segments]
+        starts.append(_first_ts(path) if path.exists() else None)
+        for seg, start, nxt in zip(segments, starts, starts[1:]):
+            if hi and start and start > hi:
+                return
+            if lo and nxt and nxt < lo:
+                continue
+            with gzip.open(seg, "rb") as f:
+                yield from _scan(f, lo, hi, event, action)
+    if not path.exists():
+        return
+    index = AuditIndex(path)
+    index.update()
+    yield from _scan(_mmap_lines(path, index.seek(since)), lo, hi,
+                     event, action)
+
+
+def aggregate(records) -> dict:
+    """Resets per day, mean time between incidents and decision tiers."""
+    resets = Counter()
+    incidents = []
+    tiers = Counter()
+    cache = Counter()
+    recovery: dict[str, list[float]] = {}
+    unrecovered = Counter()
+    for r in records:
+        ev = r.get("event")
+        if ev == "action" and r.get("success") and r.get("reason") != "dry run":
+            ts = datetime.fromisoformat(r["ts"])
+            incidents.append(ts)
+            if r.get("action") == "wifi_reset":
+                resets[ts.date().isoformat()] += 1
+        elif ev == "tier":
+            tiers[r.get("tier")] += 1
+        elif ev == "cache":
+            cache["hit" if r.get("hit") else "miss"] += 1
+        elif ev == "recovery":
+            if r.get("ok"):
+                recovery.setdefault(r.get("action"), []).append(r["seconds"])
+            else:
+                unrecovered[r.get("action")] += 1
+    gaps = [(b - a).total_seconds() for a, b in zip(incidents, incidents[1:])]
+    return {"resets_per_day": dict(sorted(resets.items())),
+            "incidents": len(incidents),
+            "mean_time_between_incidents_s": sum(gaps) / len(gaps) if gaps else None,
+            "decisions_by_tier": dict(tiers),
+            "cache": dict(cache),
+            "time_to_recover_s": {a: {"n": len(v), "mean": sum(v) / len(v),
+                                      "max": max(v)} for a, v in recovery.items()},
+            "unrecovered": dict(unrecovered)}
+
+
+_REL = re.compile(r"^(\d+)([smhd])$")
+_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_time(text: str | None, now: datetime | None = None) -> datetime | None:
+    """Parse an ISO timestamp or a relative age like '7d' / '12h'."""
+    if not text:
+        return None
+    m = _REL.match(text)
+    if m:
+        now = now or datetime.now()
+        return now - timedelta(**{_UNITS[m.group(2)]: int(m.group(1))})
+    return datetime.fromisoformat(text)
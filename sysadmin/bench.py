@@ -0,0 +1,241 @@
+"""Micro-benchmarks for the monitoring pipeline."""
+from __future__ import annotations
+import os
+import resource
+import time
+
+from .constants import CONFIDENCE_THRESHOLD
+
+
+def _cpu() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def bench_backend(backend, iface: str, n: int = 100) -> dict:
+    """Time n reads; CPU includes forked children (iw)."""
+    backend.read(iface)  # warm up (ifindex lookup, page cache)
+    lat = []
+    cpu0 = _cpu()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        backend.read(iface)
+        lat.append(time.perf_counter() - t0)
+    cpu = _cpu() - cpu0
+    lat.sort()
+    return {"backend": backend.name, "n": n,
+            "mean_ms": 1000 * sum(lat) / n,
+            "p95_ms": 1000 * lat[int(0.95 * (n - 1))],
+            "cpu_ms": 1000 * cpu / n}
+
+
+def bench_backends(iface: str, n: int = 100) -> list[dict]:
+    from .linkstats import BACKENDS
+    results = []
+    for name, cls in BACKENDS.items():
+        try:
+            b = cls()
+        except OSError as e:
+            print(f"{name}: unavailable ({e})")
+            continue
+        try:
+            results.append(bench_backend(b, iface, n))
+        finally:
+            b.close()
+    return results
+
+
+def bench_agent_modes(n: int = 20, latency: float = 0.2,
+                      per_token: float = 0.002) -> list[dict]:
+    """Two-stage vs fused agent against a stub LM, over anomalous inputs."""
+    import dspy
+    from .agent import AGENT_MODES, SysAdminAgent
+    from .dataset import generate_examples
+    from .stub import StubLM
+    cases = [ex["inputs"] for ex in generate_examples(n)
+             if ex["output"].issue_detected][:n]
+    lm = StubLM(latency, per_token)
+    results = []
+    for mode in AGENT_MODES:
+        agent = SysAdminAgent(mode)
+        lm.reset()
+        lat = []
+        with dspy.context(lm=lm):
+            for c in cases:
+                t0 = time.perf_counter()
+                agent(c["interface"], c["state"], c["rx_mbps"],
+                      c["tx_mbps"], c["signal"])
+                lat.append(time.perf_counter() - t0)
+        st = lm.stats()
+        results.append({"mode": mode, "n": len(cases),
+                        "mean_ms": 1000 * sum(lat) / len(lat),
+                        "calls_per_incident": st["calls"] / len(cases),
+                        "tokens_per_incident": (st["prompt_tokens"]
+                                                + st["completion_tokens"])
+                        / len(cases)})
+    return results
+
+
+def bench_fleet(hosts: int = 50, incidents: int = 4, latency: float = 0.05,
+                max_batch: int = 32, max_wait: float = 0.05,
+                distinct: int = 6, seed: int = 0) -> dict:
+    """Many in-process hosts asking one aggregator, against a stub LM.
+
+    Hosts are identical machines, so their anomalies are drawn from only
+    `distinct` inputs; the aggregator should collapse the duplicates.
+    """
+    import random
+    import threading
+    from .agent import SysAdminAgent
+    from .dataset import generate_examples
+    from .fleet import FleetAggregator, FleetClient, serve
+    from .stub import StubLM
+    cases = [ex["inputs"] for ex in generate_examples(distinct * 3, seed)
+             if ex["output"].issue_detected][:distinct]
+    lm = StubLM(latency)
+    agg = FleetAggregator(SysAdminAgent(), max_batch, max_wait, lm=lm)
+    server = serve(agg, port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    per_host: dict[str, list[float]] = {}
+    errors = []
+
+    def host(i: int):
+        rng = random.Random(seed + i)
+        client = FleetClient(url, host=f"host{i}")
+        lat = per_host.setdefault(client.host, [])
+        for _ in range(incidents):
+            c = rng.choice(cases)
+            t0 = time.perf_counter()
+            try:
+                client(c["interface"], c["state"], c["rx_mbps"],
+                       c["tx_mbps"], c["signal"])
+            except RuntimeError as e:
+                errors.append(str(e))
+            lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=host, args=(i,)) for i in range(hosts)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    server.shutdown()
+    agg.close()
+    means = [sum(v) / len(v) for v in per_host.values()]
+    return {"hosts": hosts, "wall_s": wall, "errors": len(errors),
+            **agg.stats(), "lm_calls": lm.stats()["calls"],
+            "latency_ms": percentiles([x for v in per_host.values() for x in v]),
+            "host_mean_ms": percentiles(means)}
+
+
+def percentiles(values: list[float], scale: float = 1000.0) -> dict:
+    """p50/p95/p99 (default: seconds -> ms); empty input gives zeros."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    v = sorted(values)
+    return {f"p{q}": scale * v[min(len(v) - 1, int(q / 100 * len(v)))]
+            for q in (50, 95, 99)}
+
+
+def replay(samples, monitors: dict, agent, executor, lm=None,
+           speed: float = 0.0) -> dict:
+    """Drive (ts, Metrics) samples through detect -> agent -> executor.
+
+    speed is the replay rate relative to the trace timestamps; 0 runs
+    as fast as possible. lm, if given, is the StubLM whose calls are
+    counted as LLM calls.
+    """
+    stages = {"detect": [], "agent": [], "execute": []}
+    active: dict[str, bool] = {}
+    incidents = samples_n = failures = 0
+    t_start = time.perf_counter()
+    first_ts = None
+    for ts, m in samples:
+        if speed:
+            first_ts = ts if first_ts is None else first_ts
+            delay = (ts - first_ts) / speed - (time.perf_counter() - t_start)
+            if delay > 0:
+                time.sleep(delay)
+        samples_n += 1
+        mon = monitors[m.interface]
+        t0 = time.perf_counter()
+        anomalous = mon.detect_anomaly(m)
+        stages["detect"].append(time.perf_counter() - t0)
+        if anomalous and not active.get(m.interface):
+            incidents += 1
+        active[m.interface] = anomalous
+        if not anomalous:
+            continue
+        t0 = time.perf_counter()
+        try:
+            diag, dec, reason = agent(m.interface, m.state, m.rx_mbps,
+                                      m.tx_mbps, m.signal, trend=m.trend)
+        except RuntimeError:
+            failures += 1
+            continue
+        finally:
+            stages["agent"].append(time.perf_counter() - t0)
+        if dec.action != "none" and dec.confidence > CONFIDENCE_THRESHOLD:
+            t0 = time.perf_counter()
+            executor.execute(dec.action, m.interface, reason)
+            stages["execute"].append(time.perf_counter() - t0)
+    wall = time.perf_counter() - t_start
+    llm_calls = lm.stats()["calls"] if lm is not None else None
+    return {"samples": samples_n, "incidents": incidents,
+            "agent_failures": failures,
+            "wall_s": wall, "samples_per_s": samples_n / wall if wall else 0.0,
+            "llm_calls": llm_calls,
+            "llm_calls_per_incident": (llm_calls / incidents
+                                       if incidents and llm_calls is not None
+                                       else None),
+            "stages_ms": {k: {"n": len(v), **percentiles(v)}
+                          for k, v in stages.items()},
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def bench_generator(n: int = 200000, chunk: int = 65536,
+                    path: str | None = None) -> list[dict]:
+    """Vectorized streaming generator vs generate_examples, per sample."""
+    import tempfile
+    import tracemalloc
+    from .dataset import generate_examples
+    from .synth import generate
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        size = generate(path or f"{tmp}/synth.bin", n, chunk=chunk)
+        dt = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    results.append({"generator": "synth", "n": n,
+                    "samples_per_s": n / dt, "bytes_per_sample": size / n,
+                    "peak_mb": peak / 2**20})
+    k = min(n, 30000) // 3  # legacy emits 3 samples per step
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    generate_examples(k)
+    dt = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results.append({"generator": "generate_examples", "n": 3 * k,
+                    "samples_per_s": 3 * k / dt, "peak_mb": peak / 2**20})
+    return results
+
+
+def print_rows(rows: list[dict]):
+    for r in rows:
+        print("  ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}"
+                        for k, v in r.items()))
+
+
+if __name__ == "__main__":
+    import sys
+    from .constants import DEFAULT_INTERFACE
+    if len(sys.argv) > 1 and sys.argv[1] == "agent":
+        print_rows(bench_agent_modes())
+        sys.exit(0)
+    iface = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INTERFACE
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print_rows(bench_backends(iface, n))
@@ -0,0 +1,112 @@
+"""Memoize agent diagnoses keyed on quantized metrics."""
+from __future__ import annotations
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .history import NO_TREND
+from .telemetry import CACHE, SOURCE
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATH = "~/.local/share/sysadmin/diag_cache.json"
+
+
+class DiagnosisCache:
+    """LRU + TTL cache of (diagnosis, decision, reasoning) tuples."""
+
+    def __init__(self, rx_bin: float = 5.0, tx_bin: float = 250.0,
+                 signal_bin: int = 10, ttl: float = 600.0,
+                 maxsize: int = 256, path: str | None = None):
+        self.rx_bin = rx_bin
+        self.tx_bin = tx_bin
+        self.signal_bin = signal_bin
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = Path(path).expanduser() if path else None
+        self._data: OrderedDict[str, tuple[float, tuple]] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self.load()
+
+    def key(self, interface: str, state: str, rx_mbps: float,
+            tx_mbps: float, signal: int) -> str:
+        return "|".join([interface, state, str(math.floor(rx_mbps / self.rx_bin)),
+                         str(math.floor(tx_mbps / self.tx_bin)),
+                         str(math.floor(signal / self.signal_bin))])
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: tuple):
+        with self._lock:
+            self._data[key] = (time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        if self.path:
+            self.save()
+
+    def __len__(self):
+        return len(self._data)
+
+    def save(self):
+        with self._lock:
+            rows = {k: [ts, diag.model_dump(), dec.model_dump(), reason]
+                    for k, (ts, (diag, dec, reason)) in self._data.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(rows))
+        tmp.replace(self.path)
+
+    def load(self):
+        from .models import ActionDecision, DiagnosisResult
+        try:
+            rows = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable cache {self.path}: {e}")
+            return
+        now = time.time()
+        for k, (ts, diag, dec, reason) in rows.items():
+            if now - ts <= self.ttl:
+                self._data[k] = (ts, (DiagnosisResult(**diag),
+                                      ActionDecision(**dec), reason))
+        log.info(f"Loaded {len(self._data)} cached diagnoses")
+
+
+class CachedAgent:
+    """Wrap an agent callable; identical quantized inputs skip the LLM."""
+
+    def __init__(self, agent, cache: DiagnosisCache, audit=None):
+        self.agent = agent
+        self.cache = cache
+        self.audit = audit
+
+    def __call__(self, interface: str, state: str,
+                 rx_mbps: float, tx_mbps: float, signal: int,
+                 trend: str = NO_TREND):
+        key = self.cache.key(interface, state, rx_mbps, tx_mbps, signal)
+        hit = self.cache.get(key)
+        CACHE.inc("hit" if hit is not None else "miss")
+        if self.audit is not None:
+            self.audit.log_cache(interface, key, hit is not None)
+        if hit is not None:
+            log.info(f"Cache hit for {interface}: {key}")
+            SOURCE.set("cache")
+            return hit
+        result = self.agent(interface, state, rx_mbps, tx_mbps, signal,
+                            trend=trend)
+        self.cache.put(key, result)
+        return result
@@ -6,52 +6,400 @@ import sys
 
 from .constants import DEFAULT_INTERFACE, DEFAULT_OLLAMA_MODEL
 from .constants import ALLOWED_ACTIONS, CONFIDENCE_THRESHOLD
+from .constants import FAST_PATH_MIN_SIGNAL, FAST_PATH_RATIO
+from .constants import DEFAULT_COOLDOWN, DISTILLED_PATH, LINK_HELPER_SOCKET
+from .constants import LM_CACHE_PATH
 
 log = logging.getLogger(__name__)
 
 
+def _build_agent(args, audit, agent=None, rx_thresholds=None):
+    """Agent (default: SysAdminAgent) wrapped in cache and fast-path tiers.
+
+    rx_thresholds maps interfaces to their --interface rx= setting.
+    """
+    if args.tier == "rules":
+        agent = None
+    elif agent is None:
+        from .agent import SysAdminAgent
+        agent = SysAdminAgent(args.agent_mode)
+    if agent is not None and args.cache_ttl > 0:
+        from .cache import CachedAgent, DiagnosisCache
+        cache = DiagnosisCache(ttl=args.cache_ttl, maxsize=args.cache_size,
+                               path=args.cache_file)
+        agent = CachedAgent(agent, cache, audit)
+    if args.distilled:
+        from .distill import DistilledAgent, DistilledModel
+        agent = DistilledAgent(DistilledModel.load(args.distilled), agent,
+                               args.distilled_confidence, audit)
+    if args.tier != "llm":
+        from .fastpath import TieredAgent
+        agent = TieredAgent(agent, audit, args.tier, rx_thresholds,
+                            ratio=args.fast_ratio,
+                            min_signal=args.fast_min_signal)
+    return agent
+
+
+def _add_agent_args(p):
+    p.add_argument("--agent-mode", default="two_stage",
+                   choices=["two_stage", "fused"],
+                   help="fused: diagnose and decide in one LLM call")
+    p.add_argument("--tier", default="tiered",
+                   choices=["llm", "tiered", "rules"],
+                   help="Rule-based fast path before (or instead of) the LLM")
+    p.add_argument("--fast-ratio", type=float, default=FAST_PATH_RATIO,
+                   help="Min TX/RX ratio resolved without the LLM")
+    p.add_argument("--fast-min-signal", type=int, default=FAST_PATH_MIN_SIGNAL,
+                   help="Weaker signal than this is escalated to the LLM")
+    p.add_argument("--cache-ttl", type=float, default=600.0,
+                   help="Seconds to reuse a diagnosis (0 disables)")
+    p.add_argument("--cache-size", type=int, default=256)
+    p.add_argument("--cache-file", default=None,
+                   help="Persist the diagnosis cache here")
+    p.add_argument("--detector", default="point", choices=["point", "trend"],
+                   help="trend: sliding-window detection with hysteresis")
+    p.add_argument("--distilled", help="Model from 'sysadmin distill', asked "
+                   "before the LLM")
+    p.add_argument("--distilled-confidence", type=float, default=0.9,
+                   help="Escalate to the LLM below this probability "
+                        "(0: never escalate)")
+
+
+def _load_llm_agent(args, timer):
+    """Import dspy, load --program, configure Ollama and warm the model (slow).
+
+    Runs on the LazyAgent thread; a refused program fails the agent there.
+    """
+    from .agent import SysAdminAgent, configure_ollama, ollama_lm, warm_up
+    from .programs import apply, resolve_agent
+    timer.mark("import")
+    try:
+        compiled = resolve_agent(args.program, args.agent_mode, args.model)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Refusing program: {e}") from e
+    lm = configure_ollama(args.model, keep_alive=args.keep_alive)
+    lms = [lm]
+    if args.hedge_model:
+        lms.append(ollama_lm(args.hedge_model, keep_alive=args.keep_alive))
+    timer.mark("configure")
+    if args.warm_up:
+        try:
+            for m in lms:
+                warm_up(m)
+            timer.mark("warm_up")
+        except Exception as e:
+            log.warning(f"Model warm-up failed: {e}")
+    agent = SysAdminAgent(args.agent_mode)
+    if compiled is not None:
+        apply(agent, compiled)
+        timer.mark("program")
+    if args.hedge_model:
+        from .agent import HedgedAgent
+        agent = HedgedAgent(agent, *lms, hedge_delay=args.hedge_delay)
+    return agent
+
+
 def cmd_daemon(args):
-    from .agent import SysAdminAgent, configure_ollama
     from .audit import AuditLogger
+    from .dispatch import AnomalyDispatcher
     from .executor import SecureExecutor
+    from .linkhelper import LinkHelperClient
+    from .linkstats import get_backend
     from .monitor import NetworkMonitor
+    from .startup import LazyAgent, StartupTimer
+    from .supervisor import MonitorSupervisor, parse_spec
+    from .telemetry import SOURCE
 
-    configure_ollama(args.model)
-    audit = AuditLogger()
-    executor = SecureExecutor(audit, dry_run=args.dry_run)
-    agent = SysAdminAgent()
+    timer = StartupTimer()
+    if args.metrics_port:
+        from .telemetry import serve
+        serve(args.metrics_port)
+    if args.audit_buffered:
+        from .audit import BufferedAuditLogger
+        audit = BufferedAuditLogger(durability=args.audit_durability,
+                                    max_bytes=args.audit_max_mb << 20)
+    else:
+        audit = AuditLogger()
+    watcher = None
+    if args.events:
+        from .linkwatch import LinkWatcher
+        watcher = LinkWatcher()
+    backend = get_backend(args.backend)
+    monitors = []
+    for text in args.interface:
+        spec = parse_spec(text, args.interval)
+        monitors.append(NetworkMonitor(
+            spec.name, spec.interval, spec.rx_threshold,
+            spec.ratio_threshold, backend=backend, detector=args.detector))
+    prober = None
+    if args.probe:
+        from .probe import Prober, Target
+        prober = Prober([Target.parse(t) for t in args.probe], args.quorum,
+                        timeout=min(2.0, args.fast_interval))
+    executor = SecureExecutor(audit, dry_run=args.dry_run,
+                              helper=LinkHelperClient(args.link_helper))
+    if args.verify_deadline > 0:
+        from .verify import RecoveryVerifier, VerifiedExecutor
+        verifier = RecoveryVerifier({m.iface: m for m in monitors}, prober,
+                                    deadline=args.verify_deadline,
+                                    interval=args.verify_interval)
+        executor = VerifiedExecutor(executor, verifier)
+    from .scheduler import ActionScheduler
+    actions = ActionScheduler(executor, args.cooldown,
+                              max_concurrent=args.max_actions)
+    llm = None
+    if args.fleet and args.tier != "rules":
+        from .fleet import FleetClient
+        llm = FleetClient(args.fleet)
+    elif args.tier != "rules":
+        llm = LazyAgent(lambda: _load_llm_agent(args, timer),
+                        on_ready=lambda: audit.log_startup(timer.report()))
+    agent = _build_agent(args, audit, llm,
+                         {m.iface: m.rx_thresh for m in monitors})
 
     def on_anomaly(m):
         log.info(f"Anomaly: {m}")
+        SOURCE.set("llm")
         try:
             diag, dec, reason = agent(
-                m.interface, m.state, m.rx_mbps, m.tx_mbps, m.signal
+                m.interface, m.state, m.rx_mbps, m.tx_mbps, m.signal,
+                trend=m.trend
             )
         except RuntimeError as e:
             log.error(f"Agent failed: {e}")
             return
-        audit.log_decision(diag.model_dump(), dec.model_dump(), reason)
+        audit.log_decision(diag.model_dump(), dec.model_dump(), reason,
+                           {"interface": m.interface, "state": m.state,
+                            "rx_mbps": m.rx_mbps, "tx_mbps": m.tx_mbps,
+                            "signal": m.signal}, SOURCE.get())
         if dec.action != "none" and dec.confidence > CONFIDENCE_THRESHOLD:
             log.info(f"Executing: {dec.action} ({reason})")
-            executor.execute(dec.action, args.interface, reason)
+            actions.execute(dec.action, m.interface, reason)
 
-    mon = NetworkMonitor(args.interface, args.interval)
+    dispatcher = AnomalyDispatcher(on_anomaly, maxsize=args.queue_size)
+    if args.probe:
+        sup = _health_loop(args, monitors, prober, watcher, dispatcher, actions,
+                           on_sample=lambda m: timer.mark("first_sample"))
+    else:
+        sup = MonitorSupervisor(monitors, on_anomaly, watcher=watcher,
+                                dispatcher=dispatcher,
+                                on_sample=lambda m: timer.mark("first_sample"))
     try:
-        mon.run_loop(on_anomaly)
+        sup.run()
     except KeyboardInterrupt:
         log.info("Shutting down...")
-        mon.stop()
+        sup.stop()
+    finally:
+        dispatcher.close(timeout=5)
+        log.info(f"Anomaly queue: {dispatcher.stats()}")
+        log.info(f"Actions: {actions.state()}")
+        if prober is not None:
+            prober.close()
+        audit.close()
+
+
+def _health_loop(args, monitors, prober, watcher, dispatcher, actions,
+                 on_sample=None):
+    """Single-interface loop that also probes reachability (--probe)."""
+    from .scheduler import AdaptiveInterval, HealthLoop
+    if len(monitors) != 1:
+        sys.exit("--probe supports a single --interface")
+    mon = monitors[0]
+    mon.watcher = watcher
+    return HealthLoop(
+        mon.iface, prober, mon, on_anomaly=dispatcher.submit,
+        reset=lambda: actions.execute("wifi_reset", mon.iface,
+                                      "reachability lost"),
+        max_failures=args.max_failures, cooldown=args.cooldown,
+        policy=AdaptiveInterval(args.fast_interval, mon.interval),
+        actions=actions, on_sample=on_sample)
 
 
 def cmd_action(args):
     from .audit import AuditLogger
     from .executor import SecureExecutor
+    from .linkhelper import LinkHelperClient
     audit = AuditLogger()
-    executor = SecureExecutor(audit, dry_run=args.dry_run)
+    executor = SecureExecutor(audit, dry_run=args.dry_run,
+                              helper=LinkHelperClient(args.link_helper))
     ok = executor.execute(args.name, args.interface, "manual")
     sys.exit(0 if ok else 1)
 
 
+def cmd_audit(args):
+    import json
+    from .auditquery import aggregate, parse_time, query
+    recs = query(args.path, parse_time(args.since), parse_time(args.until),
+                 args.event, args.action)
+    if args.stats:
+        print(json.dumps(aggregate(recs), indent=2))
+        return
+    for i, rec in enumerate(recs):
+        if args.limit and i >= args.limit:
+            break
+        print(json.dumps(rec))
+
+
+def cmd_bench(args):
+    import json
+    from .bench import bench_agent_modes, bench_backends, print_rows
+    if args.bench_cmd == "backends":
+        print_rows(bench_backends(args.interface, args.n))
+    elif args.bench_cmd == "agent":
+        print_rows(bench_agent_modes(args.n, args.latency))
+    elif args.bench_cmd == "fleet":
+        from .bench import bench_fleet
+        print(json.dumps(bench_fleet(args.hosts, args.incidents, args.latency,
+                                     args.max_batch, args.max_wait), indent=2))
+    elif args.bench_cmd == "dataset":
+        from .bench import bench_generator
+        print_rows(bench_generator(args.n, args.chunk))
+    elif args.bench_cmd == "record":
+        from .linkstats import get_backend
+        from .monitor import NetworkMonitor
+        from .trace import record
+        backend = get_backend(args.backend)
+        mons = [NetworkMonitor(i, backend=backend) for i in args.interface]
+        n = record(mons, args.out, args.duration, args.interval)
+        print(f"Recorded {n} samples to {args.out}")
+    else:
+        print(json.dumps(_bench_replay(args), indent=2))
+
+
+def _bench_replay(args):
+    import tempfile
+    import dspy
+    from .audit import AuditLogger
+    from .bench import replay
+    from .executor import SecureExecutor
+    from .monitor import NetworkMonitor
+    from .stub import StubLM
+    from .trace import read_trace, synthetic_trace
+    if args.trace:
+        samples = list(read_trace(args.trace))
+    else:
+        samples = list(synthetic_trace(args.synthetic))
+    with tempfile.TemporaryDirectory() as tmp:
+        audit = AuditLogger(f"{tmp}/audit.jsonl")
+        executor = SecureExecutor(audit, dry_run=True)
+        agent = _build_agent(args, audit)
+        mons = {}
+        for _, m in samples:
+            if m.interface not in mons:
+                mons[m.interface] = NetworkMonitor(m.interface,
+                                                   detector=args.detector)
+        lm = StubLM(args.latency)
+        with dspy.context(lm=lm):
+            return replay(samples, mons, agent, executor, lm, args.speed)
+
+
+def cmd_optimize(args):
+    import json
+    from . import programs
+    from .optimize import dataset_version, optimize, optimize_simba
+    lm = None
+    if args.stub:
+        from .stub import StubLM
+        lm = StubLM()
+    run = optimize_simba if args.optimizer == "simba" else optimize
+    program = run(args.model, args.n, args.target, threads=args.threads,
+                  cache=None if args.no_cache else args.cache, lm=lm,
+                  dataset=args.dataset)
+    stats = {**program.run_stats, "optimizer": args.optimizer,
+             "dev_score": getattr(program, "score", None)}
+    path = programs.save(program, args.target, "stub" if args.stub else args.model,
+                         dataset_version(args.dataset), stats, args.out_dir)
+    print(json.dumps(stats, indent=2))
+    print(f"Saved {path}")
+
+
+def cmd_eval(args):
+    import json
+    from .evaluation import compare, evaluate, format_confusion, load_program, save
+    if args.stub:
+        from .stub import StubLM
+        lm = StubLM(args.latency)
+    else:
+        from .agent import configure_ollama
+        lm = configure_ollama(args.model)
+    fused = args.program_type == "fused"
+    if args.dataset:
+        from .synth import SyntheticDataset
+        examples = SyntheticDataset(args.dataset).sample(args.n, args.seed, fused)
+    else:
+        from .dataset import to_dspy_examples
+        examples = to_dspy_examples(max(1, args.n // 3), args.seed, fused)
+    program = load_program(args.program_type, args.program)
+    result = evaluate(program, examples, lm, args.threads)
+    print(format_confusion(result))
+    lat = result["latency_ms"]
+    print(f"accuracy={result['accuracy']:.3f} failures={result['failure_rate']:.3f}"
+          f" p50={lat['p50']:.0f}ms p95={lat['p95']:.0f}ms p99={lat['p99']:.0f}ms")
+    if args.out:
+        save(result, args.out)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION: {r}")
+        sys.exit(1 if regressions else 0)
+
+
+def cmd_distill(args):
+    import json
+    from .auditquery import parse_time
+    from .distill import distill
+    model, report = distill(args.audit, args.synthetic, args.holdout,
+                            parse_time(args.since))
+    model.save(args.out)
+    print(json.dumps(report, indent=2))
+    print(f"Saved {args.out}")
+
+
+def cmd_dataset(args):
+    from .synth import SyntheticDataset, generate
+    size = generate(args.out, args.n, args.seed, args.chunk)
+    print(f"Wrote {args.n} samples ({size >> 10} KiB) to {args.out}")
+    for name, count in SyntheticDataset(args.out).counts().items():
+        print(f"  {name}: {count}")
+
+
+def cmd_fleet(args):
+    import threading
+    from .agent import SysAdminAgent
+    from .fleet import FleetAggregator, serve
+    lm = None
+    if args.stub:
+        from .stub import StubLM
+        lm = StubLM(args.latency)
+    else:
+        from .agent import configure_ollama
+        configure_ollama(args.model, keep_alive=args.keep_alive)
+    from .programs import apply, resolve_agent
+    try:
+        compiled = resolve_agent(args.program, args.agent_mode,
+                                 "stub" if args.stub else args.model)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Refusing program: {e}")
+    agent = SysAdminAgent(args.agent_mode)
+    if compiled is not None:
+        apply(agent, compiled)
+    if args.cache_ttl > 0:
+        from .cache import CachedAgent, DiagnosisCache
+        agent = CachedAgent(agent, DiagnosisCache(ttl=args.cache_ttl))
+    agg = FleetAggregator(agent, args.max_batch, args.max_wait,
+                          args.threads, lm=lm)
+    server = serve(agg, args.port, args.host)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        log.info("Shutting down...")
+    finally:
+        server.shutdown()
+        agg.close()
+        log.info(f"Fleet stats: {agg.stats()}")
+
+
 def cmd_list_actions(args):
     print("Allowed actions:")
     for name, spec in ALLOWED_ACTIONS.items():
@@ -66,9 +414,60 @@ def main():
 
     # daemon
     p = sub.add_parser("daemon", help="Run monitor daemon")
-    p.add_argument("--interface", default=DEFAULT_INTERFACE)
+    p.add_argument("--interface", nargs="+", default=[DEFAULT_INTERFACE],
+                   help="name[:interval=S,rx=MBPS,ratio=R] per interface")
     p.add_argument("--interval", type=float, default=10.0)
     p.add_argument("--model", default=DEFAULT_OLLAMA_MODEL)
+    p.add_argument("--keep-alive", default="24h",
+                   help="How long Ollama keeps the model loaded")
+    p.add_argument("--no-warm-up", dest="warm_up", action="store_false",
+                   help="Skip the throwaway warm-up prompt")
+    p.add_argument("--program", default="auto",
+                   help="Compiled program: path, 'auto' (newest matching "
+                        "artifact) or 'none'")
+    p.add_argument("--hedge-model",
+                   help="Smaller model asked too when --model is slow")
+    p.add_argument("--hedge-delay", type=float, default=2.0,
+                   help="Seconds before hedging; adapts to the primary's "
+                        "p95 once enough calls are seen")
+    p.add_argument("--backend", default="auto",
+                   choices=["auto", "nl80211", "iw"])
+    _add_agent_args(p)
+    p.add_argument("--audit-buffered", action="store_true",
+                   help="Batch audit writes on a background thread")
+    p.add_argument("--audit-durability", default="flush",
+                   choices=["none", "flush", "fsync"])
+    p.add_argument("--audit-max-mb", type=int, default=64,
+                   help="Rotate and gzip the buffered audit log at this size")
+    p.add_argument("--queue-size", type=int, default=8,
+                   help="Max interfaces waiting for diagnosis")
+    p.add_argument("--link-helper", default=LINK_HELPER_SOCKET,
+                   help="Helper socket; sudo is used if it does not exist")
+    p.add_argument("--metrics-port", type=int,
+                   help="Serve Prometheus metrics on 127.0.0.1:PORT")
+    p.add_argument("--probe", action="append",
+                   help="Also probe host, icmp:host or tcp:host:port in an "
+                        "adaptive loop (replaces the separate watchdog)")
+    p.add_argument("--quorum", type=int, default=1)
+    p.add_argument("--fast-interval", type=float, default=1.0,
+                   help="Probe/sample interval while there is trouble")
+    p.add_argument("--max-failures", type=int, default=2,
+                   help="Failed probe rounds before a reset")
+    p.add_argument("--cooldown", type=float, default=DEFAULT_COOLDOWN,
+                   help="Minimum seconds between repeats of an action on "
+                        "the same interface")
+    p.add_argument("--max-actions", type=int, default=1,
+                   help="Actions allowed to run at once across interfaces")
+    p.add_argument("--verify-deadline", type=float, default=30.0,
+                   help="Seconds to wait for recovery after a reset before "
+                        "retrying (0: do not verify)")
+    p.add_argument("--verify-interval", type=float, default=0.25,
+                   help="Sampling interval while verifying recovery")
+    p.add_argument("--events", action="store_true",
+                   help="Wake immediately on rtnetlink link state changes")
+    p.add_argument("--fleet", metavar="URL",
+                   help="Ask this 'sysadmin fleet' aggregator instead of a "
+                        "local model; actions still run here")
     p.add_argument("--dry-run", action="store_true")
     p.set_defaults(func=cmd_daemon)
 
@@ -76,9 +475,141 @@ def main():
     p = sub.add_parser("action", help="Run specific action")
     p.add_argument("name", choices=list(ALLOWED_ACTIONS.keys()))
     p.add_argument("--interface", default=DEFAULT_INTERFACE)
+    p.add_argument("--link-helper", default=LINK_HELPER_SOCKET)
     p.add_argument("--dry-run", action="store_true")
     p.set_defaults(func=cmd_action)
 
+    # audit
+    from .audit import DEFAULT_PATH
+    p = sub.add_parser("audit", help="Query the audit log")
+    p.add_argument("--path", default=DEFAULT_PATH)
+    p.add_argument("--since", help="ISO time or age like 7d, 12h")
+    p.add_argument("--until", help="ISO time or age like 1h")
+    p.add_argument("--event", help="intent/action/decision/cache/tier/recovery")
+    p.add_argument("--action", help="Filter by action name")
+    p.add_argument("--limit", type=int, default=0)
+    p.add_argument("--stats", action="store_true",
+                   help="Print aggregates instead of records")
+    p.set_defaults(func=cmd_audit)
+
+    # bench
+    p = sub.add_parser("bench", help="Benchmarks and trace replay")
+    bsub = p.add_subparsers(dest="bench_cmd", required=True)
+    b = bsub.add_parser("replay", help="Replay a trace through the pipeline")
+    b.add_argument("--trace", help="Trace file (default: synthetic)")
+    b.add_argument("--synthetic", type=int, default=10000,
+                   help="Samples in the synthetic trace")
+    b.add_argument("--latency", type=float, default=0.0,
+                   help="Stub LM seconds per call")
+    b.add_argument("--speed", type=float, default=0.0,
+                   help="Replay rate vs trace time (0: as fast as possible)")
+    _add_agent_args(b)
+    b = bsub.add_parser("record", help="Record live metrics to a trace")
+    b.add_argument("--out", required=True)
+    b.add_argument("--interface", nargs="+", default=[DEFAULT_INTERFACE])
+    b.add_argument("--duration", type=float, default=3600.0)
+    b.add_argument("--interval", type=float, default=1.0)
+    b.add_argument("--backend", default="auto",
+                   choices=["auto", "nl80211", "iw"])
+    b = bsub.add_parser("backends", help="nl80211 vs iw collection cost")
+    b.add_argument("--interface", default=DEFAULT_INTERFACE)
+    b.add_argument("--n", type=int, default=100)
+    b = bsub.add_parser("agent", help="Two-stage vs fused agent on a stub LM")
+    b.add_argument("--n", type=int, default=20)
+    b.add_argument("--latency", type=float, default=0.2)
+    b = bsub.add_parser("dataset", help="Synthetic dataset generation throughput")
+    b.add_argument("--n", type=int, default=200000)
+    b.add_argument("--chunk", type=int, default=65536)
+    b = bsub.add_parser("fleet", help="Many fake hosts against one aggregator")
+    b.add_argument("--hosts", type=int, default=50)
+    b.add_argument("--incidents", type=int, default=4,
+                   help="Diagnoses requested per host")
+    b.add_argument("--latency", type=float, default=0.05)
+    b.add_argument("--max-batch", type=int, default=32)
+    b.add_argument("--max-wait", type=float, default=0.05)
+    p.set_defaults(func=cmd_bench)
+
+    # optimize
+    from .programs import DEFAULT_DIR as PROGRAMS_DIR
+    p = sub.add_parser("optimize", help="Compile a program and store it")
+    p.add_argument("--model", default=DEFAULT_OLLAMA_MODEL)
+    p.add_argument("--target", default="diagnoser", choices=["diagnoser", "fused"])
+    p.add_argument("--optimizer", default="bootstrap", choices=["bootstrap", "simba"])
+    p.add_argument("--n", type=int, default=5)
+    p.add_argument("--threads", type=int, default=4)
+    p.add_argument("--dataset", help="File from 'sysadmin dataset'")
+    p.add_argument("--cache", default=LM_CACHE_PATH, help="LM response cache")
+    p.add_argument("--no-cache", action="store_true")
+    p.add_argument("--out-dir", default=PROGRAMS_DIR)
+    p.add_argument("--stub", action="store_true",
+                   help="Use the deterministic stub LM instead of Ollama")
+    p.set_defaults(func=cmd_optimize)
+
+    # eval
+    p = sub.add_parser("eval", help="Evaluate a diagnoser on held-out data")
+    p.add_argument("--model", default=DEFAULT_OLLAMA_MODEL)
+    p.add_argument("--program-type", default="base",
+                   choices=["base", "compiled", "fused"])
+    p.add_argument("--program", help="Saved program JSON (for compiled)")
+    p.add_argument("--dataset", help="File from 'sysadmin dataset'")
+    p.add_argument("--n", type=int, default=60)
+    p.add_argument("--seed", type=int, default=7,
+                   help="Sampling seed; optimization uses 42")
+    p.add_argument("--threads", type=int, default=4)
+    p.add_argument("--out", help="Write results as JSON")
+    p.add_argument("--baseline", help="Previous JSON result; exit 1 on regression")
+    p.add_argument("--tolerance", type=float, default=0.2,
+                   help="Allowed relative latency increase vs baseline")
+    p.add_argument("--stub", action="store_true",
+                   help="Use the deterministic stub LM instead of Ollama")
+    p.add_argument("--latency", type=float, default=0.0,
+                   help="Stub LM seconds per call")
+    p.set_defaults(func=cmd_eval)
+
+    # distill
+    p = sub.add_parser("distill", help="Train a local classifier on logged "
+                       "LLM decisions")
+    p.add_argument("--audit", default=DEFAULT_PATH)
+    p.add_argument("--since", help="ISO time or age like 30d")
+    p.add_argument("--synthetic", type=int, default=200,
+                   help="generate_examples rounds added to the training set")
+    p.add_argument("--holdout", type=float, default=0.2)
+    p.add_argument("--out", default=DISTILLED_PATH)
+    p.set_defaults(func=cmd_distill)
+
+    # dataset
+    p = sub.add_parser("dataset", help="Generate a large synthetic dataset")
+    p.add_argument("--out", required=True)
+    p.add_argument("--n", type=int, default=100000)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--chunk", type=int, default=65536)
+    p.set_defaults(func=cmd_dataset)
+
+    # fleet
+    from .fleet import DEFAULT_PORT as FLEET_PORT
+    p = sub.add_parser("fleet", help="Serve diagnoses to many hosts, batched")
+    p.add_argument("--host", default="127.0.0.1",
+                   help="Bind address (no authentication: keep it private)")
+    p.add_argument("--port", type=int, default=FLEET_PORT)
+    p.add_argument("--model", default=DEFAULT_OLLAMA_MODEL)
+    p.add_argument("--keep-alive", default="24h")
+    p.add_argument("--agent-mode", default="two_stage",
+                   choices=["two_stage", "fused"])
+    p.add_argument("--program", default="auto",
+                   help="Compiled program: path, 'auto' or 'none'")
+    p.add_argument("--max-batch", type=int, default=32)
+    p.add_argument("--max-wait", type=float, default=0.05,
+                   help="Seconds to hold a batch open for more requests")
+    p.add_argument("--threads", type=int, default=4,
+                   help="Distinct inputs diagnosed concurrently")
+    p.add_argument("--cache-ttl", type=float, default=600.0,
+                   help="Reuse diagnoses across batches (0 disables)")
+    p.add_argument("--stub", action="store_true",
+                   help="Use the deterministic stub LM instead of Ollama")
+    p.add_argument("--latency", type=float, default=0.0,
+                   help="Stub LM seconds per call")
+    p.set_defaults(func=cmd_fleet)
+
     # list-actions
     p = sub.add_parser("list-actions", help="List allowed actions")
     p.set_defaults(func=cmd_list_actions)
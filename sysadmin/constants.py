@@ -9,6 +9,12 @@ DEFAULT_COOLDOWN = 300
 DEFAULT_RX_THRESHOLD = 10.0
 DEFAULT_TX_RX_RATIO = 10.0
 CONFIDENCE_THRESHOLD = 0.7
+LINK_HELPER_SOCKET = "/run/sysadmin-link.sock"
+LM_CACHE_PATH = "~/.cache/sysadmin/lm_cache.sqlite"
+DISTILLED_PATH = "~/.local/share/sysadmin/distilled.json"
+FAST_PATH_RATIO = 20.0
+FAST_PATH_MIN_SIGNAL = -70
+FAST_PATH_CONFIDENCE = 0.95
 
 ALLOWED_ACTIONS = {
     "wifi_reset": {
@@ -29,6 +35,15 @@ ALLOWED_ACTIONS = {
     },
 }
 
+# Recovery action for each issue type the rules can diagnose on their own
+ISSUE_ACTIONS = {
+    "wifi_rx_degraded": "wifi_reset",
+    "interface_down": "wifi_reset",
+}
+
+# Actions retried, in order, when recovery after an action is not verified
+RETRIES = {"wifi_reset": ["wifi_reset"]}
+
 KNOWN_WIFI_ISSUES = """MediaTek MT7925 driver bugs:
 1. RX rate drops to 6 Mbit/s while TX stays normal (576+ Mbit/s)
 2. Recovery: interface reset (down/up) fixes it
@@ -1,6 +1,9 @@
 """Training dataset for DSPy optimization."""
 import random
-from sysadmin.signatures import DiagnosisResult
+from sysadmin.models import DiagnosisResult
+
+# bump when generate_examples changes, so compiled programs record it
+DATASET_VERSION = "builtin-1"
 
 
 def _make(state, rx, tx, signal, issue, itype, sev):
@@ -94,14 +97,27 @@ DIAGNOSE_EXAMPLES = [
 ]
 
 
-def to_dspy_examples(n: int = 5, seed: int = 42):
+def expected_decision(diag: DiagnosisResult):
+    """Action label implied by a diagnosis, for the fused signature."""
+    from .constants import ISSUE_ACTIONS
+    from .models import ActionDecision
+    return ActionDecision(action=ISSUE_ACTIONS.get(diag.issue_type, "none"),
+                          confidence=1.0)
+
+
+def to_dspy_examples(n: int = 5, seed: int = 42, fused: bool = False):
     """Convert generated examples to DSPy Example format."""
+    import json
     import dspy
-    from .constants import KNOWN_WIFI_ISSUES
+    from .constants import ALLOWED_ACTIONS, KNOWN_WIFI_ISSUES
+    from .history import NO_TREND
     examples = []
     for ex in generate_examples(n, seed):
-        inp = {**ex["inputs"], "known_issues": KNOWN_WIFI_ISSUES}
-        examples.append(dspy.Example(diagnosis=ex["output"], **inp).with_inputs(
-            "interface", "state", "rx_mbps", "tx_mbps", "signal", "known_issues"
-        ))
+        inp = {**ex["inputs"], "trend": NO_TREND,
+               "known_issues": KNOWN_WIFI_ISSUES}
+        out = {"diagnosis": ex["output"]}
+        if fused:
+            inp["allowed_actions"] = json.dumps(list(ALLOWED_ACTIONS.keys()))
+            out["decision"] = expected_decision(ex["output"])
+        examples.append(dspy.Example(**out, **inp).with_inputs(*inp))
     return examples
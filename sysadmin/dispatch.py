@@ -0,0 +1,95 @@
+"""Bounded, coalescing anomaly queue between sampling and the agent."""
+from __future__ import annotations
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable
+
+from .monitor import Metrics
+
+log = logging.getLogger(__name__)
+
+
+class AnomalyDispatcher:
+    """Hand anomalies to worker threads without blocking the sampler.
+
+    At most one diagnosis per interface is queued or in flight: a new
+    anomaly for an interface already queued replaces the queued metrics
+    (latest wins), one for an interface already being diagnosed is
+    folded into that diagnosis. When maxsize interfaces are queued, new
+    ones are dropped.
+    """
+
+    def __init__(self, handler: Callable[[Metrics], None],
+                 maxsize: int = 8, workers: int = 1):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.counts = Counter()
+        self._pending: OrderedDict[str, Metrics] = OrderedDict()
+        self._inflight: set[str] = set()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, daemon=True,
+                                          name=f"anomaly-{i}")
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, m: Metrics) -> str:
+        """Queue m; returns 'queued', 'coalesced' or 'dropped'."""
+        with self._cond:
+            self.counts["submitted"] += 1
+            if m.interface in self._inflight:
+                outcome = "coalesced"
+            elif m.interface in self._pending:
+                self._pending[m.interface] = m
+                outcome = "coalesced"
+            elif len(self._pending) >= self.maxsize or self._closed:
+                outcome = "dropped"
+            else:
+                self._pending[m.interface] = m
+                self._cond.notify()
+                outcome = "queued"
+            self.counts[outcome] += 1
+        if outcome != "queued":
+            log.debug(f"Anomaly {outcome}: {m.interface}")
+        return outcome
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                iface, m = self._pending.popitem(last=False)
+                self._inflight.add(iface)
+            outcome = "handled"
+            try:
+                self.handler(m)
+            except Exception as e:
+                log.error(f"Anomaly handler failed for {iface}: {e}")
+                outcome = "failed"
+            with self._cond:
+                self.counts[outcome] += 1
+                self._inflight.discard(iface)
+                self._cond.notify_all()
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Wait until nothing is queued or in flight."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._inflight, timeout)
+
+    def close(self, timeout: float | None = None):
+        """Finish queued work, then stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self.counts, "pending": len(self._pending),
+                    "inflight": len(self._inflight)}
@@ -0,0 +1,173 @@
+"""Distill logged LLM decisions into a small softmax classifier (numpy).
+
+Training data is every audit 'decision' record answered by the LLM
+itself (source 'llm', not rules, cache or the distilled model) that
+carries its input metrics and a definite issue type, plus labeled examples from dataset.generate_examples. The
+model is a multinomial logistic regression over a handful of link
+features; it is stored as JSON and predicts in microseconds.
+"""
+from __future__ import annotations
+import json
+import logging
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .constants import DISTILLED_PATH as DEFAULT_PATH, ISSUE_ACTIONS
+from .history import NO_TREND
+from .telemetry import SOURCE, TIER
+
+log = logging.getLogger(__name__)
+
+_DOWN_STATES = ("down", "lowerlayerdown", "notpresent")
+
+
+def features(state: str, rx_mbps: float, tx_mbps: float, signal: int) -> list[float]:
+    up = state == "up"
+    return [float(up), float(state in _DOWN_STATES),
+            math.log1p(max(rx_mbps, 0.0)), math.log1p(max(tx_mbps, 0.0)),
+            math.log((tx_mbps + 0.1) / (rx_mbps + 0.1)), signal / 100.0]
+
+
+def from_audit(path: str, since=None) -> list[tuple[dict, str, str]]:
+    """(metrics, issue_type, severity) for LLM decisions that logged metrics."""
+    from .auditquery import query
+    rows = []
+    for r in query(path, since=since, event="decision"):
+        m, diag = r.get("metrics"), r.get("diag") or {}
+        if (r.get("source") == "llm" and m
+                and diag.get("issue_type") not in (None, "unknown")):
+            rows.append((m, diag["issue_type"], diag.get("severity", "none")))
+    return rows
+
+
+def from_dataset(n: int = 200, seed: int = 42) -> list[tuple[dict, str, str]]:
+    from .dataset import generate_examples
+    return [(ex["inputs"], ex["output"].issue_type, ex["output"].severity)
+            for ex in generate_examples(n, seed)]
+
+
+class DistilledModel:
+    def __init__(self, classes, severity, mean, std, W, b):
+        self.classes = list(classes)
+        self.severity = dict(severity)
+        self.mean, self.std = np.asarray(mean), np.asarray(std)
+        self.W, self.b = np.asarray(W), np.asarray(b)
+
+    @classmethod
+    def fit(cls, rows, epochs: int = 500, lr: float = 0.5, l2: float = 1e-3):
+        """Full-batch gradient descent on the cross-entropy loss."""
+        classes = sorted({r[1] for r in rows})
+        sev: dict[str, dict[str, int]] = {}
+        for _, itype, s in rows:
+            sev.setdefault(itype, {}).setdefault(s, 0)
+            sev[itype][s] += 1
+        severity = {c: max(v, key=v.get) for c, v in sev.items()}
+        X = np.array([features(**_metric_args(m)) for m, _, _ in rows])
+        y = np.array([classes.index(r[1]) for r in rows])
+        mean, std = X.mean(0), X.std(0) + 1e-6
+        Xs = (X - mean) / std
+        Y = np.eye(len(classes))[y]
+        W = np.zeros((X.shape[1], len(classes)))
+        b = np.zeros(len(classes))
+        for _ in range(epochs):
+            P = _softmax(Xs @ W + b)
+            G = (P - Y) / len(X)
+            W -= lr * (Xs.T @ G + l2 * W)
+            b -= lr * G.sum(0)
+        return cls(classes, severity, mean, std, W, b)
+
+    def predict_proba(self, state, rx_mbps, tx_mbps, signal) -> np.ndarray:
+        x = (np.array(features(state, rx_mbps, tx_mbps, signal)) - self.mean) / self.std
+        return _softmax(x @ self.W + self.b)
+
+    def predict(self, state, rx_mbps, tx_mbps, signal) -> tuple[str, float]:
+        p = self.predict_proba(state, rx_mbps, tx_mbps, signal)
+        i = int(p.argmax())
+        return self.classes[i], float(p[i])
+
+    def agreement(self, rows) -> float:
+        if not rows:
+            return 0.0
+        hits = sum(self.predict(**_metric_args(m))[0] == itype
+                   for m, itype, _ in rows)
+        return hits / len(rows)
+
+    def save(self, path: str = DEFAULT_PATH):
+        p = Path(path).expanduser()
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps({
+            "classes": self.classes, "severity": self.severity,
+            "mean": self.mean.tolist(), "std": self.std.tolist(),
+            "W": self.W.tolist(), "b": self.b.tolist(),
+            "created": time.time()}))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "DistilledModel":
+        d = json.loads(Path(path).expanduser().read_text())
+        return cls(d["classes"], d["severity"], d["mean"], d["std"], d["W"], d["b"])
+
+
+def _softmax(z):
+    z = z - z.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def _metric_args(m: dict) -> dict:
+    return {"state": m["state"], "rx_mbps": float(m["rx_mbps"]),
+            "tx_mbps": float(m["tx_mbps"]), "signal": int(m["signal"])}
+
+
+def split(rows, holdout: float = 0.2, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    idx = rng.permutation(len(rows))
+    k = int(len(rows) * holdout)
+    return [rows[i] for i in idx[k:]], [rows[i] for i in idx[:k]]
+
+
+def distill(audit_path: str, synthetic: int = 200, holdout: float = 0.2,
+            since=None) -> tuple[DistilledModel, dict]:
+    """Train on audit decisions + synthetic data; report held-out agreement."""
+    logged = from_audit(audit_path, since)
+    train, test = split(logged, holdout)
+    rows = train + from_dataset(synthetic)
+    model = DistilledModel.fit(rows)
+    report = {"logged": len(logged), "train": len(rows),
+              "holdout": len(test), "classes": model.classes,
+              "agreement_with_llm": model.agreement(test) if test else None}
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        model.predict("up", 6.0, 400.0, -45)
+    report["predict_us"] = (time.perf_counter() - t0) * 1000
+    return model, report
+
+
+class DistilledAgent:
+    """Answer from the distilled model; fall back when it is unsure."""
+
+    def __init__(self, model: DistilledModel, fallback=None,
+                 min_confidence: float = 0.9, audit=None):
+        self.model = model
+        self.fallback = fallback
+        self.min_confidence = min_confidence
+        self.audit = audit
+
+    def __call__(self, interface: str, state: str,
+                 rx_mbps: float, tx_mbps: float, signal: int,
+                 trend: str = NO_TREND):
+        from .models import ActionDecision, DiagnosisResult
+        itype, p = self.model.predict(state, rx_mbps, tx_mbps, signal)
+        if p >= self.min_confidence or self.fallback is None:
+            TIER.inc("distilled")
+            SOURCE.set("distilled")
+            if self.audit is not None:
+                self.audit.log_tier(interface, "distilled", f"{itype} p={p:.2f}")
+            diag = DiagnosisResult(issue_detected=itype != "none", issue_type=itype,
+                                   severity=self.model.severity.get(itype, "warning"))
+            dec = ActionDecision(action=ISSUE_ACTIONS.get(itype, "none"), confidence=p)
+            return diag, dec, f"distilled: {itype} p={p:.2f}"
+        log.info(f"Distilled model unsure ({itype} p={p:.2f}), escalating")
+        return self.fallback(interface, state, rx_mbps, tx_mbps, signal, trend=trend)
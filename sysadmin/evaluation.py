@@ -0,0 +1,113 @@
+"""Batch evaluation of diagnosers: accuracy, failures, latency, tokens."""
+from __future__ import annotations
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import dspy
+
+from . import __version__
+from .bench import percentiles
+from .optimize import metric
+
+log = logging.getLogger(__name__)
+
+PROGRAMS = ["base", "compiled", "fused"]
+PARSE_FAILURE = "parse_failure"
+
+
+def load_program(kind: str, path: str | None = None):
+    """Diagnoser to evaluate; 'compiled' (and optionally 'fused') load path."""
+    from . import programs
+    from .agent import FusedDiagnoser, NetworkDiagnoser
+    if kind not in PROGRAMS:
+        raise ValueError(f"Unknown program '{kind}'")
+    if kind == "compiled" and not path:
+        raise ValueError("compiled program needs a path")
+    program = FusedDiagnoser() if kind == "fused" else NetworkDiagnoser()
+    if path:
+        programs.load_into(program, path, programs.target_for(kind))
+    return program
+
+
+def _run_one(program, ex, lm):
+    with dspy.context(lm=lm), dspy.track_usage() as usage:
+        t0 = time.perf_counter()
+        try:
+            pred = program(**ex.inputs())
+        except Exception as e:
+            log.debug(f"Prediction failed: {e}")
+            pred = None
+        dt = time.perf_counter() - t0
+    if isinstance(pred, tuple):  # FusedDiagnoser
+        pred = pred[0]
+    tokens = {"prompt_tokens": 0, "completion_tokens": 0}
+    for u in usage.get_total_tokens().values():
+        for k in tokens:
+            tokens[k] += u.get(k) or 0
+    return pred, dt, tokens
+
+
+def evaluate(program, examples, lm, threads: int = 4) -> dict:
+    """Run program over examples concurrently and summarize the results."""
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda ex: _run_one(program, ex, lm), examples))
+    wall = time.perf_counter() - t0
+    labels = sorted({ex.diagnosis.issue_type for ex in examples})
+    confusion: dict[str, dict[str, int]] = {l: {} for l in labels}
+    scores, lat, ptok, ctok = [], [], [], []
+    failures = 0
+    for ex, (pred, dt, tokens) in zip(examples, results):
+        got = pred.issue_type if pred is not None else PARSE_FAILURE
+        failures += pred is None
+        row = confusion[ex.diagnosis.issue_type]
+        row[got] = row.get(got, 0) + 1
+        scores.append(metric(ex, pred))
+        lat.append(dt)
+        ptok.append(tokens["prompt_tokens"])
+        ctok.append(tokens["completion_tokens"])
+    n = len(examples)
+    correct = sum(confusion[l].get(l, 0) for l in labels)
+    return {"version": __version__, "model": lm.model, "n": n,
+            "threads": threads, "wall_s": wall,
+            "accuracy": correct / n if n else 0.0,
+            "score": sum(scores) / n if n else 0.0,
+            "failure_rate": failures / n if n else 0.0,
+            "labels": labels, "confusion": confusion,
+            "latency_ms": percentiles(lat),
+            "prompt_tokens": percentiles(ptok, scale=1),
+            "completion_tokens": percentiles(ctok, scale=1)}
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2) -> list[str]:
+    """Regressions of current vs a previous result (latency, accuracy)."""
+    out = []
+    for q in ("p50", "p95", "p99"):
+        old, new = baseline["latency_ms"][q], current["latency_ms"][q]
+        if old and new > old * (1 + tolerance):
+            out.append(f"latency {q} {old:.0f}ms -> {new:.0f}ms")
+    if baseline["accuracy"] - current["accuracy"] > 0.05:
+        out.append(f"accuracy {baseline['accuracy']:.2f} -> {current['accuracy']:.2f}")
+    if current["failure_rate"] - baseline["failure_rate"] > 0.05:
+        out.append(f"failure_rate {baseline['failure_rate']:.2f}"
+                   f" -> {current['failure_rate']:.2f}")
+    return out
+
+
+def format_confusion(result: dict) -> str:
+    labels = result["labels"]
+    cols = labels + sorted({g for r in result["confusion"].values() for g in r}
+                           - set(labels))
+    w = max(len(c) for c in cols) + 2
+    lines = ["expected \\ got".ljust(w) + "".join(c[:w - 1].rjust(w) for c in cols)]
+    for label, row in result["confusion"].items():
+        lines.append(label.ljust(w) + "".join(str(row.get(c, 0)).rjust(w)
+                                              for c in cols))
+    return "\n".join(lines)
+
+
+def save(result: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
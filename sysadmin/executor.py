@@ -3,16 +3,19 @@ from __future__ import annotations
 import logging
 import shlex
 import subprocess
+import time
 from .audit import AuditLogger
 from .constants import ALLOWED_ACTIONS
+from .telemetry import ACTION_SECONDS, ACTIONS
 
 log = logging.getLogger(__name__)
 
 
 class SecureExecutor:
-    def __init__(self, audit: AuditLogger, dry_run: bool = False):
+    def __init__(self, audit: AuditLogger, dry_run: bool = False, helper=None):
         self.audit = audit
         self.dry_run = dry_run
+        self.helper = helper
 
     def _build_cmds(self, action: str, iface: str):
         if action not in ALLOWED_ACTIONS:
@@ -32,21 +35,47 @@ class SecureExecutor:
         if cmds is None:
             self.audit.log_action(action, False, -1, "not allowed")
             return False
-        self.audit.log_intent(action, {"iface": iface}, cmds[0], reason)
         if self.dry_run:
+            self.audit.log_intent(action, {"iface": iface}, cmds[0], reason)
             for cmd in cmds:
                 log.info(f"DRY RUN: {' '.join(cmd)}")
             self.audit.log_action(action, True, 0, "dry run")
             return True
+        t0 = time.perf_counter()
+        ok, rc = self._run(action, iface, cmds, reason)
+        ACTION_SECONDS.observe(time.perf_counter() - t0, action)
+        ACTIONS.inc(action, str(rc))
+        return ok
+
+    def _run(self, action: str, iface: str, cmds, reason: str):
+        """Perform the action via the helper or sudo; returns (ok, rc).
+
+        The intent is logged for the path actually taken (both, if the
+        helper fails and sudo is used instead).
+        """
+        params = {"iface": iface}
+        if self.helper is not None and self.helper.available():
+            self.audit.log_intent(action, params,
+                                  ["link-helper", str(self.helper.path),
+                                   action, iface], reason)
+            try:
+                r = self.helper.run(action, iface)
+            except (OSError, ValueError) as e:
+                log.warning(f"Link helper unavailable ({e}), using sudo")
+            else:
+                self.audit.log_action(action, r["ok"], r["rc"],
+                                      reason if r["ok"] else r.get("error", ""))
+                return r["ok"], r["rc"]
+        self.audit.log_intent(action, params, cmds[0], reason)
         for cmd in cmds:
             try:
                 r = subprocess.run(cmd, capture_output=True, timeout=30)
                 if r.returncode != 0:
                     self.audit.log_action(action, False, r.returncode, reason)
-                    return False
+                    return False, r.returncode
             except Exception as e:
                 log.error(f"Failed: {e}")
                 self.audit.log_action(action, False, -1, str(e))
-                return False
+                return False, -1
         self.audit.log_action(action, True, 0, reason)
-        return True
+        return True, 0
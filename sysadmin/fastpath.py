@@ -0,0 +1,96 @@
+"""Deterministic fast path in front of the LLM agent."""
+from __future__ import annotations
+import logging
+import time
+
+from .constants import DEFAULT_RX_THRESHOLD, FAST_PATH_CONFIDENCE
+from .constants import FAST_PATH_MIN_SIGNAL, FAST_PATH_RATIO, ISSUE_ACTIONS
+from .history import NO_TREND
+from .models import ActionDecision, DiagnosisResult
+from .telemetry import AGENT_SECONDS, SOURCE, TIER
+
+log = logging.getLogger(__name__)
+
+TIERS = ["llm", "tiered", "rules"]
+
+
+def _result(issue_type: str, reason: str):
+    detected = issue_type != "none"
+    diag = DiagnosisResult(issue_detected=detected, issue_type=issue_type,
+                           severity="critical" if detected else "none")
+    action = ISSUE_ACTIONS.get(issue_type, "none")
+    conf = FAST_PATH_CONFIDENCE if detected else 1.0
+    return diag, ActionDecision(action=action, confidence=conf), reason
+
+
+def rule_diagnose(state: str, rx_mbps: float, tx_mbps: float, signal: int,
+                  rx_threshold: float = DEFAULT_RX_THRESHOLD,
+                  ratio: float = FAST_PATH_RATIO,
+                  min_signal: int = FAST_PATH_MIN_SIGNAL):
+    """Return (diag, decision, reason) for unambiguous metrics, else None."""
+    if state in ("down", "lowerlayerdown", "notpresent"):
+        return _result("interface_down", f"rule: state={state}")
+    if state != "up":
+        return None  # dormant/unknown: let the LLM look at it
+    if rx_mbps >= rx_threshold:
+        return _result("none", "rule: rx above threshold")
+    r = tx_mbps / max(rx_mbps, 0.1)
+    if r >= ratio and signal >= min_signal:
+        return _result("wifi_rx_degraded", f"rule: TX/RX={r:.1f}, signal={signal}")
+    return None
+
+
+def unresolved():
+    """Placeholder result when no LLM is allowed or available."""
+    diag = DiagnosisResult(issue_detected=True, issue_type="unknown",
+                           severity="warning")
+    return diag, ActionDecision(action="none", confidence=0.0), "rule: ambiguous"
+
+
+class TieredAgent:
+    """Resolve clear-cut metrics by rule, escalate the rest to the agent.
+
+    tier: 'llm' always calls the agent, 'rules' never does, 'tiered'
+    calls it only when the rules return nothing. A "no issue" rule
+    result is not trusted for trend-detected anomalies, since the window
+    flagged something the current sample does not show. rx_thresholds
+    maps an interface to its own RX threshold (default:
+    DEFAULT_RX_THRESHOLD).
+    """
+
+    def __init__(self, agent, audit=None, tier: str = "tiered",
+                 rx_thresholds: dict[str, float] | None = None, **rules):
+        if tier not in TIERS:
+            raise ValueError(f"Unknown tier '{tier}'")
+        self.agent = agent
+        self.audit = audit
+        self.tier = tier
+        self.rx_thresholds = rx_thresholds or {}
+        self.rules = rules
+
+    def _log(self, iface: str, tier: str, reason: str):
+        TIER.inc(tier)
+        SOURCE.set(tier)
+        if self.audit is not None:
+            self.audit.log_tier(iface, tier, reason)
+
+    def __call__(self, interface: str, state: str,
+                 rx_mbps: float, tx_mbps: float, signal: int,
+                 trend: str = NO_TREND):
+        if self.tier != "llm":
+            t0 = time.perf_counter()
+            rx_thresh = self.rx_thresholds.get(interface, DEFAULT_RX_THRESHOLD)
+            r = rule_diagnose(state, rx_mbps, tx_mbps, signal, rx_thresh,
+                              **self.rules)
+            AGENT_SECONDS.observe(time.perf_counter() - t0, "rules")
+            if r is not None and trend != NO_TREND and not r[0].issue_detected:
+                r = None
+            if r is not None:
+                self._log(interface, "rules", r[2])
+                return r
+            if self.tier == "rules" or self.agent is None:
+                self._log(interface, "rules", "ambiguous, no escalation")
+                return unresolved()
+        self._log(interface, "llm", "escalated")
+        return self.agent(interface, state, rx_mbps, tx_mbps, signal,
+                          trend=trend)
@@ -0,0 +1,189 @@
+"""Central diagnosis service for many hosts, with micro-batching.
+
+Hosts POST anomalous metrics to /diagnose and block until their decision
+comes back; actions are still executed locally by each host. The
+aggregator collects requests for up to max_wait seconds (or max_batch
+requests), runs the agent once per distinct input in the batch, and
+answers every request that shared that input.
+"""
+from __future__ import annotations
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .history import NO_TREND
+from .telemetry import SOURCE
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+_FIELDS = ("interface", "state", "rx_mbps", "tx_mbps", "signal", "trend")
+
+
+class FleetAggregator:
+    """Micro-batch diagnosis requests and deduplicate identical inputs."""
+
+    def __init__(self, agent, max_batch: int = 32, max_wait: float = 0.05,
+                 threads: int = 4, lm=None):
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.lm = lm
+        self._pool = ThreadPoolExecutor(threads, thread_name_prefix="fleet")
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.batch_sizes: list[int] = []
+        self.unique_sizes: list[int] = []
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True,
+                                        name="fleet-batcher")
+        self._thread.start()
+
+    def submit(self, host: str, metrics: dict) -> Future:
+        """Queue one request; the future resolves to (diag, dec, reason)."""
+        key = tuple(metrics.get(k, NO_TREND if k == "trend" else None)
+                    for k in _FIELDS)
+        fut: Future = Future()
+        self._queue.put((key, host, fut))
+        return fut
+
+    def _collect(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remain = deadline - time.monotonic()
+            if remain <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remain))
+            except queue.Empty:
+                break
+        return batch
+
+    def _diagnose(self, key):
+        iface, state, rx, tx, signal, trend = key
+        with self._context():
+            return self.agent(iface, state, rx, tx, signal, trend=trend)
+
+    def _context(self):
+        if self.lm is None:
+            return nullcontext()
+        import dspy
+        return dspy.context(lm=self.lm)
+
+    def _loop(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                continue
+            groups: dict[tuple, list[Future]] = {}
+            for key, _, fut in batch:
+                groups.setdefault(key, []).append(fut)
+            with self._lock:
+                self.batch_sizes.append(len(batch))
+                self.unique_sizes.append(len(groups))
+            keys = list(groups)
+            futures = [self._pool.submit(self._diagnose, k) for k in keys]
+            for key, f in zip(keys, futures):
+                try:
+                    result = f.result()
+                except Exception as e:
+                    for fut in groups[key]:
+                        fut.set_exception(e)
+                else:
+                    for fut in groups[key]:
+                        fut.set_result(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = len(self.batch_sizes)
+            reqs, uniq = sum(self.batch_sizes), sum(self.unique_sizes)
+            return {"batches": n, "requests": reqs, "agent_calls": uniq,
+                    "mean_batch": reqs / n if n else 0.0,
+                    "max_batch": max(self.batch_sizes, default=0),
+                    "dedup_ratio": 1 - uniq / reqs if reqs else 0.0}
+
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=2)
+        self._pool.shutdown(wait=False)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != "/diagnose":
+            self.send_error(404)
+            return
+        try:
+            req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            fut = self.server.aggregator.submit(req.get("host", "?"), req["metrics"])
+            diag, dec, reason = fut.result(timeout=self.server.timeout_s)
+            code, body = 200, {"diagnosis": diag.model_dump(),
+                               "decision": dec.model_dump(), "reasoning": reason}
+        except (ValueError, KeyError, TypeError) as e:
+            code, body = 400, {"error": str(e)}
+        except Exception as e:
+            code, body = 503, {"error": f"{type(e).__name__}: {e}"}
+        data = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # every host may report at once
+
+
+def serve(aggregator: FleetAggregator, port: int = DEFAULT_PORT,
+          host: str = "127.0.0.1", timeout: float = 120.0):
+    """Start the HTTP front end on a daemon thread; returns the server."""
+    server = _Server((host, port), _Handler)
+    server.aggregator = aggregator
+    server.timeout_s = timeout
+    threading.Thread(target=server.serve_forever, daemon=True,
+                     name="fleet-http").start()
+    log.info(f"Fleet aggregator on http://{host}:{server.server_address[1]}")
+    return server
+
+
+class FleetClient:
+    """Agent callable that asks the aggregator instead of a local LLM."""
+
+    def __init__(self, url: str, host: str | None = None, timeout: float = 120.0):
+        import socket
+        self.url = url.rstrip("/") + "/diagnose"
+        self.host = host or socket.gethostname()
+        self.timeout = timeout
+
+    def __call__(self, interface: str, state: str,
+                 rx_mbps: float, tx_mbps: float, signal: int,
+                 trend: str = NO_TREND):
+        from .models import ActionDecision, DiagnosisResult
+        metrics = dict(zip(_FIELDS, (interface, state, rx_mbps, tx_mbps,
+                                     signal, trend)))
+        req = urllib.request.Request(
+            self.url, json.dumps({"host": self.host, "metrics": metrics}).encode(),
+            {"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as r:
+                body = json.loads(r.read())
+        except OSError as e:
+            raise RuntimeError(f"Fleet aggregator unavailable: {e}") from e
+        SOURCE.set("fleet")  # may be a cached answer on the aggregator
+        return (DiagnosisResult(**body["diagnosis"]),
+                ActionDecision(**body["decision"]), body["reasoning"])
@@ -0,0 +1,143 @@
+"""Fixed-size per-interface metrics history and windowed trend detection."""
+from __future__ import annotations
+import bisect
+import logging
+from array import array
+from collections import deque
+
+from .constants import DEFAULT_RX_THRESHOLD, DEFAULT_TX_RX_RATIO
+
+log = logging.getLogger(__name__)
+
+NO_TREND = "n/a"
+TREND_HISTORY = 120  # samples kept by TrendDetector
+TREND_N, TREND_M = 3, 5  # raise when n of the last m samples are flagged
+
+
+class MetricsHistory:
+    """Ring buffer of per-sample link state, O(1) append.
+
+    RX/TX are summarised by TrendDetector's median and EWMAs instead.
+    """
+
+    def __init__(self, size: int = TREND_HISTORY):
+        self.size = size
+        self.up = array("b", bytes(size))
+        self.count = 0
+
+    def append(self, m):
+        self.up[self.count % self.size] = m.state == "up"
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def last(self, column: str, k: int) -> list:
+        """Most recent k values of a column, oldest first."""
+        col = getattr(self, column)
+        k = min(k, len(self))
+        end = self.count % self.size
+        if k <= end:
+            return col[end - k:end].tolist()
+        return (col[self.size - (k - end):] + col[:end]).tolist()
+
+
+class _RollingMedian:
+    def __init__(self, k: int):
+        self.k = k
+        self.ring: deque[float] = deque(maxlen=k)
+        self.sorted: list[float] = []
+
+    def push(self, v: float) -> float:
+        if len(self.ring) == self.k:
+            old = self.ring.popleft()
+            del self.sorted[bisect.bisect_left(self.sorted, old)]
+        self.ring.append(v)
+        bisect.insort(self.sorted, v)
+        n = len(self.sorted)
+        mid = n // 2
+        return self.sorted[mid] if n % 2 else (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+
+class TrendDetector:
+    """Anomaly detection over a sliding window instead of single samples.
+
+    A sample is flagged if the rolling median of RX shows the TX/RX
+    imbalance, or if fast EWMA of RX has dropped below drop_fraction of
+    its slow baseline (gradual degradation). The detector raises once n
+    of the last m samples are flagged. It clears only when the median
+    RX is above clear_factor * rx_threshold and the EWMA is back above
+    clear_factor * drop_fraction of the baseline (hysteresis on both
+    conditions), which also resets the window. A link that is not up is
+    reported immediately.
+    """
+
+    def __init__(self, rx_threshold: float = DEFAULT_RX_THRESHOLD,
+                 ratio_threshold: float = DEFAULT_TX_RX_RATIO,
+                 n: int = TREND_N, m: int = TREND_M, median_window: int = 5,
+                 alpha: float = 0.3, baseline_alpha: float = 0.02,
+                 drop_fraction: float = 0.2, clear_factor: float = 1.5,
+                 history: int = TREND_HISTORY):
+        self.rx_thresh = rx_threshold
+        self.ratio_thresh = ratio_threshold
+        self.n, self.m = n, m
+        self.alpha, self.baseline_alpha = alpha, baseline_alpha
+        self.drop_fraction = drop_fraction
+        self.clear_factor = clear_factor
+        self.history = MetricsHistory(history)
+        self._median = _RollingMedian(median_window)
+        self._flags = array("b", bytes(m))
+        self._flagged = 0
+        self.ewma_rx = self.ewma_tx = self.baseline_rx = None
+        self.median_rx = 0.0
+        self.active = False
+
+    def _ewma(self, prev, v, a):
+        return v if prev is None else prev + a * (v - prev)
+
+    def update(self, m) -> bool:
+        h = self.history
+        slot = h.count % self.m
+        h.append(m)
+        self.median_rx = self._median.push(m.rx_mbps)
+        self.ewma_rx = self._ewma(self.ewma_rx, m.rx_mbps, self.alpha)
+        self.ewma_tx = self._ewma(self.ewma_tx, m.tx_mbps, self.alpha)
+        self.baseline_rx = self._ewma(self.baseline_rx, m.rx_mbps,
+                                      self.baseline_alpha)
+        flag = m.state == "up" and (self._imbalanced() or self._degrading())
+        self._flagged += flag - self._flags[slot]
+        self._flags[slot] = flag
+        if m.state != "up":
+            self.active = True
+        elif not self.active and self._flagged >= self.n:
+            log.info(f"Trend anomaly: {self.summary()}")
+            self.active = True
+        elif self.active and self._recovered():
+            self.active = False
+            self._flags = array("b", bytes(self.m))
+            self._flagged = 0
+        return self.active
+
+    def _imbalanced(self) -> bool:
+        rx = self.median_rx
+        return (rx < self.rx_thresh and self.ewma_tx > 0
+                and self.ewma_tx / max(rx, 0.1) > self.ratio_thresh)
+
+    def _degrading(self) -> bool:
+        return (self.baseline_rx > self.rx_thresh
+                and self.ewma_rx < self.drop_fraction * self.baseline_rx)
+
+    def _recovered(self) -> bool:
+        return (self.median_rx > self.clear_factor * self.rx_thresh
+                and self.ewma_rx >= (self.clear_factor * self.drop_fraction
+                                     * self.baseline_rx))
+
+    def summary(self) -> str:
+        """One-line window summary for the diagnoser."""
+        if not len(self.history):
+            return NO_TREND
+        up = self.history.last("up", self.m)
+        return (f"last {len(self.history)} samples: rx_median={self.median_rx:.1f}"
+                f" rx_ewma={self.ewma_rx:.1f} rx_baseline={self.baseline_rx:.1f}"
+                f" tx_ewma={self.ewma_tx:.1f} flagged={self._flagged}/{self.m}"
+                f" up={sum(up)}/{len(up)}")
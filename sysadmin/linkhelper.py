@@ -0,0 +1,168 @@
+"""Root-owned link-control helper: whitelisted actions over a Unix socket.
+
+Run as root (see config/sysadmin-linkhelper.service). It keeps one
+rtnetlink socket open and performs ALLOWED_ACTIONS as direct RTM_NEWLINK
+requests, so a reset costs two netlink round-trips instead of two sudo
+and ip executions. Only peers whose uid is allowed may connect.
+"""
+from __future__ import annotations
+import argparse
+import json
+import logging
+import os
+import pwd
+import re
+import socket
+import socketserver
+import struct
+import time
+
+from . import netlink as nl
+from .constants import ALLOWED_ACTIONS, LINK_HELPER_SOCKET
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SOCKET = LINK_HELPER_SOCKET
+RTM_NEWLINK = 16
+IFF_UP = 0x1
+
+_IFINFOMSG = struct.Struct("=BxHiII")
+_PEERCRED = struct.Struct("3i")
+_LINK_CMD = re.compile(r"^/usr/sbin/ip link set \{iface\} (up|down)$")
+
+
+def pack_setlink(seq: int, index: int, up: bool) -> bytes:
+    payload = _IFINFOMSG.pack(socket.AF_UNSPEC, 0, index,
+                              IFF_UP if up else 0, IFF_UP)
+    return nl.pack_msg(RTM_NEWLINK, nl.NLM_F_REQUEST | nl.NLM_F_ACK, seq, payload)
+
+
+def link_ops(action: str, iface: str) -> list[bool] | None:
+    """Whitelisted action -> sequence of link states (True = up)."""
+    spec = ALLOWED_ACTIONS.get(action)
+    if spec is None or iface not in spec["ifaces"]:
+        return None
+    ops = []
+    for cmd in spec["cmds"]:
+        m = _LINK_CMD.match(cmd)
+        if m is None:
+            return None  # not expressible as a link flag change
+        ops.append(m.group(1) == "up")
+    return ops
+
+
+class Rtnl:
+    """Persistent rtnetlink socket that toggles IFF_UP."""
+
+    def __init__(self, sock: nl.NetlinkSocket | None = None):
+        self.sock = sock or nl.NetlinkSocket(nl.NETLINK_ROUTE)
+
+    def set_link(self, iface: str, up: bool):
+        seq = self.sock.next_seq()
+        self.sock.request(pack_setlink(seq, socket.if_nametoindex(iface), up), seq)
+
+
+class LinkHelper:
+    """Validate and perform one request; transport-independent."""
+
+    def __init__(self, rtnl, allowed_uids: set[int], settle: float = 0.0):
+        self.rtnl = rtnl
+        self.allowed_uids = allowed_uids
+        self.settle = settle
+
+    def handle(self, req, uid: int) -> dict:
+        """req is the decoded JSON request (None if it did not parse)."""
+        if uid not in self.allowed_uids:
+            log.warning(f"Rejected uid {uid}")
+            return {"ok": False, "rc": -1, "error": "uid not allowed"}
+        if not (isinstance(req, dict) and isinstance(req.get("action"), str)
+                and isinstance(req.get("iface"), str)):
+            log.warning(f"Rejected malformed request from uid {uid}")
+            return {"ok": False, "rc": -1, "error": "bad request"}
+        action, iface = req["action"], req["iface"]
+        ops = link_ops(action, iface)
+        if ops is None:
+            log.warning(f"Rejected action {action!r} on {iface!r}")
+            return {"ok": False, "rc": -1, "error": "not allowed"}
+        t0 = time.perf_counter()
+        try:
+            for i, up in enumerate(ops):
+                if i and self.settle:
+                    time.sleep(self.settle)
+                self.rtnl.set_link(iface, up)
+        except OSError as e:
+            log.error(f"{action} on {iface} failed: {e}")
+            return {"ok": False, "rc": e.errno or -1, "error": str(e)}
+        ms = 1000 * (time.perf_counter() - t0)
+        log.info(f"{action} on {iface} for uid {uid} in {ms:.1f}ms")
+        return {"ok": True, "rc": 0, "ms": ms}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        creds = self.request.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                        _PEERCRED.size)
+        _, uid, _ = _PEERCRED.unpack(creds)
+        try:
+            req = json.loads(self.rfile.readline(4096))
+        except ValueError:
+            req = None
+        resp = self.server.helper.handle(req, uid)
+        self.wfile.write(json.dumps(resp).encode() + b"\n")
+
+
+class HelperServer(socketserver.UnixStreamServer):
+    def __init__(self, path: str, helper: LinkHelper):
+        if os.path.exists(path):
+            os.unlink(path)
+        self.helper = helper
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o666)  # access is decided by peer uid, not mode
+
+
+class LinkHelperClient:
+    """Client side used by SecureExecutor and the watchdog."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def run(self, action: str, iface: str) -> dict:
+        """Perform action; raises OSError if the helper is unreachable."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(self.timeout)
+            s.connect(self.path)
+            s.sendall(json.dumps({"action": action, "iface": iface}).encode() + b"\n")
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = s.recv(4096)
+                if not chunk:
+                    raise ConnectionError("helper closed connection")
+                data += chunk
+        return json.loads(data)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Privileged link-control helper")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET)
+    ap.add_argument("--allow-user", action="append", default=[],
+                    help="User allowed to request actions (repeatable)")
+    ap.add_argument("--settle", type=float, default=0.0,
+                    help="Seconds between steps of multi-step actions")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s %(levelname)s: %(message)s")
+    uids = {pwd.getpwnam(u).pw_uid for u in args.allow_user}
+    server = HelperServer(args.socket, LinkHelper(Rtnl(), uids, args.settle))
+    log.info(f"Listening on {args.socket} for uids {sorted(uids)}")
+    try:
+        server.serve_forever()
+    finally:
+        os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
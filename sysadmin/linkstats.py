@@ -0,0 +1,133 @@
+"""Link statistics backends: nl80211 over generic netlink, iw fallback."""
+from __future__ import annotations
+import logging
+import re
+import socket
+import struct
+import subprocess
+import threading
+
+from . import netlink as nl
+
+log = logging.getLogger(__name__)
+
+NO_LINK = (0.0, 0.0, -100)
+
+NL80211_CMD_GET_INTERFACE = 5
+NL80211_CMD_GET_STATION = 17
+NL80211_ATTR_IFINDEX = 3
+NL80211_ATTR_STA_INFO = 21
+NL80211_STA_INFO_SIGNAL = 7
+NL80211_STA_INFO_TX_BITRATE = 8
+NL80211_STA_INFO_RX_BITRATE = 14
+NL80211_RATE_INFO_BITRATE = 1
+NL80211_RATE_INFO_BITRATE32 = 5
+
+
+def _rate_mbps(payload: bytes | None) -> float:
+    """Decode a nested rate_info attribute (units of 100 kbit/s)."""
+    if not payload:
+        return 0.0
+    attrs = nl.parse_attrs(payload)
+    if NL80211_RATE_INFO_BITRATE32 in attrs:
+        return struct.unpack("=I", attrs[NL80211_RATE_INFO_BITRATE32][:4])[0] / 10
+    if NL80211_RATE_INFO_BITRATE in attrs:
+        return struct.unpack("=H", attrs[NL80211_RATE_INFO_BITRATE][:2])[0] / 10
+    return 0.0
+
+
+def parse_station(payload: bytes) -> tuple[float, float, int] | None:
+    """Extract (rx_mbps, tx_mbps, signal) from a GET_STATION reply payload."""
+    attrs = nl.parse_attrs(payload, 4)  # skip genlmsghdr
+    info = attrs.get(NL80211_ATTR_STA_INFO)
+    if info is None:
+        return None
+    sta = nl.parse_attrs(info)
+    sig = sta.get(NL80211_STA_INFO_SIGNAL)
+    return (_rate_mbps(sta.get(NL80211_STA_INFO_RX_BITRATE)),
+            _rate_mbps(sta.get(NL80211_STA_INFO_TX_BITRATE)),
+            struct.unpack("=b", sig[:1])[0] if sig else -100)
+
+
+class IwBackend:
+    """Fork `iw dev <iface> link` and scrape its output."""
+    name = "iw"
+
+    def read(self, iface: str) -> tuple[float, float, int]:
+        try:
+            r = subprocess.run(["iw", "dev", iface, "link"],
+                               capture_output=True, text=True, timeout=5)
+            out = r.stdout
+        except Exception:
+            return NO_LINK
+        rx = re.search(r"rx bitrate:\s+([\d.]+)", out)
+        tx = re.search(r"tx bitrate:\s+([\d.]+)", out)
+        sig = re.search(r"signal:\s+(-?\d+)", out)
+        return (float(rx.group(1)) if rx else 0.0,
+                float(tx.group(1)) if tx else 0.0,
+                int(sig.group(1)) if sig else -100)
+
+    def close(self):
+        pass
+
+
+class Nl80211Backend:
+    """Query nl80211 GET_STATION over a persistent generic netlink socket."""
+    name = "nl80211"
+
+    def __init__(self, sock: nl.GenlSocket | None = None):
+        self.sock = sock or nl.GenlSocket()
+        self.family = self.sock.resolve("nl80211")
+        self._ifindex: dict[str, int] = {}
+        self._lock = threading.Lock()  # shared by monitors and the verifier
+
+    def _index(self, iface: str) -> int:
+        idx = self._ifindex.get(iface)
+        if idx is None:
+            idx = socket.if_nametoindex(iface)
+            # GET_INTERFACE fails with ENODEV for non-wireless links
+            seq = self.sock.next_seq()
+            self.sock.request(nl.pack_genl(
+                self.family, NL80211_CMD_GET_INTERFACE, nl.NLM_F_REQUEST, seq,
+                nl.pack_u32(NL80211_ATTR_IFINDEX, idx)), seq)
+            self._ifindex[iface] = idx
+        return idx
+
+    def read(self, iface: str) -> tuple[float, float, int]:
+        with self._lock:
+            return self._read(iface)
+
+    def _read(self, iface: str) -> tuple[float, float, int]:
+        try:
+            idx = self._index(iface)
+            seq = self.sock.next_seq()
+            replies = self.sock.request(nl.pack_genl(
+                self.family, NL80211_CMD_GET_STATION,
+                nl.NLM_F_REQUEST | nl.NLM_F_DUMP, seq,
+                nl.pack_u32(NL80211_ATTR_IFINDEX, idx)), seq)
+        except OSError as e:
+            log.debug(f"nl80211 read failed: {e}")
+            self._ifindex.pop(iface, None)
+            return NO_LINK
+        for payload in replies:
+            r = parse_station(payload)
+            if r is not None:
+                return r
+        return NO_LINK
+
+    def close(self):
+        self.sock.close()
+
+
+BACKENDS = {"iw": IwBackend, "nl80211": Nl80211Backend}
+
+
+def get_backend(name: str = "auto"):
+    """Return a backend instance; 'auto' prefers nl80211, falls back to iw."""
+    if name != "auto":
+        return BACKENDS[name]()
+    try:
+        return Nl80211Backend()
+    except OSError as e:
+        log.info(f"nl80211 unavailable ({e}), using iw")
+        return IwBackend()
@@ -0,0 +1,74 @@
+"""Link state change notifications via rtnetlink (RTMGRP_LINK)."""
+from __future__ import annotations
+import logging
+import select
+import struct
+from dataclasses import dataclass
+
+from . import netlink as nl
+
+log = logging.getLogger(__name__)
+
+RTMGRP_LINK = 1
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+IFLA_IFNAME = 3
+IFLA_OPERSTATE = 16
+IFLA_CARRIER = 33
+
+# Same names as /sys/class/net/<iface>/operstate
+OPERSTATES = ["unknown", "notpresent", "down", "lowerlayerdown",
+              "testing", "dormant", "up"]
+
+_IFINFOMSG = struct.Struct("=BxHiII")
+
+
+@dataclass
+class LinkEvent:
+    ifname: str
+    state: str
+    carrier: int | None = None
+
+
+def parse_link_events(data: bytes) -> list[LinkEvent]:
+    events = []
+    for mtype, _, _, payload in nl.iter_msgs(data):
+        if mtype not in (RTM_NEWLINK, RTM_DELLINK):
+            continue
+        attrs = nl.parse_attrs(payload, _IFINFOMSG.size)
+        name = attrs.get(IFLA_IFNAME)
+        if name is None:
+            continue
+        if mtype == RTM_DELLINK:
+            state = "notpresent"
+        else:
+            op = attrs.get(IFLA_OPERSTATE, b"\0")[0]
+            state = OPERSTATES[op] if op < len(OPERSTATES) else "unknown"
+        carrier = attrs.get(IFLA_CARRIER)
+        events.append(LinkEvent(name.rstrip(b"\0").decode(), state,
+                                carrier[0] if carrier else None))
+    return events
+
+
+class LinkWatcher:
+    """Subscribe to RTMGRP_LINK and block until link events arrive."""
+
+    def __init__(self, sock: nl.NetlinkSocket | None = None):
+        self.sock = sock or nl.NetlinkSocket(nl.NETLINK_ROUTE, RTMGRP_LINK)
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def read(self) -> list[LinkEvent]:
+        try:
+            return parse_link_events(self.sock.sock.recv(65536))
+        except OSError as e:  # ENOBUFS on overflow: caller resamples anyway
+            log.warning(f"rtnetlink recv failed: {e}")
+            return []
+
+    def wait(self, timeout: float) -> list[LinkEvent]:
+        r, _, _ = select.select([self.sock], [], [], max(timeout, 0))
+        return self.read() if r else []
+
+    def close(self):
+        self.sock.close()
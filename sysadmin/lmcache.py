@@ -0,0 +1,73 @@
+"""Disk-backed LM response cache for optimization and evaluation runs."""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import dspy
+
+from .constants import LM_CACHE_PATH as DEFAULT_PATH
+
+log = logging.getLogger(__name__)
+
+
+class CachedLM(dspy.LM):
+    """Serve repeated (model, prompt, temperature, kwargs) calls from SQLite.
+
+    Wraps another LM; the wrapped LM's own cache is not consulted so the
+    hit rate reported by stats() reflects this cache only. Copies made by
+    optimizers (lm.copy(rollout_id=..., temperature=...)) share the
+    database and counters but key on their own kwargs.
+    """
+
+    def __init__(self, lm, path: str = DEFAULT_PATH):
+        super().__init__(lm.model, cache=False)
+        self.lm = lm
+        self.kwargs = dict(lm.kwargs)
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses"
+                         " (key TEXT PRIMARY KEY, value TEXT)")
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+
+    def key(self, prompt, messages, kw: dict) -> str:
+        blob = json.dumps([self.model, prompt, messages, kw],
+                          sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        kwargs = {**self.kwargs, **kwargs}
+        key = self.key(prompt, messages, kwargs)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM responses WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is not None:
+                self._counts["hits"] += 1
+                return json.loads(row[0])
+            self._counts["misses"] += 1
+        out = self.lm(prompt=prompt, messages=messages, **kwargs)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)",
+                             (key, json.dumps(out)))
+            self._db.commit()
+        return out
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self._counts["hits"], self._counts["misses"]
+            calls = hits + misses
+            return {"calls": calls, "hits": hits, "misses": misses,
+                    "hit_rate": hits / calls if calls else 0.0}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,19 @@
+"""Pydantic result models, importable without dspy."""
+from __future__ import annotations
+from pydantic import BaseModel, field_validator
+
+
+class DiagnosisResult(BaseModel):
+    issue_detected: bool
+    issue_type: str  # wifi_rx_degraded, interface_down, none, ... (see synth)
+    severity: str    # critical, warning, none
+
+
+class ActionDecision(BaseModel):
+    action: str       # from whitelist or "none"
+    confidence: float
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def clamp(cls, v):
+        return max(0.0, min(1.0, float(v or 0)))
@@ -1,13 +1,15 @@
 """Network monitor for WiFi health."""
 from __future__ import annotations
 import logging
-import re
-import subprocess
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable
 
+from . import telemetry
+from .history import NO_TREND, TrendDetector
+from .linkstats import IwBackend
+
 log = logging.getLogger(__name__)
 
 
@@ -18,15 +20,24 @@ class Metrics:
     rx_mbps: float
     tx_mbps: float
     signal: int
+    trend: str = NO_TREND
 
 
 class NetworkMonitor:
     def __init__(self, iface: str, interval: float = 10.0,
-                 rx_threshold: float = 10.0, ratio_threshold: float = 10.0):
+                 rx_threshold: float = 10.0, ratio_threshold: float = 10.0,
+                 backend=None, watcher=None, detector: str = "point"):
         self.iface = iface
         self.interval = interval
         self.rx_thresh = rx_threshold
         self.ratio_thresh = ratio_threshold
+        self.backend = backend or IwBackend()
+        self.watcher = watcher
+        self.trend = None
+        if detector == "trend":
+            self.trend = TrendDetector(rx_threshold, ratio_threshold)
+        self._last_state = None
+        self._last_carrier: int | None = None
         self._running = False
 
     def _get_state(self) -> str:
@@ -36,26 +47,29 @@ class NetworkMonitor:
         except Exception:
             return "unknown"
 
-    def _get_link_info(self) -> tuple[float, float, int]:
+    def _get_carrier(self) -> int | None:
         try:
-            r = subprocess.run(["iw", "dev", self.iface, "link"],
-                               capture_output=True, text=True, timeout=5)
-            out = r.stdout
-        except Exception:
-            return 0.0, 0.0, -100
-        rx = re.search(r"rx bitrate:\s+([\d.]+)", out)
-        tx = re.search(r"tx bitrate:\s+([\d.]+)", out)
-        sig = re.search(r"signal:\s+(-?\d+)", out)
-        return (float(rx.group(1)) if rx else 0.0,
-                float(tx.group(1)) if tx else 0.0,
-                int(sig.group(1)) if sig else -100)
+            return int(Path(f"/sys/class/net/{self.iface}/carrier").read_text())
+        except (OSError, ValueError):  # EINVAL while the link is down
+            return None
+
+    def _get_link_info(self) -> tuple[float, float, int]:
+        return self.backend.read(self.iface)
 
     def collect(self) -> Metrics:
-        state = self._get_state()
-        rx, tx, sig = self._get_link_info()
+        with telemetry.COLLECT_SECONDS.time(self.iface):
+            state = self._get_state()
+            self._last_state = state
+            self._last_carrier = self._get_carrier()
+            rx, tx, sig = self._get_link_info()
         return Metrics(self.iface, state, rx, tx, sig)
 
     def detect_anomaly(self, m: Metrics) -> bool:
+        if self.trend is not None:
+            anomalous = self.trend.update(m)
+            if anomalous:
+                m.trend = self.trend.summary()
+            return anomalous
         if m.state != "up":
             log.info(f"Anomaly: state={m.state}")
             return True
@@ -73,7 +87,32 @@ class NetworkMonitor:
             m = self.collect()
             if self.detect_anomaly(m):
                 on_anomaly(m)
-            time.sleep(self.interval)
+            self._wait(self.interval)
+
+    def _wait(self, timeout: float):
+        """Sleep until timeout, or until our link changes state."""
+        if self.watcher is None:
+            time.sleep(timeout)
+            return
+        deadline = time.monotonic() + timeout
+        while self._running:
+            remain = deadline - time.monotonic()
+            if remain <= 0:
+                return
+            if any(self.is_state_change(ev) for ev in self.watcher.wait(remain)):
+                return
+
+    def is_state_change(self, ev) -> bool:
+        """Whether ev changes our operstate or carrier."""
+        if ev.ifname != self.iface:
+            return False
+        carrier = ev.carrier is not None and ev.carrier != self._last_carrier
+        if ev.carrier is not None:
+            self._last_carrier = ev.carrier
+        if ev.state == self._last_state and not carrier:
+            return False
+        log.info(f"Link event: {self.iface} -> {ev.state} carrier={ev.carrier}")
+        return True
 
     def stop(self):
         self._running = False
@@ -0,0 +1,149 @@
+"""Minimal pure-Python netlink helpers (no pyroute2 dependency)."""
+from __future__ import annotations
+import os
+import socket
+import struct
+
+NETLINK_ROUTE = 0
+NETLINK_GENERIC = 16
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_MULTI = 0x2
+NLM_F_ACK = 0x4
+NLM_F_DUMP = 0x300
+
+NLA_TYPE_MASK = 0x3FFF
+
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NLATTR = struct.Struct("=HH")
+_GENLHDR = struct.Struct("=BBH")
+
+
+class NetlinkError(OSError):
+    pass
+
+
+def _align(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def pack_attr(atype: int, payload: bytes) -> bytes:
+    length = _NLATTR.size + len(payload)
+    pad = b"\0" * (_align(length) - length)
+    return _NLATTR.pack(length, atype) + payload + pad
+
+
+def pack_u32(atype: int, v: int) -> bytes:
+    return pack_attr(atype, struct.pack("=I", v))
+
+
+def pack_str(atype: int, s: str) -> bytes:
+    return pack_attr(atype, s.encode() + b"\0")
+
+
+def parse_attrs(data: bytes, offset: int = 0) -> dict[int, bytes]:
+    """Parse a run of netlink attributes into {type: payload}."""
+    attrs = {}
+    while offset + _NLATTR.size <= len(data):
+        length, atype = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size:
+            break
+        attrs[atype & NLA_TYPE_MASK] = data[offset + _NLATTR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def pack_msg(mtype: int, flags: int, seq: int, payload: bytes) -> bytes:
+    return _NLMSGHDR.pack(_NLMSGHDR.size + len(payload), mtype,
+                          flags, seq, 0) + payload
+
+
+def pack_genl(family: int, cmd: int, flags: int, seq: int,
+              attrs: bytes = b"", version: int = 1) -> bytes:
+    return pack_msg(family, flags, seq, _GENLHDR.pack(cmd, version, 0) + attrs)
+
+
+def iter_msgs(data: bytes):
+    """Yield (type, flags, seq, payload) for each message in a buffer."""
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        length, mtype, flags, seq, _ = _NLMSGHDR.unpack_from(data, offset)
+        if length < _NLMSGHDR.size:
+            break
+        yield mtype, flags, seq, data[offset + _NLMSGHDR.size:offset + length]
+        offset += _align(length)
+
+
+def check_error(payload: bytes):
+    err = struct.unpack_from("=i", payload)[0]
+    if err:
+        raise NetlinkError(-err, os.strerror(-err))
+
+
+class NetlinkSocket:
+    """Persistent netlink socket with request/response helpers."""
+
+    def __init__(self, proto: int, groups: int = 0):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, proto)
+        self.sock.bind((0, groups))
+        self._seq = 0
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def next_seq(self) -> int:
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        return self._seq
+
+    def request(self, msg: bytes, seq: int, bufsize: int = 65536) -> list[bytes]:
+        """Send msg and collect payloads of all replies until DONE/ACK."""
+        self.sock.send(msg)
+        out = []
+        while True:
+            data = self.sock.recv(bufsize)
+            done = False
+            for mtype, flags, rseq, payload in iter_msgs(data):
+                if rseq != seq:
+                    continue
+                if mtype == NLMSG_ERROR:
+                    check_error(payload)
+                    done = True
+                elif mtype == NLMSG_DONE:
+                    done = True
+                else:
+                    out.append(payload)
+                    if not flags & NLM_F_MULTI:
+                        done = True
+            if done:
+                return out
+
+    def close(self):
+        self.sock.close()
+
+
+def parse_family_id(payload: bytes) -> int | None:
+    attrs = parse_attrs(payload, _GENLHDR.size)
+    fid = attrs.get(CTRL_ATTR_FAMILY_ID)
+    return struct.unpack("=H", fid[:2])[0] if fid else None
+
+
+class GenlSocket(NetlinkSocket):
+    def __init__(self):
+        super().__init__(NETLINK_GENERIC)
+
+    def resolve(self, name: str) -> int:
+        seq = self.next_seq()
+        msg = pack_genl(GENL_ID_CTRL, CTRL_CMD_GETFAMILY, NLM_F_REQUEST, seq,
+                        pack_str(CTRL_ATTR_FAMILY_NAME, name))
+        for payload in self.request(msg, seq):
+            fid = parse_family_id(payload)
+            if fid is not None:
+                return fid
+        raise NetlinkError(2, f"genl family '{name}' not found")
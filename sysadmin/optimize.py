@@ -1,9 +1,15 @@
 """DSPy optimization for diagnoser module."""
+import logging
+import time
+
 import dspy
-from .agent import NetworkDiagnoser, configure_ollama
+from .agent import FusedDiagnoser, NetworkDiagnoser, configure_ollama
 from .dataset import to_dspy_examples
+from .lmcache import DEFAULT_PATH as LM_CACHE_PATH, CachedLM
 from .signatures import DiagnosisResult
 
+log = logging.getLogger(__name__)
+
 
 def metric(example, pred, trace=None):
     """Check if prediction matches expected diagnosis."""
@@ -19,31 +25,114 @@ def metric(example, pred, trace=None):
     return 1.0
 
 
-def optimize(model: str = "qwen3:1.7b", n: int = 5):
-    """Run BootstrapFewShot optimization."""
-    configure_ollama(model)
-    trainset = to_dspy_examples(n=n)
-    diagnoser = NetworkDiagnoser()
+def fused_metric(example, pred, trace=None):
+    """Diagnosis score, halved when the chosen action is wrong."""
+    # pred is the (diagnosis, decision, reasoning) tuple from FusedDiagnoser
+    diag, dec = pred[0], pred[1]
+    score = metric(example, diag, trace)
+    if dec is None or dec.action != example.decision.action:
+        score *= 0.5
+    return score
+
+
+TARGETS = {
+    "diagnoser": (NetworkDiagnoser, metric),
+    "fused": (FusedDiagnoser, fused_metric),
+}
+
+
+DEV_SEED = 7
+
+
+def _setup(model: str, n: int, target: str, cache: str | None = LM_CACHE_PATH,
+           lm=None, dataset: str | None = None):
+    """Configure the (cached) LM; lm overrides Ollama, e.g. a StubLM.
+
+    dataset is a file from synth.generate; 3n training and 3n held-out
+    examples are sampled from it instead of the built-in generator, whose
+    devset uses DEV_SEED (the 'sysadmin eval' default).
+    """
+    lm = lm or configure_ollama(model)
+    if cache:
+        lm = CachedLM(lm, cache)
+    dspy.configure(lm=lm)
+    program_cls, score = TARGETS[target]
+    fused = target == "fused"
+    if dataset:
+        from .synth import SyntheticDataset
+        drawn = SyntheticDataset(dataset).sample(6 * n, fused=fused)
+        trainset, devset = drawn[::2], drawn[1::2]
+    else:
+        trainset = to_dspy_examples(n=n, fused=fused)
+        devset = to_dspy_examples(n=n, seed=DEV_SEED, fused=fused)
+    return program_cls(), score, trainset, devset, lm
 
-    optimizer = dspy.BootstrapFewShot(metric=metric, max_bootstrapped_demos=2)
-    optimized = optimizer.compile(diagnoser, trainset=trainset)
+
+def dataset_version(dataset: str | None = None) -> str:
+    if dataset:
+        from .synth import SyntheticDataset
+        return SyntheticDataset(dataset).version
+    from .dataset import DATASET_VERSION
+    return DATASET_VERSION
+
+
+def evaluate(program, devset, score, threads: int = 4) -> float:
+    """Average metric over devset, evaluated on a thread pool."""
+    ev = dspy.Evaluate(devset=devset, metric=score, num_threads=threads,
+                       display_progress=False)
+    return ev(program).score
+
+
+def report(lm, t0: float, steps: int) -> dict:
+    """Log wall time, cache hit rate and LM calls per optimizer step."""
+    stats = lm.stats() if isinstance(lm, CachedLM) else {}
+    wall = time.perf_counter() - t0
+    calls = stats.get("calls", 0)
+    out = {"wall_s": wall, "steps": steps,
+           "calls_per_step": calls / steps if steps else 0.0, **stats}
+    log.info(f"{wall:.1f}s, {calls} LM calls, {out['calls_per_step']:.1f}/step,"
+             f" cache hit rate {stats.get('hit_rate', 0.0):.0%}")
+    return out
+
+
+def optimize(model: str = "qwen3:1.7b", n: int = 5, target: str = "diagnoser",
+             threads: int = 4, cache: str | None = LM_CACHE_PATH, lm=None,
+             dataset: str | None = None):
+    """Run BootstrapFewShot optimization; .score is on the held-out devset."""
+    t0 = time.perf_counter()
+    program, score, trainset, devset, lm = _setup(model, n, target, cache, lm,
+                                                  dataset)
+    optimizer = dspy.BootstrapFewShot(metric=score, max_bootstrapped_demos=2)
+    optimized = optimizer.compile(program, trainset=trainset)
+    optimized.score = evaluate(optimized, devset, score, threads)
+    optimized.run_stats = report(lm, t0, len(trainset))
     return optimized
 
 
-def optimize_simba(model: str = "qwen3:1.7b", n: int = 20):
+def optimize_simba(model: str = "qwen3:1.7b", n: int = 20,
+                   target: str = "diagnoser", threads: int = 4,
+                   cache: str | None = LM_CACHE_PATH, lm=None,
+                   dataset: str | None = None):
     """Run SIMBA optimization with larger dataset."""
-    configure_ollama(model)
-    trainset = to_dspy_examples(n=n)
-    diagnoser = NetworkDiagnoser()
-    optimizer = dspy.SIMBA(metric=metric, max_demos=4, max_steps=4)
-    return optimizer.compile(diagnoser, trainset=trainset)
+    t0 = time.perf_counter()
+    program, score, trainset, devset, lm = _setup(model, n, target, cache, lm,
+                                                  dataset)
+    steps = 4
+    optimizer = dspy.SIMBA(metric=score, max_demos=4, max_steps=steps,
+                           bsize=min(32, len(trainset)), num_threads=threads)
+    optimized = optimizer.compile(program, trainset=trainset)
+    optimized.score = evaluate(optimized, devset, score, threads)
+    optimized.run_stats = report(lm, t0, steps)
+    return optimized
 
 
 if __name__ == "__main__":
     import sys
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     model = sys.argv[1] if len(sys.argv) > 1 else "qwen3:1.7b"
-    print(f"Optimizing with {model}...")
-    opt = optimize(model)
+    target = sys.argv[2] if len(sys.argv) > 2 else "diagnoser"
+    print(f"Optimizing {target} with {model}...")
+    opt = optimize(model, target=target)
     print("Done. Optimized diagnoser:")
     demos = getattr(opt.predict, "demos", [])
-    print(f"  {len(demos)} demos learned")
+    print(f"  {len(demos)} demos learned, dev score {opt.score:.1f}")
@@ -0,0 +1,170 @@
+"""Concurrent reachability probes (ICMP datagram / TCP connect) on asyncio."""
+from __future__ import annotations
+import asyncio
+import errno
+import os
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+ICMP_OK = None  # resolved lazily by icmp_available()
+
+ICMP_ECHO = 8
+ICMP_ECHOREPLY = 0
+
+
+def icmp_echo(ident: int, seq: int, payload: bytes = b"sysadmin") -> bytes:
+    """Echo request; the kernel fills in id and checksum on ping sockets."""
+    return struct.pack("!BBHHH", ICMP_ECHO, 0, 0, ident, seq) + payload
+
+
+async def icmp_probe(host: str, timeout: float) -> float | None:
+    """RTT in seconds via an unprivileged ICMP datagram socket, or None.
+
+    Needs the process gid inside net.ipv4.ping_group_range.
+    """
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    sock.setblocking(False)
+    seq = int.from_bytes(os.urandom(2), "big")
+
+    async def exchange():
+        await loop.sock_sendall(sock, icmp_echo(0, seq))
+        while True:
+            data = await loop.sock_recv(sock, 1024)
+            if len(data) >= 8:
+                rtype, _, _, _, rseq = struct.unpack_from("!BBHHH", data)
+                if rtype == ICMP_ECHOREPLY and rseq == seq:
+                    return
+
+    try:
+        await loop.sock_connect(sock, (host, 0))
+        t0 = time.perf_counter()
+        await asyncio.wait_for(exchange(), timeout)
+        return time.perf_counter() - t0
+    except (OSError, asyncio.TimeoutError):
+        return None
+    finally:
+        sock.close()
+
+
+async def tcp_probe(host: str, port: int, timeout: float) -> float | None:
+    """RTT of a TCP handshake; a refused connection still proves reachability."""
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout)
+        writer.close()
+    except ConnectionRefusedError:
+        pass
+    except (OSError, asyncio.TimeoutError):
+        return None
+    return time.perf_counter() - t0
+
+
+async def ping_probe(host: str, timeout: float) -> float | None:
+    """Fallback when ping sockets are not permitted: fork /bin/ping."""
+    t0 = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        "ping", "-c", "1", "-W", str(max(1, round(timeout))), host,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+    rc = await proc.wait()
+    return time.perf_counter() - t0 if rc == 0 else None
+
+
+@dataclass
+class Target:
+    """A probe target with a window of recent results."""
+    host: str
+    kind: str = "icmp"  # icmp or tcp
+    port: int = 0
+    window: int = 20
+    results: deque = field(init=False)
+
+    def __post_init__(self):
+        self.results = deque(maxlen=self.window)
+
+    @classmethod
+    def parse(cls, text: str) -> "Target":
+        """Parse 'host', 'icmp:host' or 'tcp:host:port'."""
+        parts = text.split(":")
+        if parts[0] == "tcp":
+            return cls(parts[1], "tcp", int(parts[2]) if len(parts) > 2 else 53)
+        if parts[0] == "icmp":
+            return cls(parts[1])
+        return cls(text)
+
+    def __str__(self):
+        return f"tcp:{self.host}:{self.port}" if self.kind == "tcp" else self.host
+
+    async def probe(self, timeout: float) -> float | None:
+        if self.kind == "tcp":
+            rtt = await tcp_probe(self.host, self.port, timeout)
+        elif icmp_available():
+            rtt = await icmp_probe(self.host, timeout)
+        else:
+            rtt = await ping_probe(self.host, timeout)
+        self.results.append(rtt)
+        return rtt
+
+    @property
+    def loss(self) -> float:
+        if not self.results:
+            return 0.0
+        return sum(r is None for r in self.results) / len(self.results)
+
+    @property
+    def rtt_ms(self) -> float | None:
+        ok = [r for r in self.results if r is not None]
+        return 1000 * sum(ok) / len(ok) if ok else None
+
+
+class Prober:
+    """Probe all targets concurrently; the link is up if a quorum answers."""
+
+    def __init__(self, targets: list[Target], quorum: int = 1,
+                 timeout: float = 1.0):
+        if not 1 <= quorum <= len(targets):
+            raise ValueError(f"quorum must be 1..{len(targets)}")
+        self.targets = targets
+        self.quorum = quorum
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()  # the loop cannot run in two threads
+
+    async def check_async(self) -> bool:
+        rtts = await asyncio.gather(*(t.probe(self.timeout)
+                                      for t in self.targets))
+        return sum(r is not None for r in rtts) >= self.quorum
+
+    def check(self) -> bool:
+        """Blocking check, reusing one event loop across calls."""
+        with self._lock:
+            return self._loop.run_until_complete(self.check_async())
+
+    def close(self):
+        self._loop.close()
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{t}: loss={t.loss:.0%} rtt="
+            + (f"{t.rtt_ms:.1f}ms" if t.rtt_ms is not None else "-")
+            for t in self.targets)
+
+
+def icmp_available() -> bool:
+    """Whether unprivileged ICMP sockets work here (checked once)."""
+    global ICMP_OK
+    if ICMP_OK is None:
+        try:
+            socket.socket(socket.AF_INET, socket.SOCK_DGRAM,
+                          socket.IPPROTO_ICMP).close()
+            ICMP_OK = True
+        except OSError as e:
+            if e.errno not in (errno.EACCES, errno.EPERM, errno.EPROTONOSUPPORT):
+                raise
+            ICMP_OK = False
+    return ICMP_OK
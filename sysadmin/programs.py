@@ -0,0 +1,125 @@
+"""Store of compiled DSPy programs keyed by model, signature and dataset."""
+from __future__ import annotations
+import hashlib
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+DEFAULT_DIR = "~/.local/share/sysadmin/programs"
+FORMAT = 1
+
+
+class StaleProgramError(ValueError):
+    """Artifact was compiled against a different signature."""
+
+
+def _signature(target: str):
+    from .signatures import DiagnoseAndDecide, DiagnoseNetwork
+    return {"diagnoser": DiagnoseNetwork, "fused": DiagnoseAndDecide}[target]
+
+
+def signature_hash(target: str) -> str:
+    """Hash of instructions, field names/descriptions and output schemas."""
+    sig = _signature(target)
+    parts = [sig.instructions]
+    for name, f in sig.fields.items():
+        ann = f.annotation
+        schema = (ann.model_json_schema() if hasattr(ann, "model_json_schema")
+                  else getattr(ann, "__name__", str(ann)))
+        parts.append([name, (f.json_schema_extra or {}).get("desc"), schema])
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9.]+", "_", text).strip("_")
+
+
+def artifact_name(target: str, model: str, dataset: str) -> str:
+    return f"{target}-{_slug(model)}-{signature_hash(target)}-{_slug(dataset)}.json"
+
+
+def save(program, target: str, model: str, dataset: str,
+         stats: dict | None = None, directory: str = DEFAULT_DIR) -> Path:
+    """Write program state and metadata to one JSON file; returns its path."""
+    path = Path(directory).expanduser() / artifact_name(target, model, dataset)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {"format": FORMAT, "target": target, "model": model,
+           "signature_hash": signature_hash(target), "dataset": dataset,
+           "created": time.time(), "stats": stats or {},
+           "state": program.dump_state()}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(doc, default=str))
+    tmp.replace(path)
+    return path
+
+
+def read(path: str, target: str) -> dict:
+    """Load an artifact, refusing one built for another target or signature."""
+    doc = json.loads(Path(path).expanduser().read_text())
+    if doc.get("format") != FORMAT or doc.get("target") != target:
+        raise StaleProgramError(f"{path}: not a {target} program")
+    if doc["signature_hash"] != signature_hash(target):
+        raise StaleProgramError(f"{path}: compiled for signature "
+                                f"{doc['signature_hash']}, current is "
+                                f"{signature_hash(target)}")
+    return doc
+
+
+def resolve(spec: str, target: str, model: str,
+            directory: str = DEFAULT_DIR) -> dict | None:
+    """Read the artifact named by spec: a path, 'auto' or 'none'."""
+    if spec == "none":
+        return None
+    if spec == "auto":
+        path = find(target, model, directory)
+        if path is None:
+            log.warning(f"No compiled {target} program for {model} in "
+                        f"{directory}; running uncompiled")
+            return None
+        spec = str(path)
+    doc = read(spec, target)
+    doc["path"] = spec
+    return doc
+
+
+def target_for(mode: str) -> str:
+    """Compiled module of a SysAdminAgent in the given mode."""
+    return "fused" if mode == "fused" else "diagnoser"
+
+
+def resolve_agent(spec: str, mode: str, model: str,
+                  directory: str = DEFAULT_DIR) -> dict | None:
+    """resolve() the artifact for a SysAdminAgent in mode."""
+    target = target_for(mode)
+    doc = resolve(spec, target, model, directory)
+    if doc is not None:
+        log.info(f"Using compiled {target} from {doc['path']}")
+    return doc
+
+
+def apply(agent, doc: dict):
+    """Load a resolve_agent() artifact into agent's compiled module."""
+    module = agent.fused if agent.mode == "fused" else agent.diagnoser
+    module.load_state(doc["state"])
+
+
+def load_into(program, path: str, target: str) -> dict:
+    """Apply a stored artifact to program; returns the artifact metadata."""
+    doc = read(path, target)
+    program.load_state(doc.pop("state"))
+    log.info(f"Loaded compiled {target} for {doc['model']} "
+             f"(dataset {doc['dataset']}) from {path}")
+    return doc
+
+
+def find(target: str, model: str, directory: str = DEFAULT_DIR) -> Path | None:
+    """Newest artifact for target and model with the current signature."""
+    d = Path(directory).expanduser()
+    prefix = f"{target}-{_slug(model)}-{signature_hash(target)}-"
+    found = list(d.glob(f"{prefix}*.json")) if d.is_dir() else []
+    return max(found, key=lambda p: p.stat().st_mtime, default=None)
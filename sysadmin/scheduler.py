@@ -0,0 +1,241 @@
+"""One adaptive loop for reachability probes and bitrate sampling."""
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import Callable
+
+from . import telemetry
+from .constants import DEFAULT_COOLDOWN
+
+log = logging.getLogger(__name__)
+
+
+class AdaptiveInterval:
+    """Poll delay policy.
+
+    Starts at fast and grows by growth per healthy round up to slow.
+    Any sign of trouble drops straight back to fast, as does the settle
+    window after a reset. While a reset is blocked by cooldown there is
+    nothing to do but notice recovery, so it backs off to slow (but not
+    past the end of the cooldown).
+    """
+
+    def __init__(self, fast: float = 1.0, slow: float = 10.0,
+                 growth: float = 2.0, settle: float = 30.0):
+        self.fast, self.slow = fast, max(slow, fast)
+        self.growth = growth
+        self.settle = settle
+        self.interval = fast
+
+    def next(self, trouble: bool, since_reset: float = float("inf"),
+             cooldown_left: float = 0.0) -> float:
+        if trouble and cooldown_left > 0:
+            self.interval = max(self.fast, min(self.slow, cooldown_left))
+        elif trouble or since_reset < self.settle:
+            self.interval = self.fast
+        else:
+            self.interval = min(self.slow, self.interval * self.growth)
+        return self.interval
+
+
+class ActionScheduler:
+    """Gate in front of an executor shared by every caller in a process.
+
+    An (action, iface) pair is refused while the same pair is already in
+    flight or within its cooldown, which starts when a run finishes
+    (whatever its outcome: a failed reset still bounced the link). At
+    most max_concurrent actions run at once; callers wait up to
+    queue_timeout for a slot, then give up.
+
+    State is in memory and per process: the daemon and a separately run
+    watchdog do not see each other's cooldowns. Run both in one process
+    (sysadmin daemon --probe, config/sysadmin-unified.service) to share
+    them. The newest scheduler's state is exported as gauges.
+    """
+
+    def __init__(self, executor, cooldown: float = DEFAULT_COOLDOWN,
+                 cooldowns: dict[str, float] | None = None,
+                 max_concurrent: int = 1, queue_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.executor = executor
+        self.cooldown = cooldown
+        self.cooldowns = cooldowns or {}
+        self.queue_timeout = queue_timeout
+        self.clock = clock
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_flight: set[tuple[str, str]] = set()
+        self._last: dict[tuple[str, str], float] = {}
+        self.counts = {"executed": 0, "duplicate": 0, "cooldown": 0, "busy": 0}
+        telemetry.ACTION_COOLDOWN.track(self._cooldowns)
+        telemetry.ACTION_IN_FLIGHT.track(
+            lambda: {k: 1 for k in list(self._in_flight)})
+
+    def since(self, action: str, iface: str) -> float:
+        """Seconds since action last finished on iface (inf if never)."""
+        last = self._last.get((action, iface))
+        return float("inf") if last is None else self.clock() - last
+
+    def cooldown_left(self, action: str, iface: str) -> float:
+        cooldown = self.cooldowns.get(action, self.cooldown)
+        return max(0.0, cooldown - self.since(action, iface))
+
+    def _skip(self, action: str, iface: str, why: str) -> bool:
+        self.counts[why] += 1
+        telemetry.ACTIONS_SKIPPED.inc(action, why)
+        log.info(f"Skipping {action} on {iface}: {why}")
+        return False
+
+    def execute(self, action: str, iface: str, reason: str = "") -> bool:
+        key = (action, iface)
+        with self._lock:
+            if key in self._in_flight:
+                return self._skip(action, iface, "duplicate")
+            if self.cooldown_left(action, iface) > 0:
+                return self._skip(action, iface, "cooldown")
+            self._in_flight.add(key)
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                with self._lock:
+                    return self._skip(action, iface, "busy")
+            try:
+                return self.executor.execute(action, iface, reason)
+            finally:
+                self._slots.release()
+                with self._lock:
+                    self._last[key] = self.clock()
+                    self.counts["executed"] += 1
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def _cooldowns(self) -> dict[tuple[str, str], float]:
+        left = {k: self.cooldown_left(*k) for k in list(self._last)}
+        return {k: round(v, 1) for k, v in left.items() if v > 0}
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"in_flight": sorted(f"{a}:{i}" for a, i in self._in_flight),
+                    "cooldowns": {f"{a}:{i}": v
+                                  for (a, i), v in self._cooldowns().items()},
+                    **self.counts}
+
+
+class HealthLoop:
+    """Probe reachability and sample bitrate in a single adaptive loop.
+
+    prober (probe.Prober) and monitor (NetworkMonitor) are both optional.
+    Samples go to on_sample and anomalies to on_anomaly; max_failures
+    consecutive failed probe rounds call reset(), at most once per
+    cooldown seconds; with actions (an ActionScheduler that reset() goes
+    through), its wifi_reset cooldown is used instead, so other callers'
+    resets count.
+    """
+
+    def __init__(self, iface: str, prober=None, monitor=None,
+                 on_anomaly: Callable | None = None,
+                 reset: Callable[[], bool] | None = None,
+                 max_failures: int = 3, cooldown: float = 60.0,
+                 post_reset_sleep: float = 0.0,
+                 policy: AdaptiveInterval | None = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 actions: ActionScheduler | None = None,
+                 on_sample: Callable | None = None):
+        self.iface = iface
+        self.prober = prober
+        self.monitor = monitor
+        self.on_anomaly = on_anomaly
+        self.reset = reset
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.post_reset_sleep = post_reset_sleep
+        self.policy = policy or AdaptiveInterval()
+        self.clock = clock
+        self.actions = actions
+        self.on_sample = on_sample
+        self.failures = 0
+        self.last_reset: float | None = None
+        self.down_since: float | None = None
+        self.wakeups = 0
+        self._stop = threading.Event()
+
+    def _probe(self) -> bool:
+        with telemetry.PROBE_SECONDS.time():
+            ok = self.prober.check()
+        if ok:
+            if self.failures:
+                log.info("Connection restored")
+            if self.down_since is not None:
+                telemetry.RECOVERY_SECONDS.observe(
+                    self.clock() - self.down_since, self.iface)
+                self.down_since = None
+            self.failures = 0
+            return False
+        telemetry.PROBE_FAILURES.inc()
+        if self.down_since is None:
+            self.down_since = self.clock()
+        self.failures += 1
+        log.warning(f"Probe failed ({self.failures}/{self.max_failures}):"
+                    f" {self.prober.summary()}")
+        return True
+
+    def _sample(self) -> bool:
+        m = self.monitor.collect()
+        if self.on_sample is not None:
+            self.on_sample(m)
+        if not self.monitor.detect_anomaly(m):
+            return False
+        telemetry.ANOMALIES.inc(self.iface)
+        if self.on_anomaly is not None:
+            self.on_anomaly(m)
+        return True
+
+    def tick(self) -> float:
+        """One round; returns the delay until the next one."""
+        self.wakeups += 1
+        trouble = self.prober is not None and self._probe()
+        if self.monitor is not None:
+            trouble = self._sample() or trouble
+        now = self.clock()
+        if self.actions is not None:
+            since = self.actions.since("wifi_reset", self.iface)
+            cooldown_left = self.actions.cooldown_left("wifi_reset", self.iface)
+        else:
+            since = (now - self.last_reset if self.last_reset is not None
+                     else float("inf"))
+            cooldown_left = max(0.0, self.cooldown - since)
+        if self.failures >= self.max_failures and self.reset is not None:
+            if cooldown_left > 0:
+                log.info(f"Cooldown active, {cooldown_left:.0f}s remaining")
+            else:
+                log.warning(f"Connection lost, resetting {self.iface}")
+                if self.reset():
+                    log.info("Reset complete")
+                    self.last_reset, self.failures = now, 0
+                    self.policy.next(False, 0.0)
+                    return max(self.post_reset_sleep, self.policy.fast)
+        return self.policy.next(trouble, since, cooldown_left)
+
+    def _wait(self, timeout: float):
+        watcher = self.monitor.watcher if self.monitor is not None else None
+        if watcher is None:
+            self._stop.wait(timeout)
+            return
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remain = deadline - time.monotonic()
+            if remain <= 0:
+                return
+            if any(self.monitor.is_state_change(ev) for ev in watcher.wait(remain)):
+                self.policy.interval = self.policy.fast
+                return
+
+    def run(self):
+        log.info(f"Watching {self.iface} every {self.policy.fast}-"
+                 f"{self.policy.slow}s")
+        while not self._stop.is_set():
+            self._wait(self.tick())
+
+    def stop(self):
+        self._stop.set()
@@ -1,23 +1,7 @@
 """DSPy Signatures for system admin agent."""
 from __future__ import annotations
 import dspy
-from pydantic import BaseModel, field_validator
-
-
-class DiagnosisResult(BaseModel):
-    issue_detected: bool
-    issue_type: str  # wifi_rx_degraded, interface_down, none
-    severity: str    # critical, warning, none
-
-
-class ActionDecision(BaseModel):
-    action: str       # from whitelist or "none"
-    confidence: float
-
-    @field_validator("confidence", mode="before")
-    @classmethod
-    def clamp(cls, v):
-        return max(0.0, min(1.0, float(v or 0)))
+from .models import DiagnosisResult, ActionDecision  # noqa: F401 (re-export)
 
 
 class DiagnoseNetwork(dspy.Signature):
@@ -27,6 +11,7 @@ class DiagnoseNetwork(dspy.Signature):
     rx_mbps: float = dspy.InputField(desc="RX bitrate Mbit/s")
     tx_mbps: float = dspy.InputField(desc="TX bitrate Mbit/s")
     signal: int = dspy.InputField(desc="Signal dBm")
+    trend: str = dspy.InputField(desc="Recent window summary, or n/a")
     known_issues: str = dspy.InputField(desc="Known driver bugs")
     diagnosis: DiagnosisResult = dspy.OutputField()
 
@@ -37,3 +22,18 @@ class DecideAction(dspy.Signature):
     allowed_actions: str = dspy.InputField(desc="JSON whitelist")
     decision: ActionDecision = dspy.OutputField()
     reasoning: str = dspy.OutputField(desc="Brief explanation")
+
+
+class DiagnoseAndDecide(dspy.Signature):
+    """Diagnose network metrics and pick an action from the whitelist."""
+    interface: str = dspy.InputField(desc="Interface name")
+    state: str = dspy.InputField(desc="up/down/dormant")
+    rx_mbps: float = dspy.InputField(desc="RX bitrate Mbit/s")
+    tx_mbps: float = dspy.InputField(desc="TX bitrate Mbit/s")
+    signal: int = dspy.InputField(desc="Signal dBm")
+    trend: str = dspy.InputField(desc="Recent window summary, or n/a")
+    known_issues: str = dspy.InputField(desc="Known driver bugs")
+    allowed_actions: str = dspy.InputField(desc="JSON whitelist")
+    diagnosis: DiagnosisResult = dspy.OutputField()
+    decision: ActionDecision = dspy.OutputField()
+    reasoning: str = dspy.OutputField(desc="Brief explanation")
@@ -0,0 +1,64 @@
+"""Background LM initialization so the daemon samples from the start."""
+from __future__ import annotations
+import logging
+import threading
+import time
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Seconds from daemon start to each startup milestone."""
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.marks: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, name: str):
+        with self._lock:
+            if name not in self.marks:
+                self.marks[name] = round(time.monotonic() - self.t0, 3)
+                log.info(f"Startup: {name} at {self.marks[name]:.3f}s")
+
+    def report(self) -> dict:
+        with self._lock:
+            return dict(self.marks)
+
+
+class LazyAgent:
+    """Agent built on a background thread; calls fail until it is ready.
+
+    The deterministic tiers in front of it keep handling clear-cut
+    incidents meanwhile; anything they escalate gets a RuntimeError,
+    which the daemon logs and skips just like an LLM failure.
+    """
+
+    def __init__(self, factory: Callable[[], object],
+                 on_ready: Callable[[], None] | None = None):
+        self.factory = factory
+        self.on_ready = on_ready
+        self.ready = threading.Event()
+        self.error: Exception | None = None
+        self._agent = None
+        self._thread = threading.Thread(target=self._load, daemon=True,
+                                        name="agent-load")
+        self._thread.start()
+
+    def _load(self):
+        try:
+            self._agent = self.factory()
+        except Exception as e:
+            log.error(f"Agent initialization failed: {e}")
+            self.error = e
+            return
+        self.ready.set()
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def __call__(self, *args, **kwargs):
+        if self._agent is None:
+            state = f"failed: {self.error}" if self.error else "still loading"
+            raise RuntimeError(f"LLM agent {state}")
+        return self._agent(*args, **kwargs)
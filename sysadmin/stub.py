@@ -0,0 +1,92 @@
+"""Deterministic stub LM for benchmarks and tests (no Ollama needed)."""
+from __future__ import annotations
+import json
+import re
+import threading
+import time
+
+import dspy
+
+from .constants import ISSUE_ACTIONS
+from .fastpath import rule_diagnose
+
+_FIELD = re.compile(r"^\[\[ ## (\w+) ## \]\]$\n(.*?)(?=^\[\[ ## |\Z)",
+                    re.M | re.S)
+
+
+def parse_fields(text: str) -> dict[str, str]:
+    """Parse ChatAdapter '[[ ## name ## ]]' sections from a message."""
+    return {k: v.strip() for k, v in _FIELD.findall(text)}
+
+
+def format_fields(fields: dict[str, str]) -> str:
+    body = "".join(f"[[ ## {k} ## ]]\n{v}\n\n" for k, v in fields.items())
+    return body + "[[ ## completed ## ]]"
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def answer(inputs: dict[str, str]) -> dict[str, str]:
+    """Rule-based answer for DiagnoseNetwork, DecideAction or DiagnoseAndDecide."""
+    if "diagnosis_json" in inputs:
+        itype = json.loads(inputs["diagnosis_json"]).get("issue_type", "none")
+        action = ISSUE_ACTIONS.get(itype, "none")
+        return {"decision": json.dumps({"action": action, "confidence": 0.9}),
+                "reasoning": f"stub: {itype}"}
+    r = rule_diagnose(inputs.get("state", "unknown"),
+                      float(inputs.get("rx_mbps", 0)),
+                      float(inputs.get("tx_mbps", 0)),
+                      int(float(inputs.get("signal", -100))),
+                      ratio=10.0, min_signal=-100)
+    if r is None:
+        r = rule_diagnose("up", 1000.0, 0.0, 0)  # healthy
+    out = {"diagnosis": r[0].model_dump_json()}
+    if "allowed_actions" in inputs:
+        out["decision"] = json.dumps({"action": r[1].action, "confidence": 0.9})
+        out["reasoning"] = f"stub: {r[0].issue_type}"
+    return out
+
+
+class StubLM(dspy.LM):
+    """Answers like a well-behaved model after a configurable delay.
+
+    latency is a fixed per-call delay; per_token adds delay for each
+    (estimated) completion token. Calls and token counts are recorded.
+    """
+
+    def __init__(self, latency: float = 0.0, per_token: float = 0.0,
+                 name: str = "stub"):
+        super().__init__(f"stub/{name}", cache=False)
+        self.latency = latency
+        self.per_token = per_token
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        messages = messages or [{"role": "user", "content": prompt or ""}]
+        user = [m["content"] for m in messages if m["role"] == "user"][-1]
+        text = format_fields(answer(parse_fields(user)))
+        ptok = sum(_tokens(m["content"]) for m in messages)
+        ctok = _tokens(text)
+        time.sleep(self.latency + self.per_token * ctok)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += ptok
+            self.completion_tokens += ctok
+        if dspy.settings.usage_tracker:
+            dspy.settings.usage_tracker.add_usage(
+                self.model, {"prompt_tokens": ptok, "completion_tokens": ctok})
+        return [text]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"calls": self.calls, "prompt_tokens": self.prompt_tokens,
+                    "completion_tokens": self.completion_tokens}
@@ -0,0 +1,123 @@
+"""Run several interface monitors concurrently in one asyncio loop."""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from . import telemetry
+from .constants import DEFAULT_POLL_INTERVAL
+from .constants import DEFAULT_RX_THRESHOLD, DEFAULT_TX_RX_RATIO
+from .monitor import Metrics, NetworkMonitor
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class InterfaceSpec:
+    name: str
+    interval: float = DEFAULT_POLL_INTERVAL
+    rx_threshold: float = DEFAULT_RX_THRESHOLD
+    ratio_threshold: float = DEFAULT_TX_RX_RATIO
+
+
+_SPEC_KEYS = {"interval": "interval", "rx": "rx_threshold",
+              "ratio": "ratio_threshold"}
+
+
+def parse_spec(text: str, interval: float = DEFAULT_POLL_INTERVAL) -> InterfaceSpec:
+    """Parse 'name[:interval=S,rx=MBPS,ratio=R]'."""
+    name, _, opts = text.partition(":")
+    spec = InterfaceSpec(name, interval)
+    for opt in filter(None, opts.split(",")):
+        key, _, val = opt.partition("=")
+        if key not in _SPEC_KEYS:
+            raise ValueError(f"Unknown interface option '{key}' in '{text}'")
+        setattr(spec, _SPEC_KEYS[key], float(val))
+    return spec
+
+
+class MonitorSupervisor:
+    """Sample N interfaces concurrently, sharing one anomaly handler.
+
+    Collection runs on a single worker thread so backends (and their
+    netlink sockets) are shared safely and memory does not grow per
+    interface; each monitor is just one coroutine.
+    """
+
+    def __init__(self, monitors: list[NetworkMonitor],
+                 on_anomaly: Callable[[Metrics], None], watcher=None,
+                 dispatcher=None, on_sample: Callable[[Metrics], None] | None = None):
+        self.monitors = {m.iface: m for m in monitors}
+        self.on_anomaly = on_anomaly
+        self.watcher = watcher
+        self.dispatcher = dispatcher
+        self.on_sample = on_sample
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="collect")
+        self._wake: dict[str, asyncio.Event] = {}
+        self._anomaly_since: dict[str, float] = {}
+        self._loop = None
+        self._running = False
+
+    def _on_link_events(self):
+        for ev in self.watcher.read():
+            mon = self.monitors.get(ev.ifname)
+            if mon and mon.is_state_change(ev):
+                self._wake[ev.ifname].set()
+
+    async def _watch(self, mon: NetworkMonitor):
+        loop = asyncio.get_running_loop()
+        wake = self._wake[mon.iface]
+        log.info(f"Starting monitor for {mon.iface} every {mon.interval}s")
+        while self._running:
+            wake.clear()
+            m = await loop.run_in_executor(self._pool, mon.collect)
+            if self.on_sample is not None:
+                self.on_sample(m)
+            if mon.detect_anomaly(m):
+                telemetry.ANOMALIES.inc(mon.iface)
+                self._anomaly_since.setdefault(mon.iface, time.monotonic())
+                await self.handle(m)
+            elif mon.iface in self._anomaly_since:
+                dt = time.monotonic() - self._anomaly_since.pop(mon.iface)
+                telemetry.RECOVERY_SECONDS.observe(dt, mon.iface)
+                log.info(f"{mon.iface} recovered after {dt:.1f}s")
+            try:
+                await asyncio.wait_for(wake.wait(), mon.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def handle(self, m: Metrics):
+        if self.dispatcher is not None:
+            self.dispatcher.submit(m)
+        else:
+            await asyncio.to_thread(self.on_anomaly, m)
+
+    async def run_async(self):
+        self._running = True
+        loop = self._loop = asyncio.get_running_loop()
+        self._wake = {name: asyncio.Event() for name in self.monitors}
+        if self.watcher is not None:
+            loop.add_reader(self.watcher.fileno(), self._on_link_events)
+        try:
+            await asyncio.gather(*(self._watch(m)
+                                   for m in self.monitors.values()))
+        finally:
+            if self.watcher is not None:
+                loop.remove_reader(self.watcher.fileno())
+            self._pool.shutdown(wait=False)
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+    def _wake_all(self):
+        for ev in self._wake.values():
+            ev.set()
+
+    def stop(self):
+        """Stop all monitors; safe to call from any thread."""
+        self._running = False
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake_all)
@@ -0,0 +1,177 @@
+"""Large synthetic datasets: vectorized generation, chunked on-disk storage.
+
+Requires numpy (the optional 'synth' extra). Samples are written as a
+fixed-size record array and read back through a memory map, so neither
+generation nor training holds more than one chunk/batch in memory.
+dspy.Example objects are only built for the batch an optimizer asks for.
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .history import TREND_HISTORY, TREND_M, TREND_N
+from .linkwatch import OPERSTATES
+
+MAGIC = b"SASYNTH1\n"
+
+# name: (issue_type, severity, default weight)
+SCENARIOS = {
+    "healthy": ("none", "none", 0.40),
+    "rx_bug": ("wifi_rx_degraded", "critical", 0.15),
+    "down": ("interface_down", "critical", 0.10),
+    "slow_drift": ("wifi_rx_degraded", "warning", 0.10),
+    "flapping": ("link_flapping", "warning", 0.08),
+    "weak_signal": ("weak_signal", "warning", 0.09),
+    "tx_degraded": ("wifi_tx_degraded", "warning", 0.08),
+}
+NAMES = list(SCENARIOS)
+
+DTYPE = np.dtype([
+    ("scenario", "u1"), ("state", "u1"), ("signal", "<i2"),
+    ("rx", "<f4"), ("tx", "<f4"),
+    # TrendDetector state with a full history: rolling median / EWMAs of
+    # RX, EWMA of TX, flagged and up counts out of the last TREND_M
+    ("median", "<f4"), ("ewma", "<f4"), ("baseline", "<f4"),
+    ("tx_ewma", "<f4"), ("flagged", "u1"), ("up", "u1"),
+])
+
+_UP, _DOWN = OPERSTATES.index("up"), OPERSTATES.index("down")
+
+
+def _fill(rng, rec, name: str):
+    """Draw every column for len(rec) samples of one scenario."""
+    k = len(rec)
+    u = rng.uniform
+    rec["state"] = _UP
+    rec["up"] = TREND_M
+    if name == "healthy":
+        rec["rx"], rec["tx"] = u(200, 800, k), u(200, 800, k)
+        rec["signal"] = rng.integers(-60, -39, k)
+        rec["baseline"] = rec["rx"] * u(0.9, 1.1, k)
+    elif name == "rx_bug":
+        rec["rx"], rec["tx"] = u(1, 10, k), u(150, 600, k)
+        rec["signal"] = rng.integers(-55, -39, k)
+        rec["baseline"] = u(200, 800, k)
+        rec["flagged"] = rng.integers(TREND_N, TREND_M + 1, k)
+    elif name == "down":
+        rec["state"] = _DOWN
+        rec["signal"] = rng.integers(-100, -89, k)
+        rec["up"] = rng.integers(0, 2, k)
+    elif name == "slow_drift":
+        rec["rx"], rec["tx"] = u(10, 60, k), u(200, 600, k)
+        rec["signal"] = rng.integers(-60, -39, k)
+        rec["baseline"] = u(300, 800, k)
+        rec["flagged"] = rng.integers(0, TREND_N, k)
+    elif name == "flapping":
+        rec["state"] = np.where(rng.random(k) < 0.5, _UP, _DOWN)
+        up = rec["state"] == _UP
+        rec["rx"] = np.where(up, u(50, 500, k), 0)
+        rec["tx"] = np.where(up, u(50, 500, k), 0)
+        rec["signal"] = np.where(up, rng.integers(-65, -44, k), -100)
+        rec["baseline"] = u(100, 500, k)
+        rec["up"] = rng.integers(1, TREND_M - 1, k)
+    elif name == "weak_signal":
+        rec["rx"], rec["tx"] = u(5, 60, k), u(5, 60, k)
+        rec["signal"] = rng.integers(-90, -74, k)
+        rec["baseline"] = rec["rx"] * u(0.8, 1.2, k)
+    elif name == "tx_degraded":
+        rec["rx"], rec["tx"] = u(200, 800, k), u(0.5, 10, k)
+        rec["signal"] = rng.integers(-60, -39, k)
+        rec["baseline"] = rec["rx"] * u(0.9, 1.1, k)
+    else:
+        raise ValueError(f"Unknown scenario '{name}'")
+    noise = u(0.9, 1.1, k)
+    rec["median"] = rec["rx"] * noise
+    rec["ewma"] = rec["rx"] * u(0.95, 1.05, k)
+    rec["tx_ewma"] = rec["tx"] * noise
+
+
+def generate_chunk(rng, n: int, weights: dict[str, float] | None = None):
+    """n samples as a DTYPE record array, scenarios drawn by weight."""
+    w = np.array([(weights or {}).get(s, SCENARIOS[s][2]) for s in NAMES])
+    rec = np.zeros(n, DTYPE)
+    rec["scenario"] = rng.choice(len(NAMES), n, p=w / w.sum())
+    order = np.argsort(rec["scenario"], kind="stable")
+    rec = rec[order]
+    bounds = np.searchsorted(rec["scenario"], np.arange(len(NAMES) + 1))
+    for i, name in enumerate(NAMES):
+        if bounds[i] < bounds[i + 1]:
+            _fill(rng, rec[bounds[i]:bounds[i + 1]], name)
+    rng.shuffle(rec)
+    return rec
+
+
+def generate(path: str, n: int, seed: int = 42, chunk: int = 65536,
+             weights: dict[str, float] | None = None) -> int:
+    """Stream n samples to path in chunks; returns bytes written."""
+    rng = np.random.default_rng(seed)
+    header = json.dumps({"n": n, "scenarios": NAMES, "seed": seed})
+    with Path(path).open("wb") as f:
+        f.write(MAGIC + header.encode() + b"\n")
+        for start in range(0, n, chunk):
+            f.write(generate_chunk(rng, min(chunk, n - start), weights).tobytes())
+        return f.tell()
+
+
+def trend_summary(r) -> str:
+    """TrendDetector.summary() for a detector whose history is full."""
+    return (f"last {TREND_HISTORY} samples: rx_median={r['median']:.1f}"
+            f" rx_ewma={r['ewma']:.1f} rx_baseline={r['baseline']:.1f}"
+            f" tx_ewma={r['tx_ewma']:.1f} flagged={r['flagged']}/{TREND_M}"
+            f" up={r['up']}/{TREND_M}")
+
+
+class SyntheticDataset:
+    """Memory-mapped view of a generated file; examples built per batch."""
+
+    def __init__(self, path: str, iface: str = "wlP9s9"):
+        with Path(path).open("rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{path} is not a synthetic dataset")
+            self.meta = json.loads(f.readline())
+            offset = f.tell()
+        self.iface = iface
+        self.records = np.memmap(path, DTYPE, mode="r", offset=offset)
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def version(self) -> str:
+        return f"synth-{self.meta['seed']}-{self.meta['n']}"
+
+    def counts(self) -> dict[str, int]:
+        c = np.bincount(self.records["scenario"], minlength=len(NAMES))
+        return dict(zip(self.meta["scenarios"], c.tolist()))
+
+    def example(self, r, fused: bool = False):
+        import dspy
+        from .constants import ALLOWED_ACTIONS, KNOWN_WIFI_ISSUES
+        from .dataset import expected_decision
+        from .models import DiagnosisResult
+        itype, sev, _ = SCENARIOS[self.meta["scenarios"][r["scenario"]]]
+        diag = DiagnosisResult(issue_detected=itype != "none",
+                               issue_type=itype, severity=sev)
+        inp = {"interface": self.iface, "state": OPERSTATES[r["state"]],
+               "rx_mbps": round(float(r["rx"]), 1),
+               "tx_mbps": round(float(r["tx"]), 1), "signal": int(r["signal"]),
+               "trend": trend_summary(r), "known_issues": KNOWN_WIFI_ISSUES}
+        out = {"diagnosis": diag}
+        if fused:
+            inp["allowed_actions"] = json.dumps(list(ALLOWED_ACTIONS.keys()))
+            out["decision"] = expected_decision(diag)
+        return dspy.Example(**out, **inp).with_inputs(*inp)
+
+    def batch(self, indices, fused: bool = False) -> list:
+        return [self.example(r, fused) for r in self.records[indices]]
+
+    def batches(self, size: int, fused: bool = False):
+        for start in range(0, len(self), size):
+            yield self.batch(slice(start, start + size), fused)
+
+    def sample(self, k: int, seed: int = 0, fused: bool = False) -> list:
+        rng = np.random.default_rng(seed)
+        idx = np.sort(rng.choice(len(self), min(k, len(self)), replace=False))
+        return self.batch(idx, fused)
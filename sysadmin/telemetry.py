@@ -0,0 +1,206 @@
+"""In-process Prometheus counters/histograms and an optional /metrics endpoint.
+
+Metrics are always recorded (a lock and a bisect per observation); the
+HTTP endpoint is only started when a port is given.
+"""
+from __future__ import annotations
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+RECOVERY_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _labels(names, values, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values, amount: float = 1.0):
+        with self._lock:
+            self._values[values] = self._values.get(values, 0.0) + amount
+
+    def value(self, *values) -> float:
+        return self._values.get(values, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in items]
+
+
+class Gauge:
+    """Value read at scrape time from a callback returning {labels: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._fn = dict
+
+    def track(self, fn):
+        """Report fn()'s values; replaces any earlier callback."""
+        self._fn = fn
+
+    def render(self) -> list[str]:
+        items = sorted(self._fn().items())
+        return [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple = (),
+                 buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # values -> [counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, v: float, *values):
+        i = bisect.bisect_left(self.buckets, v)
+        with self._lock:
+            s = self._series.get(values)
+            if s is None:
+                s = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += v
+            s[2] += 1
+
+    @contextmanager
+    def time(self, *values):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *values)
+
+    def count(self, *values) -> int:
+        s = self._series.get(values)
+        return s[2] if s else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(s[0]), s[1], s[2]))
+                           for k, s in self._series.items())
+        lines = []
+        for k, (counts, total, n) in items:
+            cum = 0
+            for le, c in zip(self.buckets + ("+Inf",), counts):
+                cum += c
+                lbl = _labels(self.labels, k, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{lbl} {cum}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, k)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labels, k)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels: tuple = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels: tuple = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labels))
+
+
+def histogram(name: str, help: str, labels: tuple = (),
+              buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labels, buckets))
+
+
+COLLECT_SECONDS = histogram("sysadmin_collect_seconds",
+                            "Time to collect one metrics sample", ("interface",))
+ANOMALIES = counter("sysadmin_anomalies_total", "Anomalous samples",
+                    ("interface",))
+AGENT_SECONDS = histogram("sysadmin_agent_seconds",
+                          "Agent latency per stage", ("stage",))
+CACHE = counter("sysadmin_cache_total", "Diagnosis cache lookups", ("result",))
+TIER = counter("sysadmin_tier_total", "Diagnoses by tier", ("tier",))
+# Tier that answered this thread's current diagnosis, for the audit log
+SOURCE: ContextVar[str] = ContextVar("sysadmin_source", default="llm")
+MODEL_SECONDS = histogram("sysadmin_model_seconds",
+                          "Hedged agent latency per model", ("model",))
+HEDGES = counter("sysadmin_hedges_total", "Hedged diagnoses by winner",
+                 ("winner",))
+ACTION_SECONDS = histogram("sysadmin_action_seconds",
+                           "Executor latency per action", ("action",))
+ACTIONS = counter("sysadmin_actions_total", "Executed actions by return code",
+                  ("action", "rc"))
+ACTIONS_SKIPPED = counter("sysadmin_actions_skipped_total",
+                          "Actions refused by the scheduler", ("action", "reason"))
+ACTION_COOLDOWN = gauge("sysadmin_action_cooldown_seconds",
+                        "Seconds until the scheduler allows an action again",
+                        ("action", "interface"))
+ACTION_IN_FLIGHT = gauge("sysadmin_action_in_flight",
+                         "Actions currently running", ("action", "interface"))
+RECOVERY_SECONDS = histogram("sysadmin_recovery_seconds",
+                             "Time from anomaly (or probe failure) to restored link",
+                             ("interface",), RECOVERY_BUCKETS)
+ACTION_RECOVERY_SECONDS = histogram("sysadmin_action_recovery_seconds",
+                                    "Verified time from action to recovered link",
+                                    ("action",), RECOVERY_BUCKETS)
+PROBE_SECONDS = histogram("sysadmin_probe_seconds", "Watchdog probe round latency")
+PROBE_FAILURES = counter("sysadmin_probe_failures_total", "Failed watchdog probe rounds")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY):
+    """Serve /metrics from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True,
+                     name="metrics").start()
+    log.info(f"Metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,108 @@
+"""Post-action recovery verification with retries."""
+from __future__ import annotations
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from . import telemetry
+from .constants import RETRIES
+
+log = logging.getLogger(__name__)
+
+# actions whose effect can be checked by watching the link come back
+VERIFY_ACTIONS = {"wifi_reset", "wifi_up"}
+
+
+@dataclass
+class RecoveryResult:
+    action: str
+    iface: str
+    ok: bool
+    seconds: float
+    samples: int
+    reason: str
+
+
+class RecoveryVerifier:
+    """Sample an interface at high frequency until it has recovered.
+
+    Recovered means operstate up with RX at or above that monitor's
+    rx_thresh (when a monitor is known for the interface) and the
+    prober's quorum reachable (when a prober is given).
+    """
+
+    def __init__(self, monitors: dict | None = None, prober=None,
+                 deadline: float = 30.0, interval: float = 0.25,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.monitors = monitors or {}
+        self.prober = prober
+        self.deadline = deadline
+        self.interval = interval
+        self.clock = clock
+        self.sleep = sleep
+
+    def _check(self, iface: str) -> str | None:
+        """None if recovered, else what is still wrong."""
+        mon = self.monitors.get(iface)
+        if mon is not None:
+            m = mon.collect()
+            if m.state != "up":
+                return f"state={m.state}"
+            if m.rx_mbps < mon.rx_thresh:
+                return f"rx={m.rx_mbps}"
+        if self.prober is not None and not self.prober.check():
+            return "unreachable"
+        return None
+
+    def verify(self, action: str, iface: str) -> RecoveryResult:
+        t0 = self.clock()
+        samples = 0
+        while True:
+            samples += 1
+            problem = self._check(iface)
+            elapsed = self.clock() - t0
+            if problem is None:
+                return RecoveryResult(action, iface, True, elapsed, samples,
+                                      "recovered")
+            if elapsed >= self.deadline:
+                return RecoveryResult(action, iface, False, elapsed, samples,
+                                      problem)
+            self.sleep(self.interval)
+
+
+class VerifiedExecutor:
+    """SecureExecutor wrapper: verify recovery, retry if it fails.
+
+    After a verified action fails to bring the link back, the actions in
+    RETRIES[action] are tried in order, each verified in turn.
+    """
+
+    def __init__(self, executor, verifier: RecoveryVerifier, audit=None,
+                 retries: dict[str, list[str]] = RETRIES):
+        self.executor = executor
+        self.verifier = verifier
+        self.audit = audit if audit is not None else executor.audit
+        self.retries = retries
+
+    def execute(self, action: str, iface: str, reason: str = "") -> bool:
+        chain = [action] + self.retries.get(action, [])
+        for attempt, act in enumerate(chain):
+            if attempt:
+                log.warning(f"Retrying with {act} (attempt {attempt + 1})")
+                reason = f"retry: {reason}"
+            if not self.executor.execute(act, iface, reason):
+                continue
+            if self.executor.dry_run or act not in VERIFY_ACTIONS:
+                return True
+            r = self.verifier.verify(act, iface)
+            self.audit.log_recovery(act, iface, r.ok, r.seconds, r.samples,
+                                    attempt, r.reason)
+            if r.ok:
+                telemetry.ACTION_RECOVERY_SECONDS.observe(r.seconds, act)
+                log.info(f"{iface} recovered {r.seconds:.1f}s after {act}")
+                return True
+            log.warning(f"{iface} not recovered {r.seconds:.1f}s after {act}:"
+                        f" {r.reason}")
+        return False
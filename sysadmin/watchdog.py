@@ -5,6 +5,12 @@ import logging
 import subprocess
 import time
 
+from . import telemetry
+from .linkhelper import LinkHelperClient
+from .probe import Prober, Target
+from .scheduler import ActionScheduler, AdaptiveInterval, HealthLoop
+from .verify import RecoveryVerifier
+
 log = logging.getLogger(__name__)
 
 DEFAULT_GATEWAY = "192.168.8.1"
@@ -15,20 +21,17 @@ DEFAULT_COOLDOWN = 60
 DEFAULT_POST_RESET_SLEEP = 10
 
 
-def ping(host: str, timeout: int = 2) -> bool:
-    """Return True if host is reachable."""
-    try:
-        subprocess.run(
-            ["ping", "-c", "1", "-W", str(timeout), host],
-            capture_output=True, check=True
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
-
-
-def reset_wifi(iface: str) -> bool:
+def reset_wifi(iface: str, helper=None) -> bool:
     """Reset WiFi interface (down then up)."""
+    if helper is not None and helper.available():
+        try:
+            r = helper.run("wifi_reset", iface)
+        except (OSError, ValueError) as e:
+            log.warning(f"Link helper unavailable ({e}), using sudo")
+        else:
+            if not r["ok"]:
+                log.error(f"Reset failed: {r.get('error')}")
+            return r["ok"]
     try:
         subprocess.run(
             ["sudo", "-n", "/usr/sbin/ip", "link", "set", iface, "down"],
@@ -45,52 +48,111 @@ def reset_wifi(iface: str) -> bool:
         return False
 
 
-def run(gateway: str, iface: str, interval: int, max_failures: int, cooldown: int, post_reset_sleep: int):
-    """Main watchdog loop."""
-    failures = 0
-    last_reset = 0
-    log.info(f"Watching {iface}, pinging {gateway} every {interval}s")
-
-    while True:
-        if ping(gateway):
-            if failures > 0:
-                log.info("Connection restored")
-            failures = 0
-        else:
-            failures += 1
-            log.warning(f"Ping failed ({failures}/{max_failures})")
-
-            if failures >= max_failures:
-                now = time.time()
-                if now - last_reset > cooldown:
-                    log.warning(f"Connection lost, resetting {iface}")
-                    if reset_wifi(iface):
-                        log.info("Reset complete")
-                        last_reset = now
-                        failures = 0
-                        time.sleep(post_reset_sleep)
-                else:
-                    remain = int(cooldown - (now - last_reset))
-                    log.info(f"Cooldown active, {remain}s remaining")
-
-        time.sleep(interval)
+class ResetExecutor:
+    """Executor-shaped wrapper around reset_wifi for the ActionScheduler.
+
+    Only wifi_reset is supported; with a verifier, recovery is polled
+    after each successful reset.
+    """
+
+    def __init__(self, helper=None, verifier: RecoveryVerifier | None = None):
+        self.helper = helper
+        self.verifier = verifier
+
+    def execute(self, action: str, iface: str, reason: str = "") -> bool:
+        if action != "wifi_reset":
+            log.warning(f"Watchdog cannot run '{action}'")
+            return False
+        t0 = time.perf_counter()
+        ok = reset_wifi(iface, self.helper)
+        telemetry.ACTION_SECONDS.observe(time.perf_counter() - t0, action)
+        telemetry.ACTIONS.inc(action, "0" if ok else "1")
+        if ok and self.verifier is not None:
+            r = self.verifier.verify(action, iface)
+            if r.ok:
+                telemetry.ACTION_RECOVERY_SECONDS.observe(r.seconds, action)
+                log.info(f"Recovered {r.seconds:.1f}s after reset")
+            else:
+                log.warning(f"Not recovered {r.seconds:.1f}s after reset")
+        return ok
+
+
+def run(gateway: str, iface: str, interval: float, max_failures: int, cooldown: int,
+        post_reset_sleep: int, targets: list[str] | None = None, quorum: int = 1,
+        metrics_port: int | None = None, slow_interval: float | None = None,
+        sample: bool = False, verify_deadline: float = 30.0):
+    """Main watchdog loop.
+
+    Probes every interval while there is trouble, relaxing to
+    slow_interval (default: interval, i.e. fixed) while healthy. With
+    sample, bitrate is checked in the same loop and RX degradation
+    counts as trouble. After a reset, reachability is polled until it
+    is back (up to verify_deadline) and the time to recover is logged.
+    """
+    if metrics_port:
+        telemetry.serve(metrics_port)
+    helper = LinkHelperClient()
+    prober = Prober([Target.parse(t) for t in targets or [gateway]], quorum,
+                    timeout=min(2.0, max(interval, 0.2)))
+    monitor = None
+    if sample:
+        from .linkstats import get_backend
+        from .monitor import NetworkMonitor
+        monitor = NetworkMonitor(iface, backend=get_backend("auto"))
+
+    verifier = None
+    if verify_deadline > 0:
+        verifier = RecoveryVerifier(prober=prober, deadline=verify_deadline,
+                                    interval=min(interval, 0.5))
+    actions = ActionScheduler(ResetExecutor(helper, verifier), cooldown)
+
+    def on_anomaly(m):
+        log.warning(f"Bitrate anomaly: {m}")
+
+    policy = AdaptiveInterval(interval, slow_interval or interval)
+    loop = HealthLoop(iface, prober, monitor, on_anomaly,
+                      lambda: actions.execute("wifi_reset", iface,
+                                              "reachability lost"),
+                      max_failures, cooldown, post_reset_sleep, policy,
+                      actions=actions)
+    log.info(f"Probing {len(prober.targets)} target(s) (quorum {quorum})")
+    try:
+        loop.run()
+    finally:
+        prober.close()
 
 
 def main():
     ap = argparse.ArgumentParser(description="Network watchdog")
     ap.add_argument("--gateway", default=DEFAULT_GATEWAY)
     ap.add_argument("--interface", default=DEFAULT_INTERFACE)
-    ap.add_argument("--interval", type=int, default=DEFAULT_INTERVAL)
+    ap.add_argument("--interval", type=float, default=DEFAULT_INTERVAL)
     ap.add_argument("--failures", type=int, default=DEFAULT_FAILURES)
     ap.add_argument("--cooldown", type=int, default=DEFAULT_COOLDOWN)
     ap.add_argument("--post-reset-sleep", type=int, default=DEFAULT_POST_RESET_SLEEP)
+    ap.add_argument("--target", action="append",
+                    help="host, icmp:host or tcp:host:port (repeatable; "
+                         "default: gateway)")
+    ap.add_argument("--quorum", type=int, default=1,
+                    help="Targets that must answer for the link to count as up")
+    ap.add_argument("--metrics-port", type=int,
+                    help="Serve Prometheus metrics on 127.0.0.1:PORT")
+    ap.add_argument("--slow-interval", type=float,
+                    help="Relax to this interval while healthy (default: fixed)")
+    ap.add_argument("--sample", action="store_true",
+                    help="Also check RX/TX bitrate in the same loop")
+    ap.add_argument("--verify-deadline", type=float, default=30.0,
+                    help="Poll until reachable after a reset, up to this long "
+                         "(0: off)")
     args = ap.parse_args()
 
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s: %(message)s"
     )
-    run(args.gateway, args.interface, args.interval, args.failures, args.cooldown, args.post_reset_sleep)
+    run(args.gateway, args.interface, args.interval, args.failures, args.cooldown,
+        args.post_reset_sleep, args.target, args.quorum, args.metrics_port,
+        args.slow_interval, args.sample, args.verify_deadline)
 
 
 if __name__ == "__main__":
@@ -24,3 +24,70 @@ class TestAgentWithMockedLLM:
         with patch.object(agent.diagnoser, "forward", return_value=no_issue):
             diag, dec, reason = agent("wlP9s9", "up", 500.0, 500.0, -45)
             assert dec.action == "none"
+
+
+class TestFusedAgent:
+    def test_fused_mode_single_call(self):
+        from sysadmin.stub import StubLM
+        import dspy
+        lm = StubLM()
+        agent = SysAdminAgent("fused")
+        with dspy.context(lm=lm):
+            diag, dec, _ = agent("wlP9s9", "up", 6.0, 258.0, -45)
+        assert diag.issue_type == "wifi_rx_degraded"
+        assert dec.action == "wifi_reset"
+        assert lm.calls == 1
+
+    def test_two_stage_uses_two_calls(self):
+        from sysadmin.stub import StubLM
+        import dspy
+        lm = StubLM()
+        with dspy.context(lm=lm):
+            SysAdminAgent()("wlP9s9", "up", 6.0, 258.0, -45)
+        assert lm.calls == 2
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            SysAdminAgent("three_stage")
+
+
+class TestHedgedAgent:
+    def _agent(self, primary, secondary, **kw):
+        from sysadmin.agent import HedgedAgent
+        from sysadmin.stub import StubLM
+        return HedgedAgent(SysAdminAgent(), StubLM(primary, name="big"),
+                           StubLM(secondary, name="small"), **kw)
+
+    def test_fast_primary_not_hedged(self):
+        agent = self._agent(0.0, 0.0, hedge_delay=1.0)
+        diag, dec, _ = agent("wlP9s9", "up", 3.0, 400.0, -45)
+        assert dec.action == "wifi_reset"
+        assert agent.lms["secondary"].stats()["calls"] == 0
+
+    def test_slow_primary_hedged_to_secondary(self):
+        import time
+        agent = self._agent(0.5, 0.01, hedge_delay=0.05)
+        t0 = time.perf_counter()
+        diag, _, _ = agent("wlP9s9", "up", 3.0, 400.0, -45)
+        assert time.perf_counter() - t0 < 0.4
+        assert diag.issue_type == "wifi_rx_degraded"
+        assert len(agent.latency["secondary"]) == 1
+
+    def test_failed_primary_hedges_immediately(self):
+        from sysadmin.agent import HedgedAgent
+        from sysadmin.stub import StubLM
+
+        class Broken(StubLM):
+            def __call__(self, *a, **kw):
+                raise RuntimeError("ollama down")
+        agent = HedgedAgent(SysAdminAgent(), Broken(), StubLM(), hedge_delay=5.0)
+        diag, _, _ = agent("wlP9s9", "down", 0.0, 0.0, -100)
+        assert diag.issue_type == "interface_down"
+
+    def test_delay_adapts_to_primary_p95(self):
+        agent = self._agent(0.0, 0.0, hedge_delay=2.0, min_samples=3,
+                            min_delay=0.0)
+        for _ in range(3):
+            agent("wlP9s9", "up", 3.0, 400.0, -45)
+        assert agent.delay() < 0.5
+        assert agent.stats()["primary"]["n"] == 3
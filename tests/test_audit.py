@@ -0,0 +1,47 @@
+"""Tests for audit loggers."""
+import gzip
+import json
+from sysadmin.audit import AuditLogger, BufferedAuditLogger
+
+
+def read(path):
+    return [json.loads(l) for l in path.read_text().splitlines()]
+
+
+class TestAuditLogger:
+    def test_appends_jsonl(self, tmp_path):
+        a = AuditLogger(str(tmp_path / "audit.jsonl"))
+        a.log_action("wifi_reset", True, 0, "test")
+        rec, = read(tmp_path / "audit.jsonl")
+        assert rec["event"] == "action" and "ts" in rec
+
+
+class TestBufferedAuditLogger:
+    def test_batches_until_close(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        a = BufferedAuditLogger(str(path), flush_interval=60)
+        for i in range(3):
+            a.log_action("wifi_reset", True, 0, str(i))
+        assert path.read_text() == ""
+        a.close()
+        assert [r["reason"] for r in read(path)] == ["0", "1", "2"]
+
+    def test_intent_is_synchronous(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        a = BufferedAuditLogger(str(path), flush_interval=60)
+        a.log_decision({}, {}, "before")
+        a.log_intent("wifi_reset", {"iface": "wlP9s9"}, ["ip"], "bug")
+        assert [r["event"] for r in read(path)] == ["decision", "intent"]
+        a.close()
+
+    def test_rotation_gzips_segments(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        a = BufferedAuditLogger(str(path), flush_interval=60, max_batch=1,
+                                max_bytes=200, backups=2)
+        for i in range(20):
+            a.log_action("wifi_reset", True, 0, "x" * 50)
+            a.flush()
+        a.close()
+        seg = tmp_path / "audit.jsonl.1.gz"
+        assert seg.exists() and not (tmp_path / "audit.jsonl.3.gz").exists()
+        assert b'"event": "action"' in gzip.decompress(seg.read_bytes())
@@ -0,0 +1,96 @@
+"""Tests for indexed audit log queries."""
+from datetime import datetime, timedelta
+from sysadmin.audit import AuditLogger
+from sysadmin.auditquery import AuditIndex, aggregate, parse_time, query
+
+
+def fill(path, monkeypatch, n=50):
+    """Write n action records one hour apart, starting 2026-01-01."""
+    base = datetime(2026, 1, 1)
+    times = iter(base + timedelta(hours=i) for i in range(n))
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls):
+            return next(times)
+
+    monkeypatch.setattr("sysadmin.audit.datetime", Clock)
+    a = AuditLogger(str(path))
+    a.index.stride = 256
+    for i in range(n):
+        a.log_action("wifi_reset" if i % 2 else "wifi_up", True, 0, f"r{i}")
+    return base
+
+
+class TestQuery:
+    def test_index_is_sparse_and_sorted(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.jsonl"
+        fill(path, monkeypatch)
+        entries = AuditIndex(path).entries()
+        assert 1 < len(entries) < 50
+        assert entries == sorted(entries)
+
+    def test_time_range(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.jsonl"
+        base = fill(path, monkeypatch)
+        recs = list(query(str(path), base + timedelta(hours=10),
+                          base + timedelta(hours=12)))
+        assert [r["reason"] for r in recs] == ["r10", "r11", "r12"]
+
+    def test_action_filter(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.jsonl"
+        fill(path, monkeypatch, n=10)
+        recs = list(query(str(path), action="wifi_reset"))
+        assert len(recs) == 5
+
+    def test_update_indexes_unindexed_log(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.jsonl"
+        fill(path, monkeypatch)
+        (tmp_path / "audit.jsonl.idx").unlink()
+        idx = AuditIndex(path, stride=256)
+        idx.update()
+        assert len(idx.entries()) > 1
+
+
+class TestAggregate:
+    def test_resets_and_mtbi(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.jsonl"
+        fill(path, monkeypatch, n=4)
+        agg = aggregate(query(str(path)))
+        assert agg["resets_per_day"] == {"2026-01-01": 2}
+        assert agg["mean_time_between_incidents_s"] == 3600
+
+
+def test_parse_relative_time():
+    now = datetime(2026, 1, 8)
+    assert parse_time("7d", now) == datetime(2026, 1, 1)
+    assert parse_time("2026-01-01T00:00:00") == datetime(2026, 1, 1)
+
+
+class TestRotated:
+    def _segments(self, tmp_path):
+        import gzip
+        path = tmp_path / "audit.jsonl"
+        for i, day in ((2, [1, 2, 3]), (1, [4, 5, 6])):
+            with gzip.open(tmp_path / f"audit.jsonl.{i}.gz", "wt") as f:
+                for d in day:
+                    f.write(f'{{"event": "action", "ts": "2026-01-0{d}T00:00:00"}}\n')
+        path.write_text('{"event": "action", "ts": "2026-01-07T00:00:00"}\n')
+        return path
+
+    def test_until_applies_to_segments(self, tmp_path):
+        path = self._segments(tmp_path)
+        recs = list(query(str(path), until=datetime(2026, 1, 1, 12)))
+        assert [r["ts"][:10] for r in recs] == ["2026-01-01"]
+
+    def test_old_segments_skipped(self, tmp_path, monkeypatch):
+        import gzip
+        path = self._segments(tmp_path)
+        opened = []
+        real = gzip.open
+        monkeypatch.setattr("sysadmin.auditquery.gzip.open",
+                            lambda p, *a: opened.append(p.name) or real(p, *a))
+        recs = list(query(str(path), since=datetime(2026, 1, 5)))
+        assert [r["ts"][:10] for r in recs] == ["2026-01-05", "2026-01-06",
+                                                "2026-01-07"]
+        assert opened.count("audit.jsonl.2.gz") == 1  # first line only
@@ -0,0 +1,55 @@
+"""Tests for trace recording and pipeline replay."""
+from types import SimpleNamespace
+from sysadmin.bench import percentiles, replay
+from sysadmin.monitor import Metrics, NetworkMonitor
+from sysadmin.trace import TraceWriter, read_trace, synthetic_trace
+
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, interface, state, rx, tx, signal, trend=None):
+        self.calls += 1
+        return None, SimpleNamespace(action="wifi_reset", confidence=0.9), "r"
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.actions = []
+
+    def execute(self, action, iface, reason=""):
+        self.actions.append((action, iface))
+        return True
+
+
+class TestTrace:
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "t.trace"
+        w = TraceWriter(str(path), ["wlP9s9", "eth0"])
+        w.write(Metrics("wlP9s9", "up", 6.0, 258.0, -45), ts=1.0)
+        w.write(Metrics("eth0", "down", 0.0, 0.0, -100), ts=2.0)
+        w.close()
+        assert list(read_trace(str(path))) == [
+            (1.0, Metrics("wlP9s9", "up", 6.0, 258.0, -45)),
+            (2.0, Metrics("eth0", "down", 0.0, 0.0, -100))]
+
+    def test_synthetic_has_incidents(self):
+        states = [m.state for _, m in synthetic_trace(5000)]
+        assert "down" in states and states.count("up") > 4000
+
+
+class TestReplay:
+    def test_counts_incidents_and_stages(self):
+        samples = [(i, Metrics("wlP9s9", "up", rx, 500.0, -45))
+                   for i, rx in enumerate([500, 6, 6, 500, 6, 500])]
+        agent, ex = FakeAgent(), FakeExecutor()
+        r = replay(samples, {"wlP9s9": NetworkMonitor("wlP9s9")}, agent, ex)
+        assert (r["samples"], r["incidents"], agent.calls) == (6, 2, 3)
+        assert r["stages_ms"]["execute"]["n"] == 3
+        assert r["peak_rss_mb"] > 0
+
+
+def test_percentiles():
+    p = percentiles([i / 1000 for i in range(1, 101)])
+    assert (p["p50"], p["p99"]) == (51.0, 100.0)
@@ -0,0 +1,62 @@
+"""Tests for the quantized diagnosis cache."""
+import pytest
+from sysadmin.audit import AuditLogger
+from sysadmin.cache import CachedAgent, DiagnosisCache
+
+
+class CountingAgent:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, interface, state, rx, tx, signal, **kw):
+        self.calls += 1
+        return ("diag", "dec", f"call {self.calls}")
+
+
+class TestDiagnosisCache:
+    def test_nearby_metrics_share_key(self):
+        c = DiagnosisCache()
+        k = c.key("wlP9s9", "up", 6.0, 258.0, -45)
+        assert k == c.key("wlP9s9", "up", 7.5, 480.0, -42)
+        assert k != c.key("wlP9s9", "down", 6.0, 258.0, -45)
+
+    def test_interfaces_do_not_share_entries(self):
+        c = DiagnosisCache()
+        assert c.key("wlP9s9", "up", 6.0, 258.0, -45) != c.key("wlan1", "up", 6.0, 258.0, -45)
+
+    def test_ttl_expiry(self, monkeypatch):
+        c = DiagnosisCache(ttl=10)
+        monkeypatch.setattr("time.time", lambda: 1000.0)
+        c.put("k", ("a",))
+        monkeypatch.setattr("time.time", lambda: 1011.0)
+        assert c.get("k") is None
+
+    def test_lru_eviction(self):
+        c = DiagnosisCache(maxsize=2)
+        c.put("a", (1,))
+        c.put("b", (2,))
+        c.get("a")
+        c.put("c", (3,))
+        assert c.get("b") is None and c.get("a") == (1,)
+
+    def test_persists_across_instances(self, tmp_path):
+        pytest.importorskip("pydantic")
+        from sysadmin.models import ActionDecision, DiagnosisResult
+        path = tmp_path / "cache.json"
+        value = (DiagnosisResult(issue_detected=True, issue_type="wifi_rx_degraded",
+                                 severity="critical"),
+                 ActionDecision(action="wifi_reset", confidence=0.9), "bug")
+        DiagnosisCache(path=str(path)).put("k", value)
+        assert DiagnosisCache(path=str(path)).get("k") == value
+
+
+class TestCachedAgent:
+    def test_hit_skips_agent_and_is_audited(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit.jsonl"))
+        inner = CountingAgent()
+        agent = CachedAgent(inner, DiagnosisCache(), audit)
+        first = agent("wlP9s9", "up", 6.0, 258.0, -45)
+        assert agent("wlP9s9", "up", 6.2, 300.0, -48) == first
+        assert inner.calls == 1
+        lines = (tmp_path / "audit.jsonl").read_text().splitlines()
+        assert ['"hit": false' in lines[0], '"hit": true' in lines[1]] == [True, True]
@@ -0,0 +1,58 @@
+"""Tests for the coalescing anomaly dispatcher."""
+import threading
+from sysadmin.dispatch import AnomalyDispatcher
+from sysadmin.monitor import Metrics
+
+
+def m(iface, rx=6.0):
+    return Metrics(iface, "up", rx, 258.0, -45)
+
+
+class Blocking:
+    """Handler that blocks until released, recording what it saw."""
+
+    def __init__(self):
+        self.seen = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, metrics):
+        self.seen.append(metrics)
+        self.started.set()
+        self.release.wait(5)
+
+
+class TestDispatcher:
+    def test_coalesces_same_interface(self):
+        h = Blocking()
+        d = AnomalyDispatcher(h, maxsize=4)
+        assert d.submit(m("wlP9s9", 1.0)) == "queued"
+        h.started.wait(5)
+        assert d.submit(m("wlP9s9", 2.0)) == "coalesced"  # in flight
+        assert d.submit(m("wlan1", 3.0)) == "queued"
+        assert d.submit(m("wlan1", 4.0)) == "coalesced"  # latest wins
+        h.release.set()
+        assert d.join(5)
+        d.close()
+        assert [x.rx_mbps for x in h.seen] == [1.0, 4.0]
+        assert d.stats()["coalesced"] == 2
+
+    def test_drops_when_full(self):
+        h = Blocking()
+        d = AnomalyDispatcher(h, maxsize=1)
+        d.submit(m("a"))
+        h.started.wait(5)
+        assert d.submit(m("b")) == "queued"
+        assert d.submit(m("c")) == "dropped"
+        h.release.set()
+        d.close()
+        assert d.stats()["dropped"] == 1
+        assert d.stats()["handled"] == 2
+
+    def test_handler_errors_counted(self):
+        def boom(metrics):
+            raise RuntimeError("LLM returned None diagnosis")
+        d = AnomalyDispatcher(boom)
+        d.submit(m("a"))
+        d.close()
+        assert d.stats()["failed"] == 1
@@ -0,0 +1,74 @@
+"""Tests for distilling logged decisions into a local classifier."""
+import pytest
+
+pytest.importorskip("numpy")
+
+from sysadmin.audit import AuditLogger  # noqa: E402
+from sysadmin.distill import (DistilledAgent, DistilledModel, distill,  # noqa: E402
+                              from_audit, from_dataset)
+
+
+METRICS = {"interface": "wlP9s9", "state": "up", "rx_mbps": 6.0,
+           "tx_mbps": 300.0, "signal": -50}
+
+
+def log_decisions(path, n=20):
+    a = AuditLogger(str(path))
+    a.log_decision({"issue_type": "old"}, {}, "no metrics")  # pre-metrics record
+    for i in range(n):
+        rx = 5.0 + i % 4
+        a.log_decision({"issue_detected": True, "issue_type": "wifi_rx_degraded",
+                        "severity": "critical"}, {"action": "wifi_reset"}, "llm",
+                       {"interface": "wlP9s9", "state": "up", "rx_mbps": rx,
+                        "tx_mbps": 300.0 + i, "signal": -50}, "llm")
+
+
+class TestDistill:
+    def test_trains_and_reports_agreement(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        log_decisions(path)
+        model, report = distill(str(path), synthetic=30)
+        assert report["logged"] == 20 and report["holdout"] == 4
+        assert report["agreement_with_llm"] == 1.0
+        assert report["predict_us"] < 1000
+
+    def test_learns_only_from_llm_decisions(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        a = AuditLogger(str(path))
+        diag = {"issue_type": "wifi_rx_degraded", "severity": "critical"}
+        for source in ("rules", "cache", "distilled", "fleet", None):
+            a.log_decision(diag, {}, "r", METRICS, source)
+        a.log_decision({"issue_type": "unknown"}, {}, "r", METRICS, "llm")
+        assert from_audit(str(path)) == []
+        a.log_decision(diag, {}, "r", METRICS, "llm")
+        assert from_audit(str(path)) == [(METRICS, "wifi_rx_degraded", "critical")]
+
+    def test_separates_builtin_classes(self):
+        model = DistilledModel.fit(from_dataset(50))
+        assert model.predict("down", 0.0, 0.0, -100)[0] == "interface_down"
+        assert model.predict("up", 600.0, 500.0, -45)[0] == "none"
+        itype, p = model.predict("up", 4.0, 450.0, -45)
+        assert itype == "wifi_rx_degraded" and p > 0.9
+
+    def test_save_load(self, tmp_path):
+        model = DistilledModel.fit(from_dataset(20))
+        model.save(str(tmp_path / "m.json"))
+        loaded = DistilledModel.load(str(tmp_path / "m.json"))
+        assert loaded.predict("up", 4.0, 450.0, -45) == model.predict("up", 4.0, 450.0, -45)
+
+
+class TestDistilledAgent:
+    def test_confident_answers_locally(self):
+        agent = DistilledAgent(DistilledModel.fit(from_dataset(50)),
+                               fallback=lambda *a, **k: pytest.fail("escalated"))
+        diag, dec, reason = agent("wlP9s9", "up", 4.0, 450.0, -45)
+        assert diag.issue_type == "wifi_rx_degraded" and dec.action == "wifi_reset"
+        assert diag.severity == "critical" and reason.startswith("distilled")
+
+    def test_unsure_escalates(self):
+        calls = []
+        agent = DistilledAgent(DistilledModel.fit(from_dataset(50)),
+                               fallback=lambda *a, **k: calls.append(a) or "llm",
+                               min_confidence=1.01)
+        assert agent("wlP9s9", "up", 4.0, 450.0, -45) == "llm"
+        assert len(calls) == 1
@@ -0,0 +1,42 @@
+"""Tests for the batch evaluation suite."""
+import pytest
+from sysadmin.dataset import to_dspy_examples
+from sysadmin.evaluation import PARSE_FAILURE, compare, evaluate, load_program
+from sysadmin.stub import StubLM
+
+
+class BrokenLM(StubLM):
+    def __call__(self, prompt=None, messages=None, **kwargs):
+        raise RuntimeError("model unavailable")
+
+
+class TestEvaluate:
+    def test_stub_scores_perfectly(self):
+        r = evaluate(load_program("base"), to_dspy_examples(4), StubLM(), threads=3)
+        assert r["n"] == 12 and r["accuracy"] == 1.0
+        assert r["confusion"]["interface_down"] == {"interface_down": 4}
+        assert r["prompt_tokens"]["p50"] > 0
+
+    def test_fused_program(self):
+        ex = to_dspy_examples(2, fused=True)
+        assert evaluate(load_program("fused"), ex, StubLM())["accuracy"] == 1.0
+
+    def test_failures_counted(self):
+        r = evaluate(load_program("base"), to_dspy_examples(1), BrokenLM())
+        assert r["failure_rate"] == 1.0
+        assert r["confusion"]["none"] == {PARSE_FAILURE: 1}
+
+    def test_compiled_needs_path(self):
+        with pytest.raises(ValueError):
+            load_program("compiled")
+
+
+class TestCompare:
+    def test_flags_latency_and_accuracy(self):
+        base = {"latency_ms": {"p50": 100, "p95": 200, "p99": 300},
+                "accuracy": 0.9, "failure_rate": 0.0}
+        cur = {"latency_ms": {"p50": 105, "p95": 400, "p99": 300},
+               "accuracy": 0.7, "failure_rate": 0.0}
+        assert compare(cur, base) == ["latency p95 200ms -> 400ms",
+                                      "accuracy 0.90 -> 0.70"]
+        assert compare(base, base) == []
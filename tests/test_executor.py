@@ -10,6 +10,12 @@ def mock_audit(tmp_path):
     return AuditLogger(str(tmp_path / "audit.jsonl"))
 
 
+def intents(audit):
+    import json
+    lines = audit.path.read_text().splitlines()
+    return [r for r in map(json.loads, lines) if r["event"] == "intent"]
+
+
 @pytest.fixture
 def executor(mock_audit):
     return SecureExecutor(mock_audit, dry_run=True)
@@ -53,3 +59,24 @@ class TestExecute:
         ex = SecureExecutor(mock_audit, dry_run=False)
         assert ex.execute("wifi_reset", "wlP9s9", "test") is True
         assert mock_run.call_count == 2
+
+    @patch("subprocess.run")
+    def test_uses_link_helper(self, mock_run, mock_audit):
+        helper = MagicMock()
+        helper.run.return_value = {"ok": True, "rc": 0}
+        ex = SecureExecutor(mock_audit, helper=helper)
+        assert ex.execute("wifi_reset", "wlP9s9", "test") is True
+        helper.run.assert_called_once_with("wifi_reset", "wlP9s9")
+        mock_run.assert_not_called()
+        assert [r["cmd"].split()[0] for r in intents(mock_audit)] == ["link-helper"]
+
+    @patch("subprocess.run")
+    def test_falls_back_to_sudo(self, mock_run, mock_audit):
+        mock_run.return_value = MagicMock(returncode=0)
+        helper = MagicMock()
+        helper.run.side_effect = ConnectionRefusedError()
+        ex = SecureExecutor(mock_audit, helper=helper)
+        assert ex.execute("wifi_reset", "wlP9s9", "test") is True
+        assert mock_run.call_count == 2
+        assert [r["cmd"].split()[0] for r in intents(mock_audit)] == [
+            "link-helper", "/usr/bin/sudo"]
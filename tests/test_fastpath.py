@@ -0,0 +1,65 @@
+"""Tests for the rule-based fast path."""
+import pytest
+from unittest.mock import MagicMock
+from sysadmin.fastpath import TieredAgent, rule_diagnose
+from sysadmin.telemetry import SOURCE
+
+
+class TestRuleDiagnose:
+    def test_interface_down(self):
+        diag, dec, _ = rule_diagnose("down", 0.0, 0.0, -100)
+        assert diag.issue_type == "interface_down"
+        assert dec.action == "wifi_reset"
+
+    def test_mt7925_bug(self):
+        diag, dec, _ = rule_diagnose("up", 6.0, 576.0, -45)
+        assert diag.issue_type == "wifi_rx_degraded"
+        assert dec.confidence > 0.7
+
+    def test_weak_signal_is_ambiguous(self):
+        assert rule_diagnose("up", 6.0, 576.0, -80) is None
+
+    def test_moderate_ratio_is_ambiguous(self):
+        assert rule_diagnose("up", 6.0, 90.0, -45) is None
+
+    def test_dormant_is_ambiguous(self):
+        assert rule_diagnose("dormant", 0.0, 0.0, -100) is None
+
+
+class TestTieredAgent:
+    def test_fast_path_skips_llm(self):
+        llm = MagicMock()
+        diag, _, _ = TieredAgent(llm)("wlP9s9", "up", 6.0, 576.0, -45)
+        assert diag.issue_type == "wifi_rx_degraded"
+        assert SOURCE.get() == "rules"
+        llm.assert_not_called()
+
+    def test_ambiguous_escalates(self):
+        llm = MagicMock(return_value=("d", "a", "r"))
+        audit = MagicMock()
+        assert TieredAgent(llm, audit)("wlP9s9", "up", 6.0, 576.0, -80) == ("d", "a", "r")
+        audit.log_tier.assert_called_once_with("wlP9s9", "llm", "escalated")
+
+    def test_rules_only_never_escalates(self):
+        llm = MagicMock()
+        _, dec, _ = TieredAgent(llm, tier="rules")("wlP9s9", "up", 6.0, 576.0, -80)
+        assert dec.action == "none"
+        llm.assert_not_called()
+
+    def test_per_interface_rx_threshold(self):
+        agent = TieredAgent(MagicMock(), rx_thresholds={"wlan1": 50.0})
+        assert agent("wlP9s9", "up", 30.0, 800.0, -45)[0].issue_type == "none"
+        assert agent("wlan1", "up", 30.0, 800.0, -45)[0].issue_type == "wifi_rx_degraded"
+
+    def test_trend_anomaly_above_threshold_escalates(self):
+        llm = MagicMock(return_value=("d", "a", "r"))
+        agent = TieredAgent(llm)
+        assert agent("wlP9s9", "up", 40.0, 40.0, -45)[0].issue_type == "none"
+        llm.assert_not_called()
+        trend = "last 60 samples: rx_median=40.0 rx_baseline=480.0"
+        assert agent("wlP9s9", "up", 40.0, 40.0, -45, trend=trend) == ("d", "a", "r")
+        llm.assert_called_once()
+
+    def test_unknown_tier(self):
+        with pytest.raises(ValueError):
+            TieredAgent(None, tier="magic")
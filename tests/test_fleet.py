@@ -0,0 +1,72 @@
+"""Tests for the fleet aggregator."""
+import threading
+from concurrent.futures import wait
+
+from sysadmin.agent import SysAdminAgent
+from sysadmin.bench import bench_fleet
+from sysadmin.fleet import FleetAggregator, FleetClient, serve
+from sysadmin.stub import StubLM
+
+RX_BUG = {"interface": "wlP9s9", "state": "up", "rx_mbps": 3.0,
+          "tx_mbps": 400.0, "signal": -45}
+
+
+class CountingAgent:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, interface, state, rx_mbps, tx_mbps, signal, trend=""):
+        with self.lock:
+            self.calls += 1
+        return state, rx_mbps, "ok"
+
+
+class TestAggregator:
+    def test_identical_inputs_share_one_call(self):
+        agent = CountingAgent()
+        agg = FleetAggregator(agent, max_batch=16, max_wait=0.2)
+        futs = [agg.submit(f"h{i}", RX_BUG) for i in range(10)]
+        futs.append(agg.submit("other", {**RX_BUG, "rx_mbps": 1.0}))
+        wait(futs, timeout=5)
+        agg.close()
+        assert agent.calls == 2
+        assert futs[0].result() == ("up", 3.0, "ok")
+        assert futs[-1].result()[1] == 1.0
+        assert agg.stats()["requests"] == 11
+
+    def test_batch_size_capped(self):
+        agg = FleetAggregator(CountingAgent(), max_batch=4, max_wait=0.2)
+        futs = [agg.submit("h", {**RX_BUG, "rx_mbps": float(i)}) for i in range(10)]
+        wait(futs, timeout=5)
+        agg.close()
+        assert agg.stats()["max_batch"] <= 4
+
+    def test_agent_error_reaches_every_waiter(self):
+        def broken(*a, **kw):
+            raise RuntimeError("model down")
+        agg = FleetAggregator(broken, max_wait=0.05)
+        futs = [agg.submit(f"h{i}", RX_BUG) for i in range(3)]
+        wait(futs, timeout=5)
+        agg.close()
+        assert all(isinstance(f.exception(), RuntimeError) for f in futs)
+
+
+class TestHttp:
+    def test_client_round_trip(self):
+        agg = FleetAggregator(SysAdminAgent(), max_wait=0.01, lm=StubLM())
+        server = serve(agg, port=0)
+        try:
+            client = FleetClient(f"http://127.0.0.1:{server.server_address[1]}")
+            diag, dec, reason = client(**RX_BUG)
+        finally:
+            server.shutdown()
+            agg.close()
+        assert diag.issue_type == "wifi_rx_degraded"
+        assert dec.action == "wifi_reset"
+
+    def test_many_hosts_batched(self):
+        r = bench_fleet(hosts=30, incidents=2, latency=0.01, distinct=3)
+        assert r["errors"] == 0 and r["requests"] == 60
+        assert r["mean_batch"] > 1 and r["agent_calls"] < 60
+        assert r["host_mean_ms"]["p95"] > 0
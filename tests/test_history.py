@@ -0,0 +1,70 @@
+"""Tests for the metrics ring buffer and trend detector."""
+from sysadmin.history import MetricsHistory, TrendDetector
+from sysadmin.monitor import Metrics, NetworkMonitor
+
+
+def up(rx, tx=500.0):
+    return Metrics("wlP9s9", "up", rx, tx, -45)
+
+
+class TestMetricsHistory:
+    def test_wraps_and_keeps_order(self):
+        h = MetricsHistory(size=4)
+        for state in ["up", "down", "up", "up", "down", "up"]:
+            h.append(Metrics("wlP9s9", state, 500.0, 500.0, -45))
+        assert len(h) == 4
+        assert h.last("up", 3) == [1, 0, 1]
+        assert h.last("up", 10) == [1, 1, 0, 1]
+
+
+class TestTrendDetector:
+    def test_single_bad_sample_ignored(self):
+        d = TrendDetector()
+        results = [d.update(up(rx)) for rx in [500, 500, 6, 500, 500]]
+        assert not any(results)
+
+    def test_persistent_rx_bug_raises(self):
+        d = TrendDetector()
+        results = [d.update(up(rx)) for rx in [500, 6, 6, 6, 6, 6]]
+        assert results[-1] is True
+        assert "flagged" in d.summary()
+
+    def test_hysteresis_clears_only_after_recovery(self):
+        d = TrendDetector(median_window=1)
+        for _ in range(5):
+            d.update(up(6))
+        assert d.update(up(12)) is True   # above threshold, below clear level
+        assert d.update(up(500)) is False
+
+    def test_slow_degradation(self):
+        d = TrendDetector()
+        for _ in range(50):
+            d.update(up(500))
+        fired = False
+        for rx in list(range(500, 40, -40)) + [40] * 5:
+            fired |= d.update(up(float(rx), tx=float(rx)))
+        assert fired
+        assert not NetworkMonitor("wlP9s9").detect_anomaly(up(40.0, 40.0))
+
+    def test_sustained_drop_stays_active(self):
+        d = TrendDetector()
+        for _ in range(50):
+            d.update(up(500))
+        results = [d.update(up(float(rx), tx=float(rx)))
+                   for rx in list(range(500, 40, -40)) + [40] * 30]
+        first = results.index(True)
+        assert all(results[first:])
+        for _ in range(5):
+            d.update(up(500))
+        assert not d.active
+
+    def test_down_is_immediate(self):
+        assert TrendDetector().update(Metrics("wlP9s9", "down", 0, 0, -100))
+
+
+def test_monitor_attaches_trend_summary():
+    mon = NetworkMonitor("wlP9s9", detector="trend")
+    for _ in range(4):
+        m = up(6.0)
+        mon.detect_anomaly(m)
+    assert m.trend.startswith("last 4 samples")
@@ -0,0 +1,82 @@
+"""Tests for the privileged link-control helper."""
+import os
+import struct
+import threading
+
+from sysadmin import netlink as nl
+from sysadmin.linkhelper import (HelperServer, LinkHelper, LinkHelperClient,
+                                 RTM_NEWLINK, link_ops, pack_setlink)
+
+
+class FakeRtnl:
+    def __init__(self):
+        self.ops = []
+
+    def set_link(self, iface, up):
+        self.ops.append((iface, up))
+
+
+class TestMessages:
+    def test_pack_setlink(self):
+        msg = pack_setlink(7, 3, up=False)
+        length, mtype, flags, seq, _ = struct.unpack_from("=IHHII", msg)
+        assert (length, mtype, seq) == (len(msg), RTM_NEWLINK, 7)
+        assert flags == nl.NLM_F_REQUEST | nl.NLM_F_ACK
+        _, _, index, iflags, change = struct.unpack_from("=BxHiII", msg, 16)
+        assert (index, iflags, change) == (3, 0, 1)
+
+    def test_link_ops_whitelist(self):
+        assert link_ops("wifi_reset", "wlP9s9") == [False, True]
+        assert link_ops("wifi_up", "wlP9s9") == [True]
+        assert link_ops("wifi_reset", "eth0") is None
+        assert link_ops("rm_rf_root", "wlP9s9") is None
+
+
+class TestLinkHelper:
+    def test_performs_ops(self):
+        rtnl = FakeRtnl()
+        r = LinkHelper(rtnl, {1000}).handle(
+            {"action": "wifi_reset", "iface": "wlP9s9"}, 1000)
+        assert r["ok"] and rtnl.ops == [("wlP9s9", False), ("wlP9s9", True)]
+
+    def test_rejects_uid(self):
+        rtnl = FakeRtnl()
+        r = LinkHelper(rtnl, {1000}).handle(
+            {"action": "wifi_reset", "iface": "wlP9s9"}, 1001)
+        assert not r["ok"] and rtnl.ops == []
+
+    def test_rejects_malformed_request(self):
+        helper = LinkHelper(FakeRtnl(), {1000})
+        for req in (None, [], "wifi_reset", {"action": "wifi_reset"},
+                    {"action": ["wifi_reset"], "iface": "wlP9s9"}):
+            assert helper.handle(req, 1000)["error"] == "bad request"
+        assert helper.handle([], 1001)["error"] == "uid not allowed"
+
+    def test_reports_netlink_error(self):
+        class Failing:
+            def set_link(self, iface, up):
+                raise nl.NetlinkError(1, "Operation not permitted")
+        r = LinkHelper(Failing(), {0}).handle(
+            {"action": "wifi_down", "iface": "wlP9s9"}, 0)
+        assert r == {"ok": False, "rc": 1, "error": "[Errno 1] Operation not permitted"}
+
+
+class TestServer:
+    def test_client_roundtrip(self, tmp_path):
+        path = str(tmp_path / "link.sock")
+        rtnl = FakeRtnl()
+        server = HelperServer(path, LinkHelper(rtnl, {os.getuid()}))
+        t = threading.Thread(target=server.serve_forever, daemon=True)
+        t.start()
+        try:
+            client = LinkHelperClient(path)
+            assert client.available()
+            assert client.run("wifi_up", "wlP9s9")["ok"]
+            assert not client.run("wifi_up", "eth0")["ok"]
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert rtnl.ops == [("wlP9s9", True)]
+
+    def test_missing_socket_unavailable(self, tmp_path):
+        assert not LinkHelperClient(str(tmp_path / "none.sock")).available()
@@ -0,0 +1,94 @@
+"""Tests for nl80211 parsing against canned netlink replies."""
+import struct
+import pytest
+from sysadmin import netlink as nl
+from sysadmin.linkstats import (Nl80211Backend, parse_station, NO_LINK,
+                                NL80211_ATTR_STA_INFO, NL80211_STA_INFO_SIGNAL,
+                                NL80211_STA_INFO_RX_BITRATE,
+                                NL80211_STA_INFO_TX_BITRATE,
+                                NL80211_RATE_INFO_BITRATE,
+                                NL80211_RATE_INFO_BITRATE32)
+
+GENLHDR = struct.pack("=BBH", 17, 1, 0)
+
+
+def station_payload(rx=60, tx=5765, signal=-45):
+    sta = (nl.pack_attr(NL80211_STA_INFO_SIGNAL, struct.pack("=b", signal))
+           + nl.pack_attr(NL80211_STA_INFO_RX_BITRATE, nl.pack_attr(
+               NL80211_RATE_INFO_BITRATE, struct.pack("=H", rx)))
+           + nl.pack_attr(NL80211_STA_INFO_TX_BITRATE, nl.pack_attr(
+               NL80211_RATE_INFO_BITRATE32, struct.pack("=I", tx))))
+    return GENLHDR + nl.pack_attr(NL80211_ATTR_STA_INFO | 0x8000, sta)
+
+
+class FakeSock:
+    """Replays canned reply buffers, rewriting seq to match the request."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.seq = 0
+
+    def send(self, msg):
+        self.seq = struct.unpack_from("=I", msg, 8)[0]
+
+    def recv(self, n):
+        return self.replies.pop(0)(self.seq)
+
+    def close(self):
+        pass
+
+
+def genl_sock(replies):
+    s = object.__new__(nl.GenlSocket)
+    s.sock, s._seq = FakeSock(replies), 0
+    return s
+
+
+def family_reply(seq):
+    attrs = nl.pack_attr(nl.CTRL_ATTR_FAMILY_ID, struct.pack("=H", 0x1c))
+    return nl.pack_msg(nl.GENL_ID_CTRL, 0, seq, GENLHDR + attrs)
+
+
+def iface_reply(seq):
+    return nl.pack_msg(0x1c, 0, seq, GENLHDR)
+
+
+def dump_reply(payload):
+    return lambda seq: (nl.pack_msg(0x1c, nl.NLM_F_MULTI, seq, payload)
+                        + nl.pack_msg(nl.NLMSG_DONE, nl.NLM_F_MULTI, seq,
+                                      b"\0" * 4))
+
+
+def error_reply(errno):
+    return lambda seq: nl.pack_msg(nl.NLMSG_ERROR, 0, seq,
+                                   struct.pack("=i", -errno))
+
+
+class TestParseStation:
+    def test_decodes_rates_and_signal(self):
+        assert parse_station(station_payload()) == (6.0, 576.5, -45)
+
+    def test_missing_sta_info(self):
+        assert parse_station(GENLHDR) is None
+
+
+class TestNl80211Backend:
+    @pytest.fixture(autouse=True)
+    def ifindex(self, monkeypatch):
+        monkeypatch.setattr("socket.if_nametoindex", lambda name: 3)
+
+    def test_reads_station(self):
+        sock = genl_sock([family_reply, iface_reply,
+                          dump_reply(station_payload())])
+        b = Nl80211Backend(sock)
+        assert b.family == 0x1c
+        assert b.read("wlP9s9") == (6.0, 576.5, -45)
+
+    def test_not_associated(self):
+        sock = genl_sock([family_reply, iface_reply,
+                          dump_reply(b"")])
+        assert Nl80211Backend(sock).read("wlP9s9") == NO_LINK
+
+    def test_error_returns_no_link(self):
+        sock = genl_sock([family_reply, error_reply(19)])
+        assert Nl80211Backend(sock).read("eth0") == NO_LINK
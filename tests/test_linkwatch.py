@@ -0,0 +1,32 @@
+"""Tests for rtnetlink link event parsing."""
+import struct
+from sysadmin import netlink as nl
+from sysadmin.linkwatch import (parse_link_events, RTM_NEWLINK, RTM_DELLINK,
+                                IFLA_IFNAME, IFLA_OPERSTATE, IFLA_CARRIER)
+
+IFINFO = struct.pack("=BxHiII", 0, 1, 3, 0, 0)
+
+
+def link_msg(mtype, name, operstate=None, carrier=None):
+    attrs = nl.pack_str(IFLA_IFNAME, name)
+    if operstate is not None:
+        attrs += nl.pack_attr(IFLA_OPERSTATE, bytes([operstate]))
+    if carrier is not None:
+        attrs += nl.pack_attr(IFLA_CARRIER, bytes([carrier]))
+    return nl.pack_msg(mtype, 0, 0, IFINFO + attrs)
+
+
+class TestParseLinkEvents:
+    def test_operstate_up(self):
+        ev, = parse_link_events(link_msg(RTM_NEWLINK, "wlP9s9", 6, 1))
+        assert (ev.ifname, ev.state, ev.carrier) == ("wlP9s9", "up", 1)
+
+    def test_multiple_messages(self):
+        data = (link_msg(RTM_NEWLINK, "wlP9s9", 2, 0)
+                + link_msg(RTM_DELLINK, "eth0"))
+        evs = parse_link_events(data)
+        assert [(e.ifname, e.state) for e in evs] == [
+            ("wlP9s9", "down"), ("eth0", "notpresent")]
+
+    def test_ignores_other_types(self):
+        assert parse_link_events(nl.pack_msg(20, 0, 0, IFINFO)) == []
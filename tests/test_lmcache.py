@@ -0,0 +1,42 @@
+"""Tests for the disk-backed LM cache and cached optimization runs."""
+from sysadmin.lmcache import CachedLM
+from sysadmin.optimize import optimize
+from sysadmin.stub import StubLM
+
+MSG = [{"role": "user", "content": "[[ ## state ## ]]\ndown"}]
+
+
+class TestCachedLM:
+    def test_repeat_call_hits(self, tmp_path):
+        stub = StubLM()
+        lm = CachedLM(stub, str(tmp_path / "c.sqlite"))
+        assert lm(messages=MSG) == lm(messages=MSG)
+        assert stub.stats()["calls"] == 1
+        assert lm.stats()["hit_rate"] == 0.5
+
+    def test_temperature_is_part_of_key(self, tmp_path):
+        stub = StubLM()
+        lm = CachedLM(stub, str(tmp_path / "c.sqlite"))
+        lm(messages=MSG)
+        lm.copy(temperature=1.0, rollout_id=1)(messages=MSG)
+        assert stub.stats()["calls"] == 2
+        assert lm.stats()["calls"] == 2  # copies share counters
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        CachedLM(StubLM(), path)(messages=MSG)
+        stub = StubLM()
+        CachedLM(stub, path)(messages=MSG)
+        assert stub.stats()["calls"] == 0
+
+
+class TestOptimize:
+    def test_rerun_served_from_cache(self, tmp_path):
+        path = str(tmp_path / "c.sqlite")
+        first = optimize(n=3, threads=2, cache=path, lm=StubLM())
+        stub = StubLM()
+        second = optimize(n=3, threads=2, cache=path, lm=stub)
+        assert first.run_stats["calls"] > 0 and first.score == 100.0
+        assert stub.stats()["calls"] == 0
+        assert second.run_stats["hit_rate"] == 1.0
+        assert second.run_stats["calls_per_step"] > 0
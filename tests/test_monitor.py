@@ -26,3 +26,31 @@ class TestAnomalyDetection:
         # Both low but ratio OK - not the driver bug
         m = Metrics("wlP9s9", "up", rx_mbps=5.0, tx_mbps=5.0, signal=-80)
         assert monitor.detect_anomaly(m) is False
+
+
+class FakeWatcher:
+    def __init__(self, events):
+        self.events = events
+        self.waits = 0
+
+    def wait(self, timeout):
+        self.waits += 1
+        return self.events.pop(0) if self.events else []
+
+
+class TestEventWakeup:
+    def test_state_change_wakes_loop(self, monitor):
+        from sysadmin.linkwatch import LinkEvent
+        w = FakeWatcher([[LinkEvent("eth0", "down")],
+                         [LinkEvent("wlP9s9", "up")],
+                         [LinkEvent("wlP9s9", "down")]])
+        monitor.watcher, monitor._last_state, monitor._running = w, "up", True
+        monitor._wait(60)
+        assert w.waits == 3
+
+    def test_carrier_flap_wakes_loop(self, monitor):
+        from sysadmin.linkwatch import LinkEvent
+        monitor._last_state, monitor._last_carrier = "up", 1
+        assert not monitor.is_state_change(LinkEvent("wlP9s9", "up", 1))
+        assert monitor.is_state_change(LinkEvent("wlP9s9", "up", 0))
+        assert monitor.is_state_change(LinkEvent("wlP9s9", "up", 1))
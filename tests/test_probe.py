@@ -0,0 +1,76 @@
+"""Tests for concurrent reachability probing."""
+import asyncio
+import pytest
+from sysadmin.probe import Prober, Target, tcp_probe
+
+
+class TestTarget:
+    def test_parse(self):
+        assert (Target.parse("192.168.8.1").kind, Target.parse("192.168.8.1").host) == ("icmp", "192.168.8.1")
+        t = Target.parse("tcp:1.1.1.1:443")
+        assert (t.kind, t.host, t.port) == ("tcp", "1.1.1.1", 443)
+
+    def test_loss_window(self):
+        t = Target("h", window=4)
+        t.results.extend([0.09, None, 0.03, None, 0.01])
+        assert t.loss == 0.5
+        assert t.rtt_ms == pytest.approx(20.0)
+
+
+async def _server():
+    srv = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    return srv, srv.sockets[0].getsockname()[1]
+
+
+class TestTcpProbe:
+    def test_reachable_listener(self):
+        async def go():
+            srv, port = await _server()
+            async with srv:
+                return await tcp_probe("127.0.0.1", port, 1.0)
+        assert asyncio.run(go()) is not None
+
+    def test_refused_counts_as_reachable(self):
+        async def go():
+            srv, port = await _server()
+            srv.close()
+            await srv.wait_closed()
+            return await tcp_probe("127.0.0.1", port, 1.0)
+        assert asyncio.run(go()) is not None
+
+
+class FakeTarget(Target):
+    def __init__(self, rtt):
+        super().__init__("fake")
+        self.rtt = rtt
+
+    async def probe(self, timeout):
+        await asyncio.sleep(0.05)
+        self.results.append(self.rtt)
+        return self.rtt
+
+
+class TestQuorum:
+    def test_one_dead_host_is_not_link_down(self):
+        p = Prober([FakeTarget(0.01), FakeTarget(None), FakeTarget(0.02)],
+                   quorum=2)
+        assert p.check() is True
+        p.close()
+
+    def test_below_quorum_is_down(self):
+        p = Prober([FakeTarget(0.01), FakeTarget(None), FakeTarget(None)],
+                   quorum=2)
+        assert p.check() is False
+        p.close()
+
+    def test_probes_run_concurrently(self):
+        import time
+        p = Prober([FakeTarget(0.01) for _ in range(10)])
+        t0 = time.perf_counter()
+        p.check()
+        p.close()
+        assert time.perf_counter() - t0 < 0.3
+
+    def test_invalid_quorum(self):
+        with pytest.raises(ValueError):
+            Prober([FakeTarget(0.01)], quorum=2)
@@ -0,0 +1,59 @@
+"""Tests for the compiled program store."""
+import json
+
+import pytest
+
+from sysadmin import programs
+from sysadmin.agent import FusedDiagnoser, NetworkDiagnoser
+from sysadmin.dataset import to_dspy_examples
+
+
+@pytest.fixture
+def compiled():
+    p = NetworkDiagnoser()
+    p.predict.demos = to_dspy_examples(1)[:2]
+    return p
+
+
+class TestStore:
+    def test_roundtrip_and_find(self, tmp_path, compiled):
+        path = programs.save(compiled, "diagnoser", "qwen3:1.7b", "builtin-1",
+                             {"score": 90.0}, str(tmp_path))
+        assert programs.find("diagnoser", "qwen3:1.7b", str(tmp_path)) == path
+        assert programs.find("diagnoser", "other", str(tmp_path)) is None
+        fresh = NetworkDiagnoser()
+        meta = programs.load_into(fresh, str(path), "diagnoser")
+        assert len(fresh.predict.demos) == 2 and meta["stats"]["score"] == 90.0
+
+    def test_resolve_and_apply_to_agent(self, tmp_path, compiled):
+        from sysadmin.agent import SysAdminAgent
+        programs.save(compiled, "diagnoser", "m", "d", directory=str(tmp_path))
+        doc = programs.resolve_agent("auto", "two_stage", "m", str(tmp_path))
+        agent = SysAdminAgent()
+        programs.apply(agent, doc)
+        assert len(agent.diagnoser.predict.demos) == 2
+        assert programs.resolve_agent("auto", "fused", "m", str(tmp_path)) is None
+
+    def test_refuses_stale_signature(self, tmp_path, compiled):
+        path = programs.save(compiled, "diagnoser", "m", "d", directory=str(tmp_path))
+        doc = json.loads(path.read_text())
+        doc["signature_hash"] = "0" * 16
+        path.write_text(json.dumps(doc))
+        with pytest.raises(programs.StaleProgramError):
+            programs.load_into(NetworkDiagnoser(), str(path), "diagnoser")
+
+    def test_refuses_other_target(self, tmp_path, compiled):
+        path = programs.save(compiled, "diagnoser", "m", "d", directory=str(tmp_path))
+        with pytest.raises(programs.StaleProgramError):
+            programs.load_into(FusedDiagnoser(), str(path), "fused")
+
+    def test_resolve(self, tmp_path, compiled):
+        assert programs.resolve("none", "diagnoser", "m", str(tmp_path)) is None
+        assert programs.resolve("auto", "diagnoser", "m", str(tmp_path)) is None
+        programs.save(compiled, "diagnoser", "m", "d", directory=str(tmp_path))
+        doc = programs.resolve("auto", "diagnoser", "m", str(tmp_path))
+        assert doc["dataset"] == "d" and "state" in doc
+
+    def test_hash_tracks_signature(self):
+        assert programs.signature_hash("diagnoser") != programs.signature_hash("fused")
+        assert programs.signature_hash("diagnoser") == programs.signature_hash("diagnoser")
@@ -0,0 +1,176 @@
+"""Tests for the adaptive health loop and the action scheduler."""
+import threading
+
+from sysadmin.monitor import Metrics, NetworkMonitor
+from sysadmin.scheduler import ActionScheduler, AdaptiveInterval, HealthLoop
+
+
+class FakeProber:
+    def __init__(self, results):
+        self.results = list(results)
+
+    def check(self):
+        return self.results.pop(0) if self.results else True
+
+    def summary(self):
+        return "fake"
+
+
+class FakeMonitor(NetworkMonitor):
+    def __init__(self, rx):
+        super().__init__("wlP9s9")
+        self.rx = rx
+
+    def collect(self):
+        return Metrics(self.iface, "up", self.rx, 500.0, -45)
+
+
+class Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def drive(loop, clock, rounds):
+    delays = []
+    for _ in range(rounds):
+        d = loop.tick()
+        delays.append(d)
+        clock.t += d
+    return delays
+
+
+class TestAdaptiveInterval:
+    def test_grows_while_healthy_and_drops_on_trouble(self):
+        p = AdaptiveInterval(fast=1, slow=10, growth=2, settle=0)
+        assert [p.next(False) for _ in range(5)] == [2, 4, 8, 10, 10]
+        assert p.next(True) == 1
+
+    def test_fast_after_reset_and_backs_off_in_cooldown(self):
+        p = AdaptiveInterval(fast=1, slow=10, settle=30)
+        assert p.next(False, since_reset=5) == 1
+        assert p.next(True, since_reset=5, cooldown_left=40) == 10
+        assert p.next(True, since_reset=5, cooldown_left=3) == 3
+
+
+class TestHealthLoop:
+    def test_steady_state_wakeups(self):
+        clock = Clock()
+        loop = HealthLoop("wlP9s9", FakeProber([]), FakeMonitor(500.0),
+                          policy=AdaptiveInterval(1, 10), clock=clock)
+        while clock.t < 1600:
+            clock.t += loop.tick()
+        assert loop.wakeups < 70  # vs 600 for a fixed 1 s loop
+
+    def test_reset_then_cooldown(self):
+        clock = Clock()
+        resets = []
+        loop = HealthLoop("wlP9s9", FakeProber([False] * 6),
+                          reset=lambda: resets.append(clock.t) or True,
+                          max_failures=2, cooldown=60, clock=clock,
+                          policy=AdaptiveInterval(1, 10, settle=0))
+        delays = drive(loop, clock, 6)
+        assert len(resets) == 1
+        assert delays[:2] == [1, 1]
+        assert delays[-1] > 1  # still failing but in cooldown: back off
+
+    def test_bitrate_anomaly_tightens_interval(self):
+        seen = []
+        mon = FakeMonitor(500.0)
+        loop = HealthLoop("wlP9s9", monitor=mon, on_anomaly=seen.append,
+                          policy=AdaptiveInterval(1, 10), clock=Clock())
+        loop.tick(), loop.tick()
+        mon.rx = 6.0
+        assert loop.tick() == 1
+        assert len(seen) == 1
+
+    def test_on_sample_sees_every_sample(self):
+        seen = []
+        loop = HealthLoop("wlP9s9", monitor=FakeMonitor(500.0), clock=Clock(),
+                          on_sample=seen.append)
+        loop.tick(), loop.tick()
+        assert len(seen) == 2
+
+
+class FakeExecutor:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+        self.started = threading.Event()
+
+    def execute(self, action, iface, reason=""):
+        self.calls.append((action, iface))
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return True
+
+
+class TestActionScheduler:
+    def test_cooldown_per_action_and_interface(self):
+        clock, ex = Clock(), FakeExecutor()
+        s = ActionScheduler(ex, cooldown=60, clock=clock)
+        assert s.execute("wifi_reset", "wlP9s9")
+        assert not s.execute("wifi_reset", "wlP9s9")
+        assert s.execute("wifi_reset", "wlan1")
+        assert s.execute("wifi_up", "wlP9s9")
+        clock.t += 61
+        assert s.execute("wifi_reset", "wlP9s9")
+        assert len(ex.calls) == 4 and s.counts["cooldown"] == 1
+
+    def test_duplicate_in_flight_dropped(self):
+        gate = threading.Event()
+        ex = FakeExecutor(gate)
+        s = ActionScheduler(ex, cooldown=0, max_concurrent=2)
+        t = threading.Thread(target=s.execute, args=("wifi_reset", "wlP9s9"))
+        t.start()
+        assert ex.started.wait(5)
+        assert s.state()["in_flight"] == ["wifi_reset:wlP9s9"]
+        assert not s.execute("wifi_reset", "wlP9s9")
+        gate.set()
+        t.join()
+        assert s.counts == {"executed": 1, "duplicate": 1, "cooldown": 0, "busy": 0}
+
+    def test_concurrency_cap(self):
+        gate = threading.Event()
+        ex = FakeExecutor(gate)
+        s = ActionScheduler(ex, cooldown=0, max_concurrent=1, queue_timeout=0.05)
+        t = threading.Thread(target=s.execute, args=("wifi_reset", "wlP9s9"))
+        t.start()
+        assert ex.started.wait(5)
+        assert not s.execute("wifi_reset", "wlan1")
+        gate.set()
+        t.join()
+        assert s.counts["busy"] == 1 and len(ex.calls) == 1
+
+    def test_health_loop_honours_shared_cooldown(self):
+        clock, ex = Clock(), FakeExecutor()
+        s = ActionScheduler(ex, cooldown=300, clock=clock)
+        s.execute("wifi_reset", "wlP9s9", "llm decision")
+        loop = HealthLoop("wlP9s9", FakeProber([False] * 4),
+                          reset=lambda: s.execute("wifi_reset", "wlP9s9"),
+                          max_failures=2, clock=clock, actions=s,
+                          policy=AdaptiveInterval(1, 10, settle=0))
+        drive(loop, clock, 4)
+        assert len(ex.calls) == 1
+
+    def test_cooldown_starts_even_if_executor_raises(self):
+        class Boom:
+            def execute(self, action, iface, reason=""):
+                raise OSError("helper gone")
+        s = ActionScheduler(Boom(), cooldown=60, clock=Clock())
+        try:
+            s.execute("wifi_reset", "wlP9s9")
+        except OSError:
+            pass
+        assert s.cooldown_left("wifi_reset", "wlP9s9") == 60
+        assert s.state()["in_flight"] == []
+
+    def test_state_exported_as_gauges(self):
+        from sysadmin.telemetry import REGISTRY
+        s = ActionScheduler(FakeExecutor(), cooldown=60, clock=Clock())
+        s.execute("wifi_reset", "wlP9s9")
+        assert ('sysadmin_action_cooldown_seconds{action="wifi_reset",'
+                'interface="wlP9s9"} 60.0') in REGISTRY.render()
@@ -0,0 +1,69 @@
+"""Tests for background agent loading and startup timing."""
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from sysadmin.startup import LazyAgent, StartupTimer
+
+
+class TestLazyAgent:
+    def test_fails_until_loaded(self):
+        gate = threading.Event()
+
+        def factory():
+            gate.wait(5)
+            return lambda *a, **kw: "diagnosis"
+
+        agent = LazyAgent(factory)
+        with pytest.raises(RuntimeError, match="still loading"):
+            agent("wlP9s9", "up", 6.0, 258.0, -45)
+        gate.set()
+        assert agent.ready.wait(5)
+        assert agent("wlP9s9", "up", 6.0, 258.0, -45) == "diagnosis"
+
+    def test_load_error_is_reported(self):
+        def factory():
+            raise ConnectionError("ollama down")
+        agent = LazyAgent(factory)
+        agent._thread.join(5)
+        with pytest.raises(RuntimeError, match="ollama down"):
+            agent("wlP9s9", "up", 6.0, 258.0, -45)
+
+
+def test_timer_keeps_first_mark():
+    t = StartupTimer()
+    t.mark("first_sample")
+    first = t.report()["first_sample"]
+    t.mark("first_sample")
+    assert t.report() == {"first_sample": first}
+
+
+def test_fast_path_does_not_import_dspy():
+    pytest.importorskip("pydantic")
+    code = ("import sys, sysadmin.fastpath, sysadmin.cache, sysadmin.supervisor;"
+            "sys.exit('dspy' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_cli_parser_does_not_import_dspy():
+    pytest.importorskip("pydantic")
+    code = ("import sys; sys.argv = ['sysadmin', 'list-actions'];"
+            "from sysadmin import cli; cli.main();"
+            "sys.exit('dspy' in sys.modules or 'numpy' in sys.modules)")
+    r = subprocess.run([sys.executable, "-c", code], capture_output=True)
+    assert r.returncode == 0
+
+
+def test_daemon_start_does_not_import_dspy(tmp_path):
+    pytest.importorskip("pydantic")
+    code = ("import sys;"
+            "from sysadmin import cli, startup, supervisor;"
+            "startup.LazyAgent._load = lambda self: None;"
+            "supervisor.MonitorSupervisor.run = "
+            "lambda self: sys.exit('dspy' in sys.modules);"
+            "sys.argv = ['sysadmin', 'daemon', '--backend', 'iw'];"
+            "cli.main()")
+    r = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                       env={**os.environ, "HOME": str(tmp_path)})
+    assert r.returncode == 0, r.stderr.decode()
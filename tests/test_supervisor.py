@@ -0,0 +1,61 @@
+"""Tests for the multi-interface monitor supervisor."""
+import pytest
+from sysadmin.monitor import NetworkMonitor, Metrics
+from sysadmin.supervisor import MonitorSupervisor, parse_spec
+
+
+class FakeMonitor(NetworkMonitor):
+    def __init__(self, iface, rx, **kw):
+        super().__init__(iface, interval=0.01, **kw)
+        self.rx = rx
+        self.samples = 0
+
+    def collect(self):
+        self.samples += 1
+        return Metrics(self.iface, "up", self.rx, 500.0, -45)
+
+
+class TestParseSpec:
+    def test_name_only_uses_default_interval(self):
+        s = parse_spec("wlP9s9", 5.0)
+        assert (s.name, s.interval, s.rx_threshold) == ("wlP9s9", 5.0, 10.0)
+
+    def test_overrides(self):
+        s = parse_spec("eth0:interval=1,rx=50,ratio=3")
+        assert (s.interval, s.rx_threshold, s.ratio_threshold) == (1, 50, 3)
+
+    def test_unknown_option(self):
+        with pytest.raises(ValueError):
+            parse_spec("eth0:foo=1")
+
+
+class TestSupervisor:
+    def test_runs_all_interfaces_with_shared_handler(self):
+        mons = [FakeMonitor("wlP9s9", 6.0), FakeMonitor("wlan1", 6.0),
+                FakeMonitor("eth0", 500.0)]
+        seen = set()
+
+        def on_anomaly(m):
+            seen.add(m.interface)
+            if len(seen) == 2 and mons[2].samples > 1:
+                sup.stop()
+
+        sup = MonitorSupervisor(mons, on_anomaly)
+        sup.run()
+        assert seen == {"wlP9s9", "wlan1"}
+        assert all(m.samples > 1 for m in mons)
+
+    def test_records_recovery_time(self):
+        from sysadmin.telemetry import RECOVERY_SECONDS
+        mon = FakeMonitor("wlrec0", 6.0)
+        before = RECOVERY_SECONDS.count("wlrec0")
+
+        def on_sample(m):
+            if mon.samples == 3:
+                mon.rx = 500.0
+            elif mon.samples > 4:
+                sup.stop()
+
+        sup = MonitorSupervisor([mon], lambda m: None, on_sample=on_sample)
+        sup.run()
+        assert RECOVERY_SECONDS.count("wlrec0") == before + 1
@@ -0,0 +1,51 @@
+"""Tests for the vectorized synthetic dataset generator."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sysadmin.synth import NAMES, SyntheticDataset, generate, generate_chunk  # noqa: E402
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / "synth.bin"
+    generate(str(path), 5000, seed=1, chunk=1024)
+    return SyntheticDataset(str(path))
+
+
+class TestGenerate:
+    def test_all_scenarios_present(self, dataset):
+        counts = dataset.counts()
+        assert len(dataset) == 5000 == sum(counts.values())
+        assert all(counts[name] > 0 for name in NAMES)
+
+    def test_deterministic(self, tmp_path):
+        a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+        generate(str(a), 3000, seed=7, chunk=500)
+        generate(str(b), 3000, seed=7, chunk=500)
+        assert a.read_bytes() == b.read_bytes()
+
+    def test_weights(self):
+        rec = generate_chunk(np.random.default_rng(0), 1000, {s: 0 for s in NAMES} | {"down": 1})
+        assert set(rec["scenario"]) == {NAMES.index("down")}
+        assert (rec["rx"] == 0).all()
+
+
+class TestExamples:
+    def test_labels_follow_scenario(self, dataset):
+        for ex in dataset.batch(slice(0, 200)):
+            d = ex.diagnosis
+            if ex.state == "down":
+                assert d.issue_type in ("interface_down", "link_flapping")
+            elif d.issue_type == "wifi_tx_degraded":
+                assert ex.tx_mbps < 10 < ex.rx_mbps
+            assert d.issue_detected == (d.issue_type != "none")
+
+    def test_fused_sample(self, dataset):
+        batch = dataset.sample(10, fused=True)
+        assert len(batch) == 10
+        assert all(ex.decision.action in ("none", "wifi_reset") for ex in batch)
+        assert "allowed_actions" in batch[0].inputs()
+
+    def test_batches_cover_dataset(self, dataset):
+        assert sum(len(b) for b in dataset.batches(2048)) == 5000
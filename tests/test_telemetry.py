@@ -0,0 +1,42 @@
+"""Tests for Prometheus telemetry."""
+import urllib.request
+
+from sysadmin.telemetry import Counter, Histogram, Registry, serve
+
+
+class TestMetrics:
+    def test_counter_render(self):
+        c = Counter("x_total", "x", ("action", "rc"))
+        c.inc("wifi_reset", "0")
+        c.inc("wifi_reset", "0", amount=2)
+        assert c.render() == ['x_total{action="wifi_reset",rc="0"} 3.0']
+
+    def test_histogram_cumulative_buckets(self):
+        h = Histogram("lat_seconds", "lat", buckets=(0.1, 1))
+        for v in (0.05, 0.5, 0.5, 5):
+            h.observe(v)
+        assert h.render() == ['lat_seconds_bucket{le="0.1"} 1',
+                              'lat_seconds_bucket{le="1"} 3',
+                              'lat_seconds_bucket{le="+Inf"} 4',
+                              'lat_seconds_sum 6.05', 'lat_seconds_count 4']
+
+    def test_histogram_timer(self):
+        h = Histogram("t", "t", ("stage",))
+        with h.time("rules"):
+            pass
+        assert h.count("rules") == 1
+
+
+class TestEndpoint:
+    def test_serves_metrics(self):
+        reg = Registry()
+        reg.register(Counter("anomalies_total", "a")).inc()
+        server = serve(0, registry=reg)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            body = urllib.request.urlopen(url, timeout=5).read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert "# TYPE anomalies_total counter" in body
+        assert "anomalies_total 1.0" in body
@@ -0,0 +1,94 @@
+"""Tests for post-action recovery verification."""
+from sysadmin.audit import AuditLogger
+from sysadmin.auditquery import aggregate, query
+from sysadmin.monitor import Metrics, NetworkMonitor
+from sysadmin.verify import RecoveryVerifier, VerifiedExecutor
+
+
+class Clock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, dt):
+        self.t += dt
+
+
+class ScriptedMonitor(NetworkMonitor):
+    """Returns the scripted samples, then the last one forever."""
+
+    def __init__(self, samples):
+        super().__init__("wlP9s9")
+        self.samples = samples
+
+    def collect(self):
+        s = self.samples.pop(0) if len(self.samples) > 1 else self.samples[0]
+        return Metrics(self.iface, *s)
+
+
+class FakeExecutor:
+    def __init__(self, audit, dry_run=False):
+        self.audit = audit
+        self.dry_run = dry_run
+        self.calls = []
+
+    def execute(self, action, iface, reason=""):
+        self.calls.append(action)
+        return True
+
+
+DOWN, SLOW, OK = ("down", 0.0, 0.0, -100), ("up", 6.0, 400.0, -45), ("up", 400.0, 400.0, -45)
+
+
+def verifier(samples, clock, deadline=5.0):
+    return RecoveryVerifier({"wlP9s9": ScriptedMonitor(samples)},
+                            deadline=deadline, interval=0.25,
+                            clock=clock, sleep=clock.sleep)
+
+
+class TestRecoveryVerifier:
+    def test_measures_time_to_recover(self):
+        clock = Clock()
+        r = verifier([DOWN, DOWN, SLOW, OK], clock).verify("wifi_reset", "wlP9s9")
+        assert r.ok and r.samples == 4 and r.seconds == 0.75
+
+    def test_uses_monitor_rx_threshold(self):
+        mon = ScriptedMonitor([("up", 30.0, 400.0, -45)])
+        mon.rx_thresh = 50.0
+        clock = Clock()
+        v = RecoveryVerifier({"wlP9s9": mon}, deadline=1.0, interval=0.25,
+                             clock=clock, sleep=clock.sleep)
+        assert v.verify("wifi_reset", "wlP9s9").reason == "rx=30.0"
+        mon.rx_thresh = 20.0
+        assert v.verify("wifi_reset", "wlP9s9").ok
+
+    def test_deadline(self):
+        clock = Clock()
+        r = verifier([SLOW], clock, deadline=1.0).verify("wifi_reset", "wlP9s9")
+        assert not r.ok and r.reason == "rx=6.0" and r.seconds >= 1.0
+
+
+class TestVerifiedExecutor:
+    def test_retries_and_logs_recovery(self, tmp_path):
+        path = tmp_path / "audit.jsonl"
+        audit = AuditLogger(str(path))
+        clock = Clock()
+        ex = FakeExecutor(audit)
+        # first attempt never recovers within the deadline, the retry does
+        v = verifier([SLOW] * 6 + [OK], clock, deadline=1.0)
+        assert VerifiedExecutor(ex, v).execute("wifi_reset", "wlP9s9", "bug")
+        assert ex.calls == ["wifi_reset", "wifi_reset"]
+        recs = list(query(str(path), event="recovery"))
+        assert [(r["ok"], r["attempt"]) for r in recs] == [(False, 0), (True, 1)]
+        stats = aggregate(recs)
+        assert stats["unrecovered"] == {"wifi_reset": 1}
+        assert stats["time_to_recover_s"]["wifi_reset"]["n"] == 1
+
+    def test_dry_run_skips_verification(self, tmp_path):
+        audit = AuditLogger(str(tmp_path / "audit.jsonl"))
+        ex = FakeExecutor(audit, dry_run=True)
+        v = verifier([DOWN], Clock(), deadline=1.0)
+        assert VerifiedExecutor(ex, v).execute("wifi_reset", "wlP9s9")
+        assert ex.calls == ["wifi_reset"]